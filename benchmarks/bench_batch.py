@@ -0,0 +1,77 @@
+"""CaajJournal list -> DataFrame vs KavaPlugin.write_caajs -> CaajBatch.to_pandas.
+
+the claim and delegate reward fixtures are repeated --repeat times, since
+reward journal lines dominate large addresses. reports the wall time of each
+path and, in a second run, its tracemalloc peak.
+
+usage: python -m benchmarks.bench_batch [--data DIR] [--repeat N]
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.kava_plugin import KavaPlugin
+from tests.stubs import TokenTableStub
+
+FIXTURES = [
+    "claim_hard_reward_v7",
+    "claim_swap_reward_v8",
+    "claim_usdx_minting_reward_v7",
+    "claim_delegator_reward_v8",
+    "withdraw_delegator_reward_v8",
+    "delegate_v8",
+]
+ADDRESS = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+
+
+def objects_to_pandas(transactions: list) -> pd.DataFrame:
+    return pd.DataFrame(
+        KavaPlugin.get_caajs_bulk(ADDRESS, transactions, TokenTableStub(), workers=1)
+    )
+
+
+def batch_to_pandas(transactions: list) -> pd.DataFrame:
+    return KavaPlugin.write_caajs(ADDRESS, transactions, TokenTableStub()).to_pandas()
+
+
+def measure(convert, transactions: list) -> tuple:
+    started = time.perf_counter()
+    df = convert(transactions)
+    seconds = time.perf_counter() - started
+    del df
+
+    tracemalloc.start()
+    df = convert(transactions)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(df), seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="tests/data")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    transactions = []
+    for filename in FIXTURES:
+        with open(os.path.join(args.data, f"{filename}.json"), encoding="utf-8") as f:
+            transactions.append(KavaTransaction(json.load(f)))
+    transactions = transactions * args.repeat
+
+    print(f"{'path':<22}{'rows':>10}{'seconds':>10}{'peak MiB':>10}")
+    for name, convert in [
+        ("CaajJournal objects", objects_to_pandas),
+        ("CaajBatch", batch_to_pandas),
+    ]:
+        rows, seconds, peak = measure(convert, transactions)
+        print(f"{name:<22}{rows:>10}{seconds:>10.2f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
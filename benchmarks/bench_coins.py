@@ -0,0 +1,77 @@
+"""coin-string parsing cost on the reward strings of the claim_*_reward fixtures.
+
+compares the former findall based split loop with KavaUtil.parse_coins,
+both without the memo and with the memo warmed up.
+
+usage: python -m benchmarks.bench_coins [--data DIR] [--number N]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import timeit
+
+from kava_plugin.kava_util import KavaUtil
+
+
+def legacy_split(amount_tokens: str) -> list:
+    coins = []
+    for amount_token in amount_tokens.split(","):
+        amount = re.findall(r"\d+", amount_token)[0]
+        coins.append((amount, amount_token[len(amount) :]))
+    return coins
+
+
+def uncached_parse(amount_tokens: str) -> tuple:
+    return KavaUtil.parse_coins.__wrapped__(KavaUtil, amount_tokens)
+
+
+def load_reward_strings(data: str) -> list:
+    rewards = []
+    for filename in sorted(glob.glob(os.path.join(data, "claim_*reward*.json"))):
+        with open(filename, encoding="utf-8") as jsonfile_local:
+            transaction = json.load(jsonfile_local)
+        for log in transaction["data"]["logs"]:
+            for event in log["events"]:
+                if event["type"] != "transfer":
+                    continue
+                for attribute in event["attributes"]:
+                    if attribute["key"] == "amount":
+                        rewards.append(attribute["value"])
+    return rewards
+
+
+def measure(parse, rewards: list, number: int) -> float:
+    def run():
+        for amount_tokens in rewards:
+            parse(amount_tokens)
+
+    seconds = min(timeit.repeat(run, number=number, repeat=5))
+    return seconds / (number * len(rewards)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="tests/data")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    rewards = load_reward_strings(args.data)
+    for amount_tokens in rewards:
+        assert tuple(legacy_split(amount_tokens)) == KavaUtil.parse_coins(amount_tokens)
+
+    print(f"{len(rewards)} reward strings from {args.data}")
+    print(f"{'parser':<24}{'ns/string':>12}")
+    print(f"{'findall split':<24}{measure(legacy_split, rewards, args.number):>12.1f}")
+    print(
+        f"{'parse_coins uncached':<24}{measure(uncached_parse, rewards, args.number):>12.1f}"
+    )
+    print(
+        f"{'parse_coins memoized':<24}"
+        f"{measure(KavaUtil.parse_coins, rewards, args.number):>12.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
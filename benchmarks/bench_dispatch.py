@@ -0,0 +1,98 @@
+"""per-message action dispatch cost: Message.handlers lookup vs the former if/elif chain.
+
+usage: python -m benchmarks.bench_dispatch [--number N]
+"""
+import argparse
+import timeit
+
+from kava_plugin.message import DELEGATE_ACTIONS, Message
+
+
+def legacy_dispatch(action):
+    if action in DELEGATE_ACTIONS:
+        return "delegate"
+    elif (
+        action == "begin_unbonding" or action == "/cosmos.staking.v1beta1.MsgUndelegate"
+    ):
+        return "begin_unbonding"
+    elif action == "create_cdp":
+        return "create_cdp"
+    elif action == "draw_cdp":
+        return "draw_cdp"
+    elif action == "repay_cdp":
+        return "repay_cdp"
+    elif action == "deposit_cdp":
+        return "deposit_cdp"
+    elif action == "withdraw_cdp":
+        return "withdraw_cdp"
+    elif action == "claim_usdx_minting_reward" or action == "claim_reward":
+        return "claim_usdx_minting_reward"
+    elif action == "hard_deposit" or action == "harvest_deposit":
+        return "hard_deposit"
+    elif action == "hard_withdraw" or action == "harvest_withdraw":
+        return "hard_withdraw"
+    elif action == "hard_borrow":
+        return "hard_borrow"
+    elif action == "hard_repay":
+        return "hard_repay"
+    elif action in [
+        "claim_hard_reward",
+        "claim_harvest_reward",
+        "/kava.incentive.v1beta1.MsgClaimHardReward",
+    ]:
+        return "claim_hard_reward"
+    elif action == "swap_exact_for_tokens" or action == "swap_for_exact_tokens":
+        return "swap_exact_for_tokens"
+    elif action == "swap_deposit":
+        return "swap_deposit"
+    elif action == "swap_withdraw":
+        return "swap_withdraw"
+    elif action == "claim_swap_reward":
+        return "claim_swap_reward"
+    elif action == "send" or action == "/cosmos.bank.v1beta1.MsgSend":
+        return "send"
+    elif (
+        action == "createAtomicSwap"
+        or action == "/kava.bep3.v1beta1.MsgCreateAtomicSwap"
+    ):
+        return "create_atomic_swap"
+    elif action == "claimAtomicSwap" or action == "refundAtomicSwap":
+        return "claim_atomic_swap"
+    elif action in ["vote", "committee_vote", "post_price"]:
+        return "vote"
+    else:
+        return None
+
+
+def registry_dispatch(action):
+    return Message.handlers.get(action)
+
+
+def measure(dispatch, actions: list, number: int) -> float:
+    def run():
+        for action in actions:
+            dispatch(action)
+
+    seconds = min(timeit.repeat(run, number=number, repeat=5))
+    return seconds / (number * len(actions)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    actions = list(Message.handlers) + ["unknown"]
+    print(f"{'action':<58}{'chain ns':>10}{'registry ns':>13}")
+    for action in actions:
+        chain = measure(legacy_dispatch, [action], args.number)
+        registry = measure(registry_dispatch, [action], args.number)
+        print(f"{action:<58}{chain:>10.1f}{registry:>13.1f}")
+
+    chain = measure(legacy_dispatch, actions, args.number // 10)
+    registry = measure(registry_dispatch, actions, args.number // 10)
+    print(f"{'mean over all actions':<58}{chain:>10.1f}{registry:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
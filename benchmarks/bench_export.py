@@ -0,0 +1,81 @@
+"""sorted CAAJ CSV: DataFrame sort and to_csv vs CaajCsvExport run sizes.
+
+the claim and delegate reward fixtures are repeated --repeat times. reports
+the wall time of each path and, in a second run, its tracemalloc peak. the
+CSV is written to os.devnull.
+
+usage: python -m benchmarks.bench_export [--data DIR] [--repeat N]
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.caaj_export import CaajCsvExport
+from kava_plugin.kava_plugin import KavaPlugin
+from tests.stubs import TokenTableStub
+
+FIXTURES = [
+    "claim_hard_reward_v7",
+    "claim_swap_reward_v8",
+    "claim_usdx_minting_reward_v7",
+    "claim_delegator_reward_v8",
+    "withdraw_delegator_reward_v8",
+    "delegate_v8",
+]
+ADDRESS = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+
+
+def pandas_export(transactions: list, out) -> None:
+    batch = KavaPlugin.write_caajs(ADDRESS, transactions, TokenTableStub())
+    out.write(batch.to_pandas().sort_values("executed_at").to_csv(None, index=False))
+
+
+def external_export(run_size: int):
+    def export(transactions: list, out) -> None:
+        rows = KavaPlugin.iter_caaj_rows(ADDRESS, transactions, TokenTableStub())
+        CaajCsvExport.write(rows, out, run_size=run_size)
+
+    return export
+
+
+def measure(export, transactions: list) -> tuple:
+    with open(os.devnull, "w", encoding="utf-8") as out:
+        started = time.perf_counter()
+        export(transactions, out)
+        seconds = time.perf_counter() - started
+
+        tracemalloc.start()
+        export(transactions, out)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="tests/data")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    transactions = []
+    for filename in FIXTURES:
+        with open(os.path.join(args.data, f"{filename}.json"), encoding="utf-8") as f:
+            transactions.append(KavaTransaction(json.load(f)))
+    transactions = transactions * args.repeat
+
+    print(f"{'path':<28}{'seconds':>10}{'peak MiB':>10}")
+    paths = [("DataFrame sort_values", pandas_export)] + [
+        (f"CaajCsvExport run {run_size}", external_export(run_size))
+        for run_size in [1000, 10000, CaajCsvExport.DEFAULT_RUN_SIZE]
+    ]
+    for name, export in paths:
+        seconds, peak = measure(export, transactions)
+        print(f"{name:<28}{seconds:>10.2f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
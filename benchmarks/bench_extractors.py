@@ -0,0 +1,79 @@
+"""single-coin Message handlers: hand-written methods vs handlers compiled from AMOUNT_SPECS.
+
+usage: python -m benchmarks.bench_extractors [--data DIR] [--number N]
+"""
+import argparse
+import json
+import os
+import timeit
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.kava_util import KavaUtil
+from kava_plugin.message import AMOUNT_SPECS, Message
+from kava_plugin.message_factory import MessageFactory
+
+FIXTURES = {
+    "draw_cdp": "draw_cdp_v7",
+    "deposit_cdp": "deposit_cdp_v8",
+    "withdraw_cdp": "withdraw_cdp_v8",
+    "hard_deposit": "hard_deposit_v8",
+    "hard_withdraw": "hard_withdraw_v8",
+    "hard_borrow": "hard_borrow_v8",
+    "hard_repay": "hard_repay_v8",
+}
+
+
+def legacy_handler(action, spec):
+    # the body every hand-written __as_* method used to repeat
+    def handler(message):
+        result = {
+            "action": action,
+            "result": {spec.token_field: None, spec.amount_field: None},
+        }
+        if message.event_index.has_event(spec.event_type):
+            amount = message.event_index.get_attribute_value(
+                spec.event_type, spec.attribute_key
+            )
+            amount, denom = KavaUtil.split_amount(amount)
+            result["result"][spec.token_field] = denom.token
+            result["result"][spec.amount_field] = str(
+                KavaUtil.get_amount(amount, denom)
+            )
+
+        return result
+
+    return handler
+
+
+def load_message(data: str, filename: str) -> Message:
+    with open(os.path.join(data, f"{filename}.json"), encoding="utf-8") as jsonfile:
+        transaction = KavaTransaction(json.load(jsonfile))
+    return MessageFactory.get_messages(transaction)[0]
+
+
+def measure(handler, message: Message, number: int) -> float:
+    seconds = min(timeit.repeat(lambda: handler(message), number=number, repeat=5))
+    return seconds / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="tests/data")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'action':<16}{'hand-written ns':>17}{'compiled ns':>13}")
+    for _, action, spec in AMOUNT_SPECS:
+        message = load_message(args.data, FIXTURES[action])
+        legacy = legacy_handler(action, spec)
+        compiled = Message.handlers[action]
+        assert legacy(message) == compiled(message).to_dict()
+        print(
+            f"{action:<16}{measure(legacy, message, args.number):>17.1f}"
+            f"{measure(compiled, message, args.number):>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
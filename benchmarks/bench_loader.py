@@ -0,0 +1,74 @@
+"""load cost of the bundled fixtures: a full decode vs RawKavaTransaction.from_bytes.
+
+from_bytes sniffs what get_caajs_from_raw needs to skip a document, or to
+journal a failed transaction, without decoding it.
+
+reports time per document and bytes allocated by tracemalloc while loading
+(peak) and kept by the result (retained), for the fixtures as stored
+(indented) and re-serialized compactly.
+
+usage: python -m benchmarks.bench_loader [--data tests/data] [--number N]
+"""
+import argparse
+import glob
+import json
+import os
+import timeit
+import tracemalloc
+
+from kava_plugin.raw_transaction import RawKavaTransaction
+
+
+def measure_memory(decode, raw: bytes):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    transaction = decode(raw)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del transaction
+    return peak - start, retained - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="tests/data")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    decoders = {
+        "decode": RawKavaTransaction.decode,
+        "sniff": RawKavaTransaction.from_bytes,
+    }
+    documents = {"stored": [], "compact": []}
+    for filename in sorted(glob.glob(os.path.join(args.data, "*.json"))):
+        with open(filename, "rb") as jsonfile:
+            raw = jsonfile.read()
+        documents["stored"].append(raw)
+        documents["compact"].append(json.dumps(json.loads(raw)).encode())
+
+    print(
+        f"{'corpus':<10}{'mode':<10}{'us/doc':>10}{'peak B/doc':>13}{'kept B/doc':>13}"
+    )
+    for corpus, raws in documents.items():
+        for mode, decode in decoders.items():
+
+            def run():
+                for raw in raws:
+                    decode(raw)
+
+            seconds = min(timeit.repeat(run, number=args.number // 10, repeat=5))
+            microseconds = seconds / (args.number // 10) / len(raws) * 1e6
+            peak = retained = 0
+            for raw in raws:
+                raw_peak, raw_retained = measure_memory(decode, raw)
+                peak += raw_peak
+                retained += raw_retained
+            print(
+                f"{corpus:<10}{mode:<10}{microseconds:>10.1f}"
+                f"{peak / len(raws):>13.0f}{retained / len(raws):>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""benchmark suite: per-fixture microbenchmarks, end-to-end throughput and peak memory.
+
+micro       Message.get_result and KavaPlugin.get_caajs of every fixture in
+            --data, in ns per call. each fixture belongs to an action family
+            (staking, cdp, hard, swap, atomic_swap, send, vote, fail).
+throughput  KavaPlugin.get_caajs over synthetic corpora of --sizes
+            transactions from benchmarks.corpus_generator, journaled for the
+            most active address of the corpus, in transactions per second,
+            best of three passes.
+memory      tracemalloc peak of decoding the same corpora from NDJSON lines and
+            collecting their CAAJs with KavaPlugin.write_caajs, in bytes.
+
+results are written as JSON with --output. with --baseline, every metric found
+in both runs is compared and a change worse than --threshold is reported as a
+regression, making the script exit with status 1.
+
+usage: python -m benchmarks.bench_suite [--data DIR] [--only micro,throughput,memory]
+           [--sizes 1000,10000] [--number N] [--output FILE]
+           [--baseline FILE] [--threshold 0.1]
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from benchmarks.corpus_generator import CorpusGenerator
+from kava_plugin import __version__
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.message_factory import MessageFactory
+from kava_plugin.raw_transaction import RawKavaTransaction
+from tests.stubs import TokenTableStub
+
+SUITES = ["micro", "throughput", "memory"]
+# fixture name prefixes of each action family, checked in order
+FAMILIES = [
+    ("cdp", ["create_cdp", "deposit_cdp", "draw_cdp", "repay_cdp", "withdraw_cdp"]),
+    ("cdp", ["claim_usdx_minting_reward", "claim_reward"]),
+    ("hard", ["hard_", "harvest_", "claim_hard_reward", "claim_harvest_reward"]),
+    ("swap", ["swap_", "claim_swap_reward"]),
+    ("atomic_swap", ["createAtomicSwap", "claimAtomicSwap", "refundAtomicSwap"]),
+    ("staking", ["delegate", "begin_", "claim_delegator", "withdraw_delegator"]),
+    ("send", ["send"]),
+    ("vote", ["vote"]),
+    ("fail", ["fail"]),
+]
+ADDRESS = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+
+
+def get_family(name: str) -> str:
+    for family, prefixes in FAMILIES:
+        if name.startswith(tuple(prefixes)):
+            return family
+    return "other"
+
+
+def metric(value: float, unit: str, lower_is_better: bool, **fields) -> dict:
+    return {"value": value, "unit": unit, "lower_is_better": lower_is_better, **fields}
+
+
+def run_micro(data: str, number: int) -> dict:
+    metrics = {}
+    token_table = TokenTableStub()
+    for path in sorted(glob.glob(os.path.join(data, "*_v*.json"))):
+        name = os.path.basename(path)[: -len(".json")]
+        with open(path, encoding="utf-8") as jsonfile:
+            transaction = KavaTransaction(json.load(jsonfile))
+        family = get_family(name)
+
+        if not transaction.get_fail():
+            messages = MessageFactory.get_messages(transaction)
+
+            def get_results():
+                for message in messages:
+                    message.get_result()
+
+            seconds = min(timeit.repeat(get_results, number=number, repeat=5))
+            metrics[f"get_result/{name}"] = metric(
+                seconds / number * 1e9, "ns", True, family=family
+            )
+
+        def get_caajs():
+            KavaPlugin.get_caajs(ADDRESS, transaction, token_table)
+
+        seconds = min(timeit.repeat(get_caajs, number=number, repeat=5))
+        metrics[f"get_caajs/{name}"] = metric(
+            seconds / number * 1e9, "ns", True, family=family
+        )
+    return metrics
+
+
+def generate_corpus(data: str, size: int) -> tuple:
+    generator = CorpusGenerator(data, seed=size)
+    lines = [
+        json.dumps(transaction, separators=(",", ":")).encode()
+        for transaction in generator.generate(size)
+    ]
+    return generator.addresses[0], lines
+
+
+def run_throughput(data: str, sizes: list) -> dict:
+    metrics = {}
+    token_table = TokenTableStub()
+    for size in sizes:
+        address, lines = generate_corpus(data, size)
+        transactions = [KavaTransaction(json.loads(line)) for line in lines]
+
+        # the best of three passes, as single passes are noisy
+        seconds = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            rows = 0
+            for transaction in transactions:
+                rows += len(KavaPlugin.get_caajs(address, transaction, token_table))
+            seconds = min(seconds, time.perf_counter() - started)
+        metrics[f"throughput/{size}"] = metric(
+            size / seconds, "transactions/s", False, rows=rows
+        )
+    return metrics
+
+
+def run_memory(data: str, sizes: list) -> dict:
+    metrics = {}
+    token_table = TokenTableStub()
+    for size in sizes:
+        address, lines = generate_corpus(data, size)
+        tracemalloc.start()
+        batch = KavaPlugin.write_caajs(
+            address,
+            (KavaTransaction(RawKavaTransaction.decode(line)) for line in lines),
+            token_table,
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        metrics[f"peak_memory/{size}"] = metric(peak, "bytes", True, rows=len(batch))
+    return metrics
+
+
+def compare(metrics: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    print(f"{'metric':<44}{'baseline':>14}{'current':>14}{'change':>9}")
+    for name, current in metrics.items():
+        previous = baseline.get(name)
+        if previous is None or previous["value"] == 0:
+            continue
+        change = current["value"] / previous["value"] - 1
+        worse = change if current["lower_is_better"] else -change
+        flag = ""
+        if worse > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<44}{previous['value']:>14.1f}{current['value']:>14.1f}"
+            f"{change:>+9.1%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="tests/data")
+    parser.add_argument("--only", default=",".join(SUITES))
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="JSON results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    suites = args.only.split(",")
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {sorted(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+    # results are not reused between calls
+    KavaPlugin.result_cache = None
+
+    metrics = {}
+    if "micro" in suites:
+        metrics.update(run_micro(args.data, args.number))
+    if "throughput" in suites:
+        metrics.update(run_throughput(args.data, sizes))
+    if "memory" in suites:
+        metrics.update(run_memory(args.data, sizes))
+
+    results = {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "metrics": metrics,
+    }
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline is None:
+        for name, current in metrics.items():
+            print(f"{name:<44}{current['value']:>14.1f} {current['unit']}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["metrics"]
+    regressions = compare(metrics, baseline, args.threshold)
+    print(f"{len(regressions)} regressions over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+import argparse
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import sys
+from datetime import datetime as dt
+from datetime import timedelta
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(name=__name__)
+logger.addHandler(logging.NullHandler())
+
+TEMPLATE_NAME_PATTERN = re.compile(r"(?P<action>.+)_v(?P<version>\d+)\.json$")
+ADDRESS_PATTERN = re.compile(r"kava1[02-9ac-hj-np-z]{38}")
+COIN_PATTERN = re.compile(r"(\d+)([a-z][a-zA-Z0-9/:._]*)")
+COINS_PATTERN = re.compile(r"\d+[a-z][a-zA-Z0-9/:._]*(,\d+[a-z][a-zA-Z0-9/:._]*)*")
+BECH32_CHARS = "023456789acdefghjklmnpqrstuvwxyz"
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# event attributes and message fields holding coin strings or integer amounts
+COIN_KEYS = {"amount", "claim_amount", "input", "output", "fee"}
+INTEGER_AMOUNT_KEYS = {"amount", "shares"}
+# denoms swapped for one another. ukava stays, as staking and fees need it
+SUBSTITUTE_DENOMS = ["usdx", "bnb", "busd", "btcb", "xrpb", "hard", "swp"]
+TIMESTAMP_JITTER = timedelta(days=30)
+MAX_AMOUNT_SCALE = 10000
+# data keys of a successful transaction that a failed one does not have
+FAILED_DROPPED_KEYS = {"data", "logs", "events"}
+
+
+class Template(NamedTuple):
+    action: str
+    chain_version: int
+    document: bytes
+
+
+class CorpusGenerator:
+    """synthetic kava transactions derived from the tests/data fixtures, for load tests.
+
+    each transaction is a copy of a fixture, picked by the action weights and
+    uniformly among the chain versions of that action. per transaction, every
+    kava address is mapped to one of a fixed pool of addresses (a few of them
+    very active), non-native denoms are permuted, all amounts are multiplied by
+    one random integer, and the txhash and timestamp are redrawn. some
+    transactions carry the messages of further fixtures of the same chain
+    version, some are turned into failed transactions.
+    """
+
+    def __init__(
+        self,
+        templates_dir: str,
+        mix: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+        addresses: int = 1000,
+        fail_rate: float = 0.05,
+        multi_message_rate: float = 0.1,
+        max_messages: int = 3,
+    ):
+        self.templates = CorpusGenerator._load_templates(templates_dir)
+        self.action_templates: Dict[str, List[Template]] = {}
+        self.version_templates: Dict[int, List[Template]] = {}
+        for template in self.templates:
+            self.action_templates.setdefault(template.action, []).append(template)
+            self.version_templates.setdefault(template.chain_version, []).append(
+                template
+            )
+        actions = sorted(self.action_templates)
+        if mix is None:
+            mix = {action: 1.0 for action in actions}
+        unknown = set(mix) - set(actions)
+        if unknown:
+            raise ValueError(f"no templates for actions. actions: {sorted(unknown)}")
+        self.actions = [action for action in actions if mix.get(action, 0) > 0]
+        self.weights = [mix[action] for action in self.actions]
+        if not self.actions:
+            raise ValueError("the action mix has no positive weight")
+
+        self.random = random.Random(seed)
+        self.addresses = [
+            "kava1" + "".join(self.random.choices(BECH32_CHARS, k=38))
+            for _ in range(addresses)
+        ]
+        # address i is picked with weight 1 / (i + 1)
+        self.address_weights = []
+        total = 0.0
+        for i in range(addresses):
+            total += 1 / (i + 1)
+            self.address_weights.append(total)
+        self.fail_rate = fail_rate
+        self.multi_message_rate = multi_message_rate
+        self.max_messages = max_messages
+
+    def generate(self, count: int) -> Iterator[dict]:
+        for _ in range(count):
+            yield self.generate_one()
+
+    def generate_one(self) -> dict:
+        action = self.random.choices(self.actions, self.weights)[0]
+        template = self.random.choice(self.action_templates[action])
+        transaction = json.loads(template.document)
+        if self.max_messages > 1 and self.random.random() < self.multi_message_rate:
+            self.__add_messages(transaction, template.chain_version)
+        self.__mutate(transaction)
+        if self.random.random() < self.fail_rate:
+            self.__fail(transaction)
+        return transaction
+
+    def write(self, out: IO[str], count: int) -> None:
+        for transaction in self.generate(count):
+            out.write(json.dumps(transaction, separators=(",", ":")))
+            out.write("\n")
+
+    def __add_messages(self, transaction: dict, chain_version: int) -> None:
+        others = self.version_templates[chain_version]
+        data = transaction["data"]
+        messages = CorpusGenerator._get_messages(transaction, chain_version)
+        for _ in range(self.random.randint(1, self.max_messages - 1)):
+            other = json.loads(self.random.choice(others).document)
+            for log in other["data"]["logs"]:
+                log["msg_index"] = len(data["logs"])
+                data["logs"].append(log)
+            messages.extend(CorpusGenerator._get_messages(other, chain_version))
+
+    def __mutate(self, transaction: dict) -> None:
+        addresses: Dict[str, str] = {}
+        denoms: Dict[str, str] = {}
+        scale = int(MAX_AMOUNT_SCALE ** self.random.random())
+
+        def get_address(address: str) -> str:
+            mapped = addresses.get(address)
+            if mapped is None:
+                used = set(addresses.values())
+                mapped = self.__pick_address()
+                # distinct addresses stay distinct while the pool allows it
+                while mapped in used and len(used) < len(self.addresses):
+                    mapped = self.__pick_address()
+                addresses[address] = mapped
+            return mapped
+
+        def get_denom(denom: str) -> str:
+            if denom not in SUBSTITUTE_DENOMS:
+                return denom
+            if denom not in denoms:
+                unused = [
+                    substitute
+                    for substitute in SUBSTITUTE_DENOMS
+                    if substitute not in denoms.values()
+                ]
+                denoms[denom] = self.random.choice(unused)
+            return denoms[denom]
+
+        def scale_coin(match: re.Match) -> str:
+            return f"{int(match.group(1)) * scale}{get_denom(match.group(2))}"
+
+        def mutate_value(key: Optional[str], value: str) -> str:
+            if ADDRESS_PATTERN.fullmatch(value):
+                return get_address(value)
+            if key in INTEGER_AMOUNT_KEYS and value.isdigit():
+                return str(int(value) * scale)
+            if key in COIN_KEYS and COINS_PATTERN.fullmatch(value):
+                return COIN_PATTERN.sub(scale_coin, value)
+            if key == "denom":
+                return get_denom(value)
+            if key == "pool_id":
+                return ":".join(get_denom(denom) for denom in value.split(":"))
+            return value
+
+        def walk(node) -> None:
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if isinstance(value, str):
+                        # event attributes are {"key": ..., "value": ...} pairs
+                        value_key = node.get("key") if key == "value" else key
+                        node[key] = mutate_value(value_key, value)
+                    else:
+                        walk(value)
+            elif isinstance(node, list):
+                for value in node:
+                    walk(value)
+
+        data = transaction["data"]
+        walk(data.get("logs"))
+        walk(data["tx"])
+        if isinstance(data.get("raw_log"), str) and data["raw_log"].startswith("["):
+            data["raw_log"] = json.dumps(data["logs"], separators=(",", ":"))
+
+        data["txhash"] = f"{self.random.getrandbits(256):064X}"
+        timestamp = dt.strptime(transaction["header"]["timestamp"], TIMESTAMP_FORMAT)
+        timestamp += timedelta(
+            seconds=self.random.randrange(int(TIMESTAMP_JITTER.total_seconds()))
+        )
+        transaction["header"]["timestamp"] = timestamp.strftime(TIMESTAMP_FORMAT)
+        data["timestamp"] = transaction["header"]["timestamp"]
+
+    def __pick_address(self) -> str:
+        return self.random.choices(self.addresses, cum_weights=self.address_weights)[0]
+
+    def __fail(self, transaction: dict) -> None:
+        # laid out as tests/data/fail_v8.json: codespace and code follow txhash,
+        # and the logs and message events of the successful template are gone
+        data = transaction["data"]
+        failed = {
+            "height": data["height"],
+            "txhash": data["txhash"],
+            "codespace": "sdk",
+            "code": 5,
+        }
+        for key, value in data.items():
+            if key not in failed and key not in FAILED_DROPPED_KEYS:
+                failed[key] = value
+        failed["raw_log"] = (
+            "insufficient funds: insufficient account funds; "
+            "failed to execute message; message index: 0"
+        )
+        transaction["data"] = failed
+
+    @classmethod
+    def _get_messages(cls, transaction: dict, chain_version: int) -> list:
+        tx = transaction["data"]["tx"]
+        return tx["value"]["msg"] if chain_version < 9 else tx["body"]["messages"]
+
+    @classmethod
+    def _load_templates(cls, templates_dir: str) -> List[Template]:
+        templates = []
+        for name in sorted(os.listdir(templates_dir)):
+            name_match = TEMPLATE_NAME_PATTERN.match(name)
+            if name_match is None:
+                continue
+            with open(os.path.join(templates_dir, name), "rb") as template_file:
+                document = template_file.read()
+            # failed transactions are generated from the others instead
+            if json.loads(document)["data"].get("code", 0) != 0:
+                continue
+            templates.append(
+                Template(
+                    name_match.group("action"),
+                    int(name_match.group("version")),
+                    document,
+                )
+            )
+        if not templates:
+            raise ValueError(
+                f"no transaction templates. templates_dir: {templates_dir}"
+            )
+        logger.debug(f"loaded {len(templates)} templates from {templates_dir}")
+        return templates
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="write synthetic kava transactions as NDJSON for load tests"
+    )
+    parser.add_argument("-n", "--count", type=int, default=100000)
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="NDJSON file, gzip compressed when it ends with .gz. stdout by default",
+    )
+    parser.add_argument("--templates", default="tests/data")
+    parser.add_argument(
+        "--mix",
+        help="action weights such as delegate=5,send=3. all template actions equally by default",
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--addresses", type=int, default=1000)
+    parser.add_argument("--address-file", help="file to write the address pool to")
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    parser.add_argument("--multi-message-rate", type=float, default=0.1)
+    parser.add_argument("--max-messages", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    mix = None
+    if args.mix is not None:
+        mix = {}
+        for entry in args.mix.split(","):
+            action, weight = entry.split("=")
+            mix[action.strip()] = float(weight)
+    generator = CorpusGenerator(
+        args.templates,
+        mix,
+        args.seed,
+        args.addresses,
+        args.fail_rate,
+        args.multi_message_rate,
+        args.max_messages,
+    )
+
+    if args.address_file is not None:
+        with open(args.address_file, "w", encoding="utf-8") as address_file:
+            address_file.writelines(f"{address}\n" for address in generator.addresses)
+    if args.output == "-":
+        generator.write(sys.stdout, args.count)
+    elif args.output.endswith(".gz"):
+        with gzip.open(args.output, "wt", encoding="utf-8") as out:
+            generator.write(out, args.count)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            generator.write(out, args.count)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import logging
+from decimal import Decimal
+from typing import Optional
+
+logger = logging.getLogger(name=__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class Amount:
+    """token amount held as integer base units and the decimals of its denom.
+
+    the string form is the one of Decimal(units) / Decimal(10 ** decimals) and
+    is built once, the first time the amount is formatted.
+    """
+
+    __slots__ = ("units", "decimals", "_text")
+
+    def __init__(self, units: int, decimals: int):
+        self.units = units
+        self.decimals = decimals
+        self._text: Optional[str] = None
+
+    @classmethod
+    def from_str(cls, value: str) -> "Amount":
+        sign, digits, exponent = Decimal(value).as_tuple()
+        units = int("".join(map(str, digits)))
+        if exponent > 0:
+            units = units * 10**exponent
+            exponent = 0
+        return cls(-units if sign else units, -exponent)
+
+    def is_zero(self) -> bool:
+        return self.units == 0
+
+    def _normalize(self) -> tuple:
+        units, decimals = self.units, self.decimals
+        while decimals > 0 and units % 10 == 0:
+            units //= 10
+            decimals -= 1
+        return units, decimals
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = Amount._format(self.units, self.decimals)
+        return self._text
+
+    @classmethod
+    def _format(cls, units: int, decimals: int) -> str:
+        if units < 0:
+            return "-" + Amount._format(-units, decimals)
+        digits = str(units)
+        if decimals == 0:
+            return digits
+        if len(digits) > decimals:
+            fraction = digits[-decimals:].rstrip("0")
+            whole = digits[:-decimals]
+            return f"{whole}.{fraction}" if fraction else whole
+        fraction = digits.rstrip("0")
+        if fraction == "":
+            return "0"
+        # same switch to exponent notation as Decimal.__str__
+        adjusted = decimals - len(digits) + 1
+        if adjusted > 6:
+            if len(fraction) > 1:
+                fraction = f"{fraction[0]}.{fraction[1:]}"
+            return f"{fraction}E-{adjusted}"
+        return f"0.{fraction.rjust(decimals - len(digits) + len(fraction), '0')}"
+
+    def __repr__(self) -> str:
+        return f"Amount(units={self.units}, decimals={self.decimals})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Amount):
+            return NotImplemented
+        return self._normalize() == other._normalize()
+
+    def __hash__(self) -> int:
+        return hash(self._normalize())
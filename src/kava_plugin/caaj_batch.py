@@ -0,0 +1,59 @@
+import dataclasses
+from typing import Any, Dict, Iterable, List
+
+from senkalib.caaj_journal import CaajJournal
+
+CAAJ_COLUMNS = [field.name for field in dataclasses.fields(CaajJournal)]
+
+
+class CaajBatch:
+    """CAAJ journal lines kept as one list per CaajJournal field.
+
+    rows are appended as tuples in field order, so no CaajJournal is created
+    until to_caajs is called. pandas and pyarrow are imported on conversion only.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {name: [] for name in CAAJ_COLUMNS}
+        self.__appends = [self.columns[name].append for name in CAAJ_COLUMNS]
+
+    def __len__(self) -> int:
+        return len(self.columns[CAAJ_COLUMNS[0]])
+
+    def append(self, row: tuple) -> None:
+        for append, value in zip(self.__appends, row):
+            append(value)
+
+    def append_caaj(self, caaj: CaajJournal) -> None:
+        self.append(caaj_to_row(caaj))
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        appends = self.__appends
+        for row in rows:
+            if not isinstance(row, tuple):
+                self.append_caaj(row)
+                continue
+            for append, value in zip(appends, row):
+                append(value)
+
+    def to_caajs(self) -> List[CaajJournal]:
+        return [CaajJournal(*row) for row in zip(*self.columns.values())]
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, columns=CAAJ_COLUMNS)
+
+    def to_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(
+                "to_arrow needs pyarrow. install kava_plugin with the arrow extra"
+            ) from e
+
+        return pa.table(self.columns)
+
+
+def caaj_to_row(caaj: CaajJournal) -> tuple:
+    return tuple(getattr(caaj, name) for name in CAAJ_COLUMNS)
@@ -0,0 +1,90 @@
+import csv
+import heapq
+import json
+import logging
+import tempfile
+from operator import itemgetter
+from typing import IO, Iterable, List, Optional
+
+from kava_plugin.caaj_batch import CAAJ_COLUMNS
+
+logger = logging.getLogger(name=__name__)
+logger.addHandler(logging.NullHandler())
+
+EXECUTED_AT = CAAJ_COLUMNS.index("executed_at")
+
+
+class CaajCsvExport:
+    """CAAJ rows written as CSV sorted by executed_at, with an external merge sort.
+
+    at most run_size rows are held in memory. each full run is sorted and spilled
+    to a temporary file, and the runs are k-way merged into the output. the sort
+    is stable, so rows with the same executed_at keep their input order.
+    """
+
+    DEFAULT_RUN_SIZE = 100000
+
+    @classmethod
+    def write(
+        cls,
+        rows: Iterable[tuple],
+        out: IO[str],
+        run_size: int = DEFAULT_RUN_SIZE,
+        temp_dir: Optional[str] = None,
+    ) -> int:
+        if run_size < 1:
+            raise ValueError(f"run_size must be positive. run_size: {run_size}")
+
+        runs: List[IO[str]] = []
+        run: List[tuple] = []
+        count = 0
+        try:
+            for row in rows:
+                run.append(row)
+                count += 1
+                if len(run) >= run_size:
+                    runs.append(CaajCsvExport._spill(run, temp_dir))
+                    run = []
+
+            writer = CaajCsvExport._get_writer(out)
+            writer.writerow(CAAJ_COLUMNS)
+            run.sort(key=itemgetter(EXECUTED_AT))
+            if not runs:
+                writer.writerows(run)
+            else:
+                logger.debug(f"merging {len(runs) + 1} runs of {count} rows")
+                # None and "" both read back as "", which writes the same field
+                readers = [csv.reader(run_file) for run_file in runs] + [iter(run)]
+                writer.writerows(heapq.merge(*readers, key=itemgetter(EXECUTED_AT)))
+        finally:
+            for run_file in runs:
+                run_file.close()
+        return count
+
+    @classmethod
+    def _spill(cls, run: List[tuple], temp_dir: Optional[str]) -> IO[str]:
+        run.sort(key=itemgetter(EXECUTED_AT))
+        run_file = tempfile.TemporaryFile(
+            mode="w+", encoding="utf-8", newline="", dir=temp_dir
+        )
+        CaajCsvExport._get_writer(run_file).writerows(run)
+        run_file.seek(0)
+        return run_file
+
+    @classmethod
+    def _get_writer(cls, out: IO[str]):
+        # the same dialect as DataFrame.to_csv
+        return csv.writer(out, lineterminator="\n")
+
+
+class CaajNdjsonExport:
+    """CAAJ rows written as one JSON object per line, in input order."""
+
+    @classmethod
+    def write(cls, rows: Iterable[tuple], out: IO[str]) -> int:
+        count = 0
+        for row in rows:
+            out.write(json.dumps(dict(zip(CAAJ_COLUMNS, row)), default=str))
+            out.write("\n")
+            count += 1
+        return count
@@ -0,0 +1,309 @@
+import argparse
+import contextlib
+import gzip
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    IO,
+    Collection,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from senkalib.token_original_id_table import TokenOriginalIdTable
+
+from kava_plugin.caaj_export import CaajCsvExport, CaajNdjsonExport
+from kava_plugin.corpus import TransactionCorpus
+from kava_plugin.instrumentation import SlowTransactionLog
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.raw_transaction import RawKavaTransaction
+from kava_plugin.token_table_snapshot import (
+    DEFAULT_SNAPSHOT_PATH,
+    TOKEN_ORIGINAL_IDS_URL,
+    LocalTokenOriginalIdTable,
+)
+from kava_plugin.trade_uuid import TradeUuid
+from kava_plugin.worker_pool import (
+    chunked,
+    get_worker_token_table,
+    init_worker,
+    iter_in_order,
+)
+
+FORMATS = ["csv", "ndjson"]
+# the names trade_uuid values are derived from, or random for uuid4
+TRADE_UUIDS = ["random", "transaction", "address", "message"]
+
+
+class ReplayStats:
+    """documents read and CAAJ rows written by one replay, for the closing summary."""
+
+    def __init__(self):
+        self.documents = 0
+        self.bytes = 0
+        self.transactions = 0
+        self.rows = 0
+        self.started = time.perf_counter()
+
+    def count_documents(self, documents: Iterable[bytes]) -> Iterator[bytes]:
+        for document in documents:
+            self.documents += 1
+            self.bytes += len(document)
+            yield document
+
+    def format(self) -> str:
+        seconds = max(time.perf_counter() - self.started, 1e-9)
+        megabytes = self.bytes / 10**6
+        return "\n".join(
+            [
+                f"documents     {self.documents} ({megabytes:.1f} MB)",
+                f"transactions  {self.transactions}",
+                f"caaj rows     {self.rows}",
+                f"elapsed       {seconds:.2f}s",
+                f"throughput    {self.transactions / seconds:.1f} transactions/s, "
+                f"{self.rows / seconds:.1f} rows/s, {megabytes / seconds:.2f} MB/s",
+            ]
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _get_parser().parse_args(argv)
+    addresses = list(args.address or [])
+    if args.address_file is not None:
+        with open(args.address_file, encoding="utf-8") as address_file:
+            addresses.extend(line.strip() for line in address_file if line.strip())
+    if not addresses:
+        raise SystemExit("at least one --address or --address-file is required")
+    if args.workers < 1:
+        raise SystemExit(f"--workers must be positive. workers: {args.workers}")
+    if args.chunk_size < 1:
+        raise SystemExit(
+            f"--chunk-size must be positive. chunk_size: {args.chunk_size}"
+        )
+    if args.slow_log_size < 1:
+        raise SystemExit(
+            f"--slow-log-size must be positive. slow_log_size: {args.slow_log_size}"
+        )
+
+    try:
+        token_table = LocalTokenOriginalIdTable.open(
+            TOKEN_ORIGINAL_IDS_URL,
+            args.token_table,
+            max_age=args.token_table_max_age,
+            offline=args.offline,
+        )
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
+    if args.trade_uuid != "random":
+        KavaPlugin.set_trade_uuid(
+            TradeUuid(
+                per_address=args.trade_uuid != "transaction",
+                per_message=args.trade_uuid == "message",
+            )
+        )
+    if args.slow_log is not None:
+        KavaPlugin.set_slow_transaction_log(SlowTransactionLog(args.slow_log_size))
+
+    stats = ReplayStats()
+    documents = stats.count_documents(TransactionCorpus.iter_documents(args.paths))
+    rows = _iter_rows(
+        stats,
+        addresses,
+        documents,
+        token_table,
+        args.workers,
+        args.chunk_size,
+    )
+    try:
+        with _open_output(args.output) as out:
+            if args.format == "csv":
+                CaajCsvExport.write(rows, out, args.run_size, args.temp_dir)
+            else:
+                CaajNdjsonExport.write(rows, out)
+        print(stats.format(), file=sys.stderr)
+
+        slow_transaction_log = KavaPlugin.slow_transaction_log
+        if args.slow_log is not None and slow_transaction_log is not None:
+            with open(args.slow_log, "w", encoding="utf-8") as slow_log:
+                slow_transaction_log.dump(slow_log)
+    finally:
+        KavaPlugin.set_slow_transaction_log(None)
+        KavaPlugin.set_trade_uuid(None)
+    return 0
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="kava-caaj",
+        description="replay locally stored kava transactions into CAAJ journals",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="transaction files or directories: .json, .ndjson or .jsonl, optionally .gz",
+    )
+    parser.add_argument(
+        "-a", "--address", action="append", help="address to journal. repeatable"
+    )
+    parser.add_argument("--address-file", help="file with one address per line")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="output file, gzip compressed when it ends with .gz. stdout by default",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="csv is sorted by executed_at, ndjson keeps the input order",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes decoding and journaling transactions",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100,
+        help="transactions sent to a worker at a time",
+    )
+    parser.add_argument(
+        "--run-size",
+        type=int,
+        default=CaajCsvExport.DEFAULT_RUN_SIZE,
+        help="csv journal lines sorted in memory before spilling a run to disk",
+    )
+    parser.add_argument("--temp-dir", help="directory of the spilled csv runs")
+    parser.add_argument(
+        "--token-table",
+        default=DEFAULT_SNAPSHOT_PATH,
+        help="local snapshot of the token original id table",
+    )
+    parser.add_argument(
+        "--token-table-max-age",
+        type=float,
+        default=LocalTokenOriginalIdTable.DEFAULT_MAX_AGE,
+        help="seconds before the snapshot is refreshed from the token table URL",
+    )
+    parser.add_argument(
+        "--trade-uuid",
+        choices=TRADE_UUIDS,
+        default="random",
+        help="derive trade_uuid with uuid5 from the txhash, plus the address, "
+        "plus the message index, so re-runs give the same values",
+    )
+    parser.add_argument(
+        "--slow-log",
+        help="file to write the slowest transactions to, one JSON object per line",
+    )
+    parser.add_argument(
+        "--slow-log-size",
+        type=int,
+        default=20,
+        help="transactions kept in the slow log",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="use the token table snapshot without fetching it",
+    )
+    return parser
+
+
+def _iter_rows(
+    stats: ReplayStats,
+    addresses: List[str],
+    documents: Iterable[bytes],
+    token_table: TokenOriginalIdTable,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[tuple]:
+    for transactions, rows, observations in _iter_chunk_rows(
+        addresses, documents, token_table, workers, chunk_size
+    ):
+        stats.transactions += transactions
+        stats.rows += len(rows)
+        if observations is not None:
+            KavaPlugin.merge_hook_observations(observations)
+        yield from rows
+
+
+def _iter_chunk_rows(
+    addresses: List[str],
+    documents: Iterable[bytes],
+    token_table: TokenOriginalIdTable,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[Tuple[int, list, Optional[tuple]]]:
+    if workers < 1:
+        raise ValueError(f"workers must be positive. workers: {workers}")
+    # addresses is looked up per transaction
+    tracked = dict.fromkeys(addresses)
+    chunks = chunked(documents, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield _get_chunk_rows(tracked, chunk, token_table) + (None,)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(token_table, KavaPlugin.init_hooks, *KavaPlugin.get_hook_settings()),
+    ) as executor:
+        yield from iter_in_order(
+            workers,
+            (
+                executor.submit(_get_worker_chunk_rows, tracked, chunk)
+                for chunk in chunks
+            ),
+        )
+
+
+def _get_chunk_rows(
+    addresses: Collection[str],
+    documents: List[bytes],
+    token_table: TokenOriginalIdTable,
+) -> Tuple[int, list]:
+    # documents are sniffed first, so only kava transactions that may journal are decoded
+    transactions = 0
+    rows: list = []
+    for document in documents:
+        raw_transaction = RawKavaTransaction.from_bytes(document)
+        if KavaPlugin.chain not in raw_transaction.chain_id:
+            continue
+        transactions += 1
+        rows.extend(
+            KavaPlugin.get_caaj_rows_from_raw(
+                addresses, document, raw_transaction, token_table
+            )
+        )
+    return transactions, rows
+
+
+def _get_worker_chunk_rows(
+    addresses: Collection[str], documents: List[bytes]
+) -> Tuple[int, list, tuple]:
+    # what the hooks observed, such as the slowest transactions, goes back too
+    transactions, rows = _get_chunk_rows(addresses, documents, get_worker_token_table())
+    return transactions, rows, KavaPlugin.pop_hook_observations()
+
+
+def _open_output(path: str) -> ContextManager[IO[str]]:
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import gzip
+import logging
+import os
+from typing import IO, Iterable, Iterator, Union
+
+logger = logging.getLogger(name=__name__)
+logger.addHandler(logging.NullHandler())
+
+DOCUMENT_SUFFIXES = (".json",)
+LINE_SUFFIXES = (".ndjson", ".jsonl")
+
+
+class TransactionCorpus:
+    """raw transaction documents stored locally in the shape of tests/data.
+
+    a .json file holds one document and a .ndjson or .jsonl file one document
+    per line. any of them may be gzip compressed with a .gz suffix. directories
+    are walked recursively in name order, skipping files of other types.
+    """
+
+    @classmethod
+    def iter_documents(cls, paths: Iterable[str]) -> Iterator[bytes]:
+        for path in paths:
+            if os.path.isdir(path):
+                for file_path in TransactionCorpus._walk(path):
+                    yield from TransactionCorpus._iter_file(file_path)
+            else:
+                yield from TransactionCorpus._iter_file(path)
+
+    @classmethod
+    def is_corpus_file(cls, path: str) -> bool:
+        return TransactionCorpus._strip_gz(path).endswith(
+            DOCUMENT_SUFFIXES + LINE_SUFFIXES
+        )
+
+    @classmethod
+    def _walk(cls, directory: str) -> Iterator[str]:
+        for root, directories, files in os.walk(directory):
+            directories.sort()
+            for name in sorted(files):
+                if TransactionCorpus.is_corpus_file(name):
+                    yield os.path.join(root, name)
+
+    @classmethod
+    def _iter_file(cls, path: str) -> Iterator[bytes]:
+        if not TransactionCorpus.is_corpus_file(path):
+            raise ValueError(f"unsupported transaction file type. path: {path}")
+        logger.debug(f"reading {path}")
+        with TransactionCorpus._open(path) as corpus_file:
+            if TransactionCorpus._strip_gz(path).endswith(DOCUMENT_SUFFIXES):
+                yield corpus_file.read()
+                return
+            for line in corpus_file:
+                line = line.strip()
+                if line:
+                    yield line
+
+    @classmethod
+    def _open(cls, path: str) -> Union[IO[bytes], gzip.GzipFile]:
+        if path.endswith(".gz"):
+            return gzip.open(path, "rb")
+        return open(path, "rb")
+
+    @classmethod
+    def _strip_gz(cls, path: str) -> str:
+        return path[: -len(".gz")] if path.endswith(".gz") else path
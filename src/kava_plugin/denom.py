@@ -0,0 +1,74 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(name=__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_DENOMS_PATH = os.path.join(os.path.dirname(__file__), "data", "denoms.json")
+
+
+class Denom(NamedTuple):
+    token: str
+    decimals: int
+    original_id: Optional[str]
+
+
+class DenomRegistry:
+    """raw denoms and canonical tokens mapped to token, decimals and original id.
+
+    denoms missing from the registry are their own token and original id, with
+    DEFAULT_DECIMALS decimals.
+    """
+
+    DEFAULT_DECIMALS = 6
+    denoms: Dict[str, Denom] = {}
+    fingerprint: Optional[str] = None
+
+    @classmethod
+    def register(
+        cls, denom: str, token: str, decimals: int, original_id: Optional[str]
+    ) -> None:
+        cls.denoms[denom] = Denom(token, decimals, original_id)
+        DenomRegistry.fingerprint = None
+
+    @classmethod
+    def get_fingerprint(cls) -> str:
+        """a hash of the registered denoms, which changes with every new mapping."""
+        fingerprint = DenomRegistry.fingerprint
+        if fingerprint is None:
+            entries = sorted(
+                [denom, *found] for denom, found in DenomRegistry.denoms.items()
+            )
+            fingerprint = hashlib.sha256(json.dumps(entries).encode()).hexdigest()[:16]
+            DenomRegistry.fingerprint = fingerprint
+        return fingerprint
+
+    @classmethod
+    def load(cls, path: str) -> None:
+        with open(path, encoding="utf-8") as denoms_file:
+            entries = json.load(denoms_file)["denoms"]
+        for entry in entries:
+            cls.register(
+                entry["denom"],
+                entry["token"],
+                entry["decimals"],
+                entry.get("original_id", entry["token"]),
+            )
+        logger.debug(f"loaded {len(entries)} denoms from {path}")
+
+    @classmethod
+    def get(cls, denom: str) -> Denom:
+        found = cls.denoms.get(denom)
+        if found is None:
+            return Denom(denom, cls.DEFAULT_DECIMALS, denom)
+        return found
+
+    @classmethod
+    def _register_default_denoms(cls):
+        cls.load(DEFAULT_DENOMS_PATH)
+
+
+DenomRegistry._register_default_denoms()
@@ -0,0 +1,334 @@
+import heapq
+import itertools
+import json
+import threading
+from bisect import bisect_left
+from typing import IO, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+from senkalib.chain.transaction import Transaction
+
+# upper bounds in seconds. message handlers take microseconds, whole
+# transactions tens of microseconds to milliseconds
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.1,
+)
+PROMETHEUS_PREFIX = "kava_plugin"
+
+
+class Histogram:
+    """latency observations counted into cumulative buckets, as in prometheus."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # the last count is the +Inf bucket
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def merge(self, other: "Histogram") -> None:
+        if other.bounds != self.bounds:
+            raise ValueError(
+                f"bucket bounds differ. bounds: {self.bounds}, other: {other.bounds}"
+            )
+        self.counts = [
+            count + other_count for count, other_count in zip(self.counts, other.counts)
+        ]
+        self.count += other.count
+        self.sum += other.sum
+
+    def get_buckets(self) -> Dict[str, int]:
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+        return buckets
+
+    def snapshot(self) -> dict:
+        return {"count": self.count, "sum": self.sum, "buckets": self.get_buckets()}
+
+
+class Instrumentation:
+    """per-action counters and latency histograms of the message and CAAJ hot paths.
+
+    enabled with KavaPlugin.set_instrumentation. MessageFactory.get_messages,
+    Message.get_result and the journaling of each transaction by KavaPlugin only
+    check a class attribute while it is disabled. updates are serialized with a
+    lock so one instance can be shared between threads, as by
+    get_caajs_threaded. worker processes of get_caajs_bulk send what they
+    observed with every chunk, which is merged into the parent's instance.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self) -> dict:
+        with self.lock:
+            state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.get_result: Dict[str, Histogram] = {}
+            self.unknown_actions: Dict[str, int] = {}
+            self.get_messages = Histogram(self.buckets)
+            self.messages = 0
+            self.get_caajs = Histogram(self.buckets)
+            self.caaj_lines: Dict[str, int] = {}
+
+    def observe_result(self, action: Optional[str], seconds: float) -> None:
+        with self.lock:
+            histogram = self.get_result.get(str(action))
+            if histogram is None:
+                histogram = self.get_result[str(action)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_unknown_action(self, action: Optional[str]) -> None:
+        with self.lock:
+            key = str(action)
+            self.unknown_actions[key] = self.unknown_actions.get(key, 0) + 1
+
+    def observe_messages(self, messages: int, seconds: float) -> None:
+        with self.lock:
+            self.get_messages.observe(seconds)
+            self.messages += messages
+
+    def observe_caajs(self, seconds: float) -> None:
+        with self.lock:
+            self.get_caajs.observe(seconds)
+
+    def observe_caaj_lines(self, action: Optional[str], lines: int) -> None:
+        with self.lock:
+            key = str(action)
+            self.caaj_lines[key] = self.caaj_lines.get(key, 0) + lines
+
+    def merge(self, other: "Instrumentation") -> None:
+        """adds the observations of another instance, such as a worker's."""
+        with self.lock:
+            for action, histogram in other.get_result.items():
+                if action not in self.get_result:
+                    self.get_result[action] = Histogram(self.buckets)
+                self.get_result[action].merge(histogram)
+            for action, count in other.unknown_actions.items():
+                self.unknown_actions[action] = (
+                    self.unknown_actions.get(action, 0) + count
+                )
+            self.get_messages.merge(other.get_messages)
+            self.messages += other.messages
+            self.get_caajs.merge(other.get_caajs)
+            for action, lines in other.caaj_lines.items():
+                self.caaj_lines[action] = self.caaj_lines.get(action, 0) + lines
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "get_result": {
+                    action: histogram.snapshot()
+                    for action, histogram in self.get_result.items()
+                },
+                "unknown_actions": dict(self.unknown_actions),
+                "get_messages": self.get_messages.snapshot(),
+                "messages": self.messages,
+                "get_caajs": self.get_caajs.snapshot(),
+                "caaj_lines": dict(self.caaj_lines),
+            }
+
+    def to_prometheus(self) -> str:
+        """the snapshot in the prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: list = []
+        Instrumentation._add_histograms(
+            lines,
+            "get_result_seconds",
+            "Message.get_result latency per action.",
+            Instrumentation._by_action(snapshot["get_result"]),
+        )
+        Instrumentation._add_counters(
+            lines,
+            "unknown_actions_total",
+            "Message.get_result calls without a handler, per raw action.",
+            Instrumentation._by_action(snapshot["unknown_actions"]),
+        )
+        Instrumentation._add_histograms(
+            lines,
+            "get_messages_seconds",
+            "MessageFactory.get_messages latency per transaction.",
+            [((), snapshot["get_messages"])],
+        )
+        Instrumentation._add_counters(
+            lines,
+            "messages_total",
+            "messages created by MessageFactory.get_messages.",
+            [((), snapshot["messages"])],
+        )
+        Instrumentation._add_histograms(
+            lines,
+            "get_caajs_seconds",
+            "CAAJ journaling latency per transaction, over all of its addresses.",
+            [((), snapshot["get_caajs"])],
+        )
+        Instrumentation._add_counters(
+            lines,
+            "caaj_lines_total",
+            "CAAJ journal lines emitted per action, fee lines as fee.",
+            Instrumentation._by_action(snapshot["caaj_lines"]),
+        )
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def _by_action(cls, values: dict) -> list:
+        return [((("action", action),), value) for action, value in values.items()]
+
+    @classmethod
+    def _add_counters(
+        cls, lines: list, name: str, help_text: str, samples: list
+    ) -> None:
+        name = f"{PROMETHEUS_PREFIX}_{name}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in samples:
+            lines.append(f"{name}{Instrumentation._format_labels(labels)} {value}")
+
+    @classmethod
+    def _add_histograms(
+        cls, lines: list, name: str, help_text: str, samples: list
+    ) -> None:
+        name = f"{PROMETHEUS_PREFIX}_{name}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in samples:
+            for bound, count in histogram["buckets"].items():
+                bucket_labels = Instrumentation._format_labels(
+                    labels + (("le", bound),)
+                )
+                lines.append(f"{name}_bucket{bucket_labels} {count}")
+            formatted = Instrumentation._format_labels(labels)
+            lines.append(f"{name}_sum{formatted} {histogram['sum']!r}")
+            lines.append(f"{name}_count{formatted} {histogram['count']}")
+
+    @classmethod
+    def _format_labels(cls, labels: Tuple[Tuple[str, str], ...]) -> str:
+        if not labels:
+            return ""
+        escaped = [f'{key}="{Instrumentation._escape(value)}"' for key, value in labels]
+        return "{" + ",".join(escaped) + "}"
+
+    @classmethod
+    def _escape(cls, value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SlowTransaction(NamedTuple):
+    seconds: float
+    transaction_id: str
+    height: Optional[str]
+    messages: int
+    actions: List[Optional[str]]
+    parse_seconds: float
+    build_seconds: float
+
+
+class SlowTransactionLog:
+    """the size slowest transactions journaled, kept in a min-heap of their total time.
+
+    parse time covers MessageFactory.get_messages and Message.get_result, build
+    time the CAAJ builders. enabled with KavaPlugin.set_slow_transaction_log,
+    it sees every transaction journaled by KavaPlugin, including the workers of
+    get_caajs_bulk. a record is only created for transactions slower than the
+    current minimum.
+    """
+
+    def __init__(self, size: int = 100):
+        if size < 1:
+            raise ValueError(f"size must be positive. size: {size}")
+        self.size = size
+        self.observed = 0
+        self.heap: List[Tuple[float, int, SlowTransaction]] = []
+        # breaks ties between equal times, so records are never compared
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+
+    def observe(
+        self,
+        transaction: Transaction,
+        results: list,
+        parse_seconds: float,
+        build_seconds: float,
+    ) -> None:
+        seconds = parse_seconds + build_seconds
+        with self.lock:
+            self.observed += 1
+            if len(self.heap) >= self.size and seconds <= self.heap[0][0]:
+                return
+
+        record = SlowTransaction(
+            seconds,
+            transaction.get_transaction_id(),
+            # a transaction sniffed from raw json, such as a failed one, has no height
+            transaction.get_transaction()["data"].get("height")
+            if isinstance(transaction, KavaTransaction)
+            else None,
+            len(results),
+            [
+                result["action"] if isinstance(result, dict) else result.action
+                for result in results
+            ],
+            parse_seconds,
+            build_seconds,
+        )
+        with self.lock:
+            self.__push(record)
+
+    def merge(self, records: List[SlowTransaction], observed: int) -> None:
+        """adds the slowest records and observed count of another log, such as a worker's."""
+        with self.lock:
+            self.observed += observed
+            for record in records:
+                self.__push(record)
+
+    def get_slowest(self) -> List[SlowTransaction]:
+        with self.lock:
+            return [record for _, _, record in sorted(self.heap, reverse=True)]
+
+    def dump(self, out: IO[str]) -> None:
+        """the slowest transactions first, as one JSON object per line."""
+        for record in self.get_slowest():
+            out.write(json.dumps(record._asdict()))
+            out.write("\n")
+
+    def clear(self) -> None:
+        with self.lock:
+            self.heap.clear()
+            self.observed = 0
+
+    def __push(self, record: SlowTransaction) -> None:
+        entry = (record.seconds, next(self.sequence), record)
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, entry)
+        elif record.seconds > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
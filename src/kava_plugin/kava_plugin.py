@@ -1,26 +1,224 @@
+import os
 import uuid
-from decimal import Decimal
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from senkalib.caaj_journal import CaajJournal
 from senkalib.chain.kava.kava_transaction import KavaTransaction
+from senkalib.chain.transaction import Transaction
 from senkalib.token_original_id_table import TokenOriginalIdTable
 
+from kava_plugin.caaj_batch import CaajBatch, caaj_to_row
+from kava_plugin.denom import Denom
+from kava_plugin.instrumentation import Instrumentation, SlowTransactionLog
+from kava_plugin.kava_util import KavaUtil
+from kava_plugin.message import Message
 from kava_plugin.message_factory import MessageFactory
+from kava_plugin.message_result import (
+    CoinResult,
+    CreateCdpResult,
+    EmptyResult,
+    RepayCdpResult,
+    RewardResult,
+    SwapDepositResult,
+    SwapTradeResult,
+    SwapWithdrawResult,
+    TransferResult,
+)
+from kava_plugin.raw_transaction import RawKavaTransaction
+from kava_plugin.result_cache import ResultCache
+from kava_plugin.trade_uuid import TradeUuid
+from kava_plugin.worker_pool import (
+    check_chunk_size,
+    chunked,
+    get_worker_token_table,
+    init_worker,
+    iter_in_order,
+)
 
-MEGA = 10**6
 EXA = 10**18
+ADDRESS_PREFIX = "kava1"
+# message fields holding the signer, which pays the fee of the first message
+SIGNER_KEYS = [
+    "from_address",
+    "delegator_address",
+    "sender",
+    "from",
+    "depositor",
+    "borrower",
+    "requester",
+    "voter",
+    "owner",
+]
+
+CaajBuilder = Callable[[KavaTransaction, Any, TokenOriginalIdTable, str, str], list]
 
 
 class KavaPlugin:
     chain = "kava"
     PLATFORM = "kava"
+    caaj_builders: Dict[str, CaajBuilder] = {}
+    result_cache: Optional[ResultCache] = None
+    instrumentation: Optional[Instrumentation] = None
+    slow_transaction_log: Optional[SlowTransactionLog] = None
+    trade_uuid: Optional[TradeUuid] = None
+
+    @classmethod
+    def register_caaj_builder(cls, actions: list, builder: CaajBuilder) -> None:
+        for action in actions:
+            cls.caaj_builders[action] = builder
+
+    @classmethod
+    def set_instrumentation(cls, instrumentation: Optional[Instrumentation]) -> None:
+        """enables the hooks of get_caajs, MessageFactory and Message, or with None disables them."""
+        KavaPlugin.instrumentation = instrumentation
+        MessageFactory.instrumentation = instrumentation
+        Message.instrumentation = instrumentation
+
+    @classmethod
+    def set_slow_transaction_log(
+        cls, slow_transaction_log: Optional[SlowTransactionLog]
+    ) -> None:
+        """records the slowest transactions of get_caajs and iter_caaj_rows_for_addresses."""
+        KavaPlugin.slow_transaction_log = slow_transaction_log
+
+    @classmethod
+    def set_trade_uuid(cls, trade_uuid: Optional[TradeUuid]) -> None:
+        """derives trade_uuid values with trade_uuid, or with None draws them with uuid4."""
+        KavaPlugin.trade_uuid = trade_uuid
+
+    @classmethod
+    def get_hook_settings(cls) -> tuple:
+        """the settings of the hooks, for init_hooks in a worker process."""
+        instrumentation = KavaPlugin.instrumentation
+        slow_transaction_log = KavaPlugin.slow_transaction_log
+        return (
+            KavaPlugin.trade_uuid,
+            None if instrumentation is None else instrumentation.buckets,
+            0 if slow_transaction_log is None else slow_transaction_log.size,
+        )
+
+    @classmethod
+    def init_hooks(
+        cls,
+        trade_uuid: Optional[TradeUuid],
+        instrumentation_buckets: Optional[tuple],
+        slow_log_size: int,
+    ) -> None:
+        """sets hooks like those of get_hook_settings, with nothing observed yet."""
+        # hooks are set explicitly, as forked workers inherit the parent's instances
+        KavaPlugin.set_trade_uuid(trade_uuid)
+        KavaPlugin.set_instrumentation(
+            None
+            if instrumentation_buckets is None
+            else Instrumentation(instrumentation_buckets)
+        )
+        KavaPlugin.set_slow_transaction_log(
+            SlowTransactionLog(slow_log_size) if slow_log_size > 0 else None
+        )
+
+    @classmethod
+    def pop_hook_observations(cls) -> tuple:
+        """what the hooks observed since the last call, for merge_hook_observations."""
+        instrumentation = KavaPlugin.instrumentation
+        if instrumentation is not None:
+            KavaPlugin.set_instrumentation(Instrumentation(instrumentation.buckets))
+        slow_transactions = None
+        slow_transaction_log = KavaPlugin.slow_transaction_log
+        if slow_transaction_log is not None:
+            slow_transactions = (
+                slow_transaction_log.get_slowest(),
+                slow_transaction_log.observed,
+            )
+            slow_transaction_log.clear()
+        return instrumentation, slow_transactions
+
+    @classmethod
+    def merge_hook_observations(cls, observations: tuple) -> None:
+        instrumentation, slow_transactions = observations
+        if instrumentation is not None and KavaPlugin.instrumentation is not None:
+            KavaPlugin.instrumentation.merge(instrumentation)
+        slow_transaction_log = KavaPlugin.slow_transaction_log
+        if slow_transactions is not None and slow_transaction_log is not None:
+            slow_transaction_log.merge(*slow_transactions)
 
     @classmethod
     def can_handle(cls, transaction: KavaTransaction) -> bool:
         chain_type = transaction.get_transaction()["header"]["chain_id"]
         return KavaPlugin.chain in chain_type
 
+    @classmethod
+    def can_handle_raw(cls, raw: Union[bytes, str]) -> bool:
+        return KavaPlugin.chain in RawKavaTransaction.from_bytes(raw).chain_id
+
+    @classmethod
+    def get_caajs_from_raw(
+        cls,
+        address: str,
+        raw: Union[bytes, str],
+        token_table: TokenOriginalIdTable,
+    ) -> list:
+        raw_transaction = RawKavaTransaction.from_bytes(raw)
+        if KavaPlugin.chain not in raw_transaction.chain_id:
+            return []
+        if raw_transaction.get_fail() is False:
+            transaction = KavaTransaction(RawKavaTransaction.decode(raw))
+            return KavaPlugin.get_caajs(address, transaction, token_table)
+
+        # a failed transaction journals its fee only, from the sniffed fields
+        trade_uuid = KavaPlugin._get_uuid(raw_transaction.get_transaction_id(), address)
+        return [
+            CaajJournal(*row)
+            for row in KavaPlugin._iter_observed(
+                raw_transaction,
+                lambda: [],
+                lambda results: KavaPlugin._iter_fee_rows(
+                    address, raw_transaction, token_table, trade_uuid
+                ),
+            )
+        ]
+
+    @classmethod
+    def get_caaj_rows_from_raw(
+        cls,
+        addresses: Collection[str],
+        raw: Union[bytes, str],
+        raw_transaction: RawKavaTransaction,
+        token_table: TokenOriginalIdTable,
+    ) -> list:
+        """iter_caaj_rows_for_addresses of a kava document sniffed into raw_transaction.
+
+        addresses is looked up per transaction, a large one is better a dict or a set.
+        a failed transaction without fee is not decoded.
+        """
+        if (
+            raw_transaction.get_fail() is not False
+            and raw_transaction.get_transaction_fee() == 0
+        ):
+            # observed like any transaction, with nothing to journal or decode
+            return list(
+                KavaPlugin._iter_observed(raw_transaction, lambda: [], lambda _: [])
+            )
+        transaction = KavaTransaction(RawKavaTransaction.decode(raw))
+        return [
+            row if isinstance(row, tuple) else caaj_to_row(row)
+            for row in KavaPlugin._iter_transaction_rows(
+                addresses, transaction, token_table, involved_only=True
+            )
+        ]
+
     @classmethod
     def get_caajs(
         cls,
@@ -28,176 +226,384 @@ class KavaPlugin:
         transaction: KavaTransaction,
         token_table: TokenOriginalIdTable,
     ) -> list:
-        caajs = []
-
-        messages = (
-            MessageFactory.get_messages(transaction)
-            if transaction.get_fail() is False
-            else []
+        return list(
+            KavaPlugin._iter_transaction_caajs(address, transaction, token_table)
         )
-        trade_uuid = KavaPlugin._get_uuid()
-        for message in messages:
-            try:
-                result = message.get_result()
-            except Exception as e:
-                raise e
-
-            if result["action"] == "delegate":
-                caajs.extend(
-                    KavaPlugin.__get_delegate_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "begin_redelegate":
-                caajs.extend(
-                    KavaPlugin.__get_delegate_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "begin_unbonding":
-                caajs.extend(
-                    KavaPlugin.__get_begin_unbonding_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "create_cdp":
-                caajs.extend(
-                    KavaPlugin.__get_create_cdp_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "draw_cdp":
-                caajs.extend(
-                    KavaPlugin.__get_draw_cdp_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "repay_cdp":
-                caajs.extend(
-                    KavaPlugin.__get_repay_cdp_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "deposit_cdp":
-                caajs.extend(
-                    KavaPlugin.__get_deposit_cdp_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "withdraw_cdp":
-                caajs.extend(
-                    KavaPlugin.__get_withdraw_cdp_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "claim_usdx_minting_reward":
-                caajs.extend(
-                    KavaPlugin.__get_claim_usdx_minting_reward_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "hard_withdraw":
-                caajs.extend(
-                    KavaPlugin.__get_hard_withdraw_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "hard_deposit":
-                caajs.extend(
-                    KavaPlugin.__get_hard_deposit_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "hard_borrow":
-                caajs.extend(
-                    KavaPlugin.__get_hard_borrow_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "hard_repay":
-                caajs.extend(
-                    KavaPlugin.__get_hard_repay_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "claim_hard_reward":
-                caajs.extend(
-                    KavaPlugin.__get_claim_hard_reward_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "swap_exact_for_tokens":
-                caajs.extend(
-                    KavaPlugin.__get_swap_exact_for_tokens_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "swap_deposit":
-                caajs.extend(
-                    KavaPlugin.__get_swap_deposit_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "swap_withdraw":
-                caajs.extend(
-                    KavaPlugin.__get_swap_withdraw_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
-                )
-            elif result["action"] == "claim_swap_reward":
-                caajs.extend(
-                    KavaPlugin.__get_claim_swap_reward_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
+
+    @classmethod
+    def iter_caajs(
+        cls,
+        address: str,
+        transactions: Iterable[KavaTransaction],
+        token_table: TokenOriginalIdTable,
+    ) -> Iterator[CaajJournal]:
+        for transaction in transactions:
+            if KavaPlugin.can_handle(transaction):
+                yield from KavaPlugin._iter_transaction_caajs(
+                    address, transaction, token_table
                 )
-            elif result["action"] == "send":
-                caajs.extend(
-                    KavaPlugin.__get_send_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
+
+    @classmethod
+    def write_caajs(
+        cls,
+        address: str,
+        transactions: Iterable[KavaTransaction],
+        token_table: TokenOriginalIdTable,
+        batch: Optional[CaajBatch] = None,
+    ) -> CaajBatch:
+        """like iter_caajs, appending the journal lines to columnar batch."""
+        batch = batch if batch is not None else CaajBatch()
+        for transaction in transactions:
+            if KavaPlugin.can_handle(transaction):
+                batch.extend(
+                    KavaPlugin._iter_transaction_rows(
+                        [address], transaction, token_table
                     )
                 )
-            elif (
-                result["action"] == "create_atomic_swap"
-                or result["action"] == "claim_atomic_swap"
+        return batch
+
+    @classmethod
+    def iter_caaj_rows(
+        cls,
+        address: str,
+        transactions: Iterable[KavaTransaction],
+        token_table: TokenOriginalIdTable,
+    ) -> Iterator[tuple]:
+        """like iter_caajs, yielding CaajJournal fields as tuples in field order."""
+        return KavaPlugin._iter_caaj_rows([address], transactions, token_table, False)
+
+    @classmethod
+    def iter_caaj_rows_for_addresses(
+        cls,
+        addresses: Iterable[str],
+        transactions: Iterable[KavaTransaction],
+        token_table: TokenOriginalIdTable,
+    ) -> Iterator[tuple]:
+        """iter_caaj_rows of each address per transaction, decoding the messages once.
+
+        like get_caajs_for_addresses, addresses that take no part in a transaction
+        get no rows of it, and only the fee payer journals the fee.
+        """
+        return KavaPlugin._iter_caaj_rows(
+            dict.fromkeys(addresses), transactions, token_table, True
+        )
+
+    @classmethod
+    def _iter_caaj_rows(
+        cls,
+        addresses: Collection[str],
+        transactions: Iterable[KavaTransaction],
+        token_table: TokenOriginalIdTable,
+        involved_only: bool,
+    ) -> Iterator[tuple]:
+        for transaction in transactions:
+            if not KavaPlugin.can_handle(transaction):
+                continue
+            for row in KavaPlugin._iter_transaction_rows(
+                addresses, transaction, token_table, involved_only
             ):
-                caajs.extend(
-                    KavaPlugin.__get_create_atomic_swap_caajs(
-                        transaction, result["result"], token_table, address, trade_uuid
-                    )
+                yield row if isinstance(row, tuple) else caaj_to_row(row)
+
+    @classmethod
+    def _iter_addresses_rows(
+        cls,
+        addresses: Collection[str],
+        transaction: KavaTransaction,
+        results: list,
+        token_table: TokenOriginalIdTable,
+        involved_only: bool,
+    ) -> Iterator[Any]:
+        if not involved_only:
+            for address in addresses:
+                yield from KavaPlugin._iter_results_rows(
+                    address, transaction, results, token_table
                 )
-            elif result["action"] == "vote":
-                pass
+            return
+
+        for address, fee in KavaPlugin._iter_involved(addresses, transaction):
+            yield from KavaPlugin._iter_results_rows(
+                address, transaction, results, token_table, fee
+            )
+
+    @classmethod
+    def _iter_involved(
+        cls, addresses: Collection[str], transaction: KavaTransaction
+    ) -> Iterator[Tuple[str, bool]]:
+        # each address of addresses involved in transaction, and whether it pays
+        # the fee. those of transaction are looked up in addresses, not the other
+        # way around, as there may be many more addresses
+        fee_payer = KavaPlugin._get_fee_payer(transaction)
+        for address in KavaPlugin._get_involved_addresses(transaction):
+            if address in addresses:
+                yield address, address == fee_payer
+
+    @classmethod
+    def get_caajs_for_addresses(
+        cls,
+        addresses: Iterable[str],
+        transaction: KavaTransaction,
+        token_table: TokenOriginalIdTable,
+    ) -> Dict[str, list]:
+        """the CAAJs of each address, decoding the messages once.
+
+        addresses that take no part in transaction get no CAAJs, and only the
+        fee payer journals the fee.
+        """
+        caajs: Dict[str, list] = {address: [] for address in addresses}
+        for address, address_caajs in KavaPlugin._iter_observed(
+            transaction,
+            lambda: KavaPlugin._get_results(transaction),
+            lambda results: KavaPlugin._iter_addresses_caajs(
+                caajs, transaction, results, token_table
+            ),
+        ):
+            caajs[address] = address_caajs
+        return caajs
+
+    @classmethod
+    def _iter_addresses_caajs(
+        cls,
+        addresses: Collection[str],
+        transaction: KavaTransaction,
+        results: list,
+        token_table: TokenOriginalIdTable,
+    ) -> Iterator[Tuple[str, list]]:
+        for address, fee in KavaPlugin._iter_involved(addresses, transaction):
+            yield address, list(
+                KavaPlugin._iter_results_caajs(
+                    address, transaction, results, token_table, fee
+                )
+            )
+
+    @classmethod
+    def _iter_transaction_caajs(
+        cls,
+        address: str,
+        transaction: KavaTransaction,
+        token_table: TokenOriginalIdTable,
+    ) -> Iterator[CaajJournal]:
+        for row in KavaPlugin._iter_transaction_rows(
+            [address], transaction, token_table
+        ):
+            yield CaajJournal(*row) if isinstance(row, tuple) else row
+
+    @classmethod
+    def _iter_transaction_rows(
+        cls,
+        addresses: Collection[str],
+        transaction: KavaTransaction,
+        token_table: TokenOriginalIdTable,
+        involved_only: bool = False,
+    ) -> Iterator[Any]:
+        return KavaPlugin._iter_observed(
+            transaction,
+            lambda: KavaPlugin._get_results(transaction),
+            lambda results: KavaPlugin._iter_addresses_rows(
+                addresses, transaction, results, token_table, involved_only
+            ),
+        )
+
+    @classmethod
+    def _iter_observed(
+        cls,
+        transaction: Transaction,
+        get_results: Callable[[], list],
+        build: Callable[[list], Iterable[Any]],
+    ) -> Iterator[Any]:
+        # every journaling path goes through here, with get_results parsing the
+        # messages of transaction and build journaling them. with instrumentation
+        # or the slow transaction log the rows are collected first, so the
+        # consumer's time is not counted
+        instrumentation = KavaPlugin.instrumentation
+        slow_transaction_log = KavaPlugin.slow_transaction_log
+        if instrumentation is None and slow_transaction_log is None:
+            return iter(build(get_results()))
+
+        started = perf_counter()
+        results = get_results()
+        parsed = perf_counter()
+        rows = list(build(results))
+        finished = perf_counter()
+        if instrumentation is not None:
+            instrumentation.observe_caajs(finished - started)
+        if slow_transaction_log is not None:
+            slow_transaction_log.observe(
+                transaction, results, parsed - started, finished - parsed
+            )
+        return iter(rows)
+
+    @classmethod
+    def _get_results(cls, transaction: KavaTransaction) -> list:
+        if transaction.get_fail() is not False:
+            return []
+
+        result_cache = KavaPlugin.result_cache
+        if result_cache is not None:
+            results = result_cache.get(transaction.get_transaction_id())
+            if results is not None:
+                return results
+
+        results = [
+            message.get_result() for message in MessageFactory.get_messages(transaction)
+        ]
+        if result_cache is not None:
+            result_cache.put(transaction.get_transaction_id(), results)
+        return results
+
+    @classmethod
+    def _iter_results_caajs(
+        cls,
+        address: str,
+        transaction: KavaTransaction,
+        results: list,
+        token_table: TokenOriginalIdTable,
+        fee: bool = True,
+    ) -> Iterator[CaajJournal]:
+        for row in KavaPlugin._iter_results_rows(
+            address, transaction, results, token_table, fee
+        ):
+            # builders registered at runtime may return CaajJournal themselves
+            yield CaajJournal(*row) if isinstance(row, tuple) else row
+
+    @classmethod
+    def _iter_results_rows(
+        cls,
+        address: str,
+        transaction: KavaTransaction,
+        results: list,
+        token_table: TokenOriginalIdTable,
+        fee: bool = True,
+    ) -> Iterator[Any]:
+        # builders emit CaajJournal fields as tuples, in field order
+        trade_uuid = KavaPlugin._get_uuid(transaction.get_transaction_id(), address)
+        per_message = (
+            KavaPlugin.trade_uuid is not None and KavaPlugin.trade_uuid.per_message
+        )
+        for message_index, result in enumerate(results):
+            if isinstance(result, dict):
+                # handlers registered with the former {"action", "result"} dicts
+                action, result = result["action"], result["result"]
             else:
+                action = result.action
+            builder = KavaPlugin.caaj_builders.get(action)
+            if builder is None:
                 raise Exception(
                     f"This type of transaction is not defined. transaction_id: {transaction.get_transaction_id()}"
                 )
+            message_uuid = trade_uuid
+            if per_message:
+                message_uuid = KavaPlugin._get_uuid(
+                    transaction.get_transaction_id(), address, message_index
+                )
+            rows = builder(transaction, result, token_table, address, message_uuid)
+            if KavaPlugin.instrumentation is not None:
+                KavaPlugin.instrumentation.observe_caaj_lines(action, len(rows))
+            yield from rows
 
-        transaction_fee = transaction.get_transaction_fee()
-        if transaction_fee != 0:
-            caaj_fee = KavaPlugin._get_caaj_fee(
+        if fee:
+            yield from KavaPlugin._iter_fee_rows(
                 address, transaction, token_table, trade_uuid
             )
-            caajs.extend(caaj_fee)
 
-        return caajs
+    @classmethod
+    def _iter_fee_rows(
+        cls,
+        address: str,
+        transaction: Transaction,
+        token_table: TokenOriginalIdTable,
+        trade_uuid: str,
+    ) -> Iterator[tuple]:
+        if transaction.get_transaction_fee() == 0:
+            return
+        rows = KavaPlugin._get_caaj_fee(address, transaction, token_table, trade_uuid)
+        if KavaPlugin.instrumentation is not None:
+            KavaPlugin.instrumentation.observe_caaj_lines("fee", len(rows))
+        yield from rows
+
+    @classmethod
+    def get_caajs_bulk(
+        cls,
+        address: str,
+        transactions: Iterable[KavaTransaction],
+        token_table: TokenOriginalIdTable,
+        workers: Optional[int] = None,
+        chunk_size: int = 100,
+    ) -> list:
+        # builders registered at runtime are not visible to spawned worker
+        # processes, and token_table is pickled once into each worker
+        check_chunk_size(chunk_size)
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if workers == 1:
+            return _get_caajs_chunk(address, list(transactions), token_table)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(
+                token_table,
+                KavaPlugin.init_hooks,
+                *KavaPlugin.get_hook_settings(),
+            ),
+        ) as executor:
+            caajs: list = []
+            for chunk_caajs, observations in iter_in_order(
+                workers,
+                (
+                    executor.submit(_get_worker_caajs_chunk, address, chunk)
+                    for chunk in chunked(transactions, chunk_size)
+                ),
+            ):
+                KavaPlugin.merge_hook_observations(observations)
+                caajs.extend(chunk_caajs)
+            return caajs
+
+    @classmethod
+    def get_caajs_threaded(
+        cls,
+        address: str,
+        transactions: Iterable[KavaTransaction],
+        token_table: TokenOriginalIdTable,
+        workers: Optional[int] = None,
+        chunk_size: int = 100,
+    ) -> list:
+        # all threads share token_table and KavaPlugin.result_cache. amounts are
+        # integers and Decimal division goes through kava_util.DECIMAL_CONTEXT,
+        # so the thread-local decimal context of a worker does not matter
+        check_chunk_size(chunk_size)
+        workers = workers if workers is not None else min(32, (os.cpu_count() or 1) + 4)
+        if workers == 1:
+            return _get_caajs_chunk(address, list(transactions), token_table)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            caajs: list = []
+            for chunk_caajs in iter_in_order(
+                workers,
+                (
+                    executor.submit(_get_caajs_chunk, address, chunk, token_table)
+                    for chunk in chunked(transactions, chunk_size)
+                ),
+            ):
+                caajs.extend(chunk_caajs)
+            return caajs
 
     @classmethod
     def __get_delegate_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
-        if result["staking_amount"] is not None and Decimal(
-            result["staking_amount"]
-        ) != Decimal("0"):
-            token_original_id = KavaPlugin._get_token_original_id(
-                result["staking_token"]
-            )
+        if result.amount is not None and not result.amount.is_zero():
+            token_original_id = KavaPlugin._get_token_original_id(result.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
 
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -205,25 +611,23 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "deposit",
-                    result["staking_amount"],
-                    result["staking_token"],
+                    str(result.amount),
+                    result.token,
                     token_original_id,
                     symbol_uuid,
                     address,
                     "kava_validator",
-                    f'staking {result["staking_amount"]} {result["staking_token"]}',
+                    f"staking {result.amount} {result.token}",
                 )
             )
         # try to find delegate reward
-        for reward in result["rewards"]:
-            token_original_id = KavaPlugin._get_token_original_id(
-                reward["reward_token"]
-            )
+        for reward in result.rewards or []:
+            token_original_id = KavaPlugin._get_token_original_id(reward.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -231,34 +635,35 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "get",
-                    reward["reward_amount"],
-                    reward["reward_token"],
+                    str(reward.amount),
+                    reward.token,
                     token_original_id,
                     symbol_uuid,
                     "kava_staking_reward",
                     address,
-                    f'staking reward {reward["reward_amount"]} {reward["reward_token"]}',
+                    f"staking reward {reward.amount} {reward.token}",
                 )
             )
         return caajs
 
     @classmethod
     def __get_begin_unbonding_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
-        if result["unbonding_amount"] is not None and Decimal(
-            result["unbonding_amount"]
-        ) != Decimal("0"):
-            token_original_id = KavaPlugin._get_token_original_id(
-                result["unbonding_token"]
-            )
+        if result.amount is not None and not result.amount.is_zero():
+            token_original_id = KavaPlugin._get_token_original_id(result.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
 
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -266,25 +671,23 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "withdraw",
-                    result["unbonding_amount"],
-                    result["unbonding_token"],
+                    str(result.amount),
+                    result.token,
                     token_original_id,
                     symbol_uuid,
                     "kava_validator",
                     address,
-                    f'unstaking {result["unbonding_amount"]} {result["unbonding_token"]}',
+                    f"unstaking {result.amount} {result.token}",
                 )
             )
         # try to find delegate reward
-        for reward in result["rewards"]:
-            token_original_id = KavaPlugin._get_token_original_id(
-                reward["reward_token"]
-            )
+        for reward in result.rewards or []:
+            token_original_id = KavaPlugin._get_token_original_id(reward.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -292,27 +695,32 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "get",
-                    reward["reward_amount"],
-                    reward["reward_token"],
+                    str(reward.amount),
+                    reward.token,
                     token_original_id,
                     symbol_uuid,
                     "kava_staking_reward",
                     address,
-                    f'staking reward {reward["reward_amount"]} {reward["reward_token"]}',
+                    f"staking reward {reward.amount} {reward.token}",
                 )
             )
         return caajs
 
     @classmethod
     def __get_create_cdp_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CreateCdpResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(result["deposit_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.deposit_denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -320,20 +728,20 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "deposit",
-                result["deposit_amount"],
-                result["deposit_token"],
+                str(result.deposit_amount),
+                result.deposit_token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "kava_cdp",
-                f'cdp deposit {result["deposit_amount"]} {result["deposit_token"]}',
+                f"cdp deposit {result.deposit_amount} {result.deposit_token}",
             )
         )
 
-        token_original_id = KavaPlugin._get_token_original_id(result["draw_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.draw_denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -341,27 +749,32 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "borrow",
-                result["draw_amount"],
-                result["draw_token"],
+                str(result.draw_amount),
+                result.draw_token,
                 token_original_id,
                 symbol_uuid,
                 "kava_cdp",
                 address,
-                f'cdp draw {result["draw_amount"]} {result["draw_token"]}',
+                f"cdp draw {result.draw_amount} {result.draw_token}",
             )
         )
         return caajs
 
     @classmethod
     def __get_draw_cdp_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(result["draw_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -369,13 +782,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "borrow",
-                result["draw_amount"],
-                result["draw_token"],
+                str(result.amount),
+                result.token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "kava_cdp",
-                f'cdp repay {result["draw_amount"]} {result["draw_token"]}',
+                f"cdp repay {result.amount} {result.token}",
             )
         )
 
@@ -383,14 +796,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_repay_cdp_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: RepayCdpResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(result["repay_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.repay_denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -398,28 +816,23 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "repay",
-                result["repay_amount"],
-                result["repay_token"],
+                str(result.repay_amount),
+                result.repay_token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "kava_cdp",
-                f'cdp repay {result["repay_amount"]} {result["repay_token"]}',
+                f"cdp repay {result.repay_amount} {result.repay_token}",
             )
         )
 
-        if (
-            result["withdraw_token"] is not None
-            and result["withdraw_amount"] is not None
-        ):
-            token_original_id = KavaPlugin._get_token_original_id(
-                result["withdraw_token"]
-            )
+        if result.withdraw_token is not None and result.withdraw_amount is not None:
+            token_original_id = KavaPlugin._get_token_original_id(result.withdraw_denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -427,27 +840,32 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "withdraw",
-                    result["withdraw_amount"],
-                    result["withdraw_token"],
+                    str(result.withdraw_amount),
+                    result.withdraw_token,
                     token_original_id,
                     symbol_uuid,
                     "kava_cdp",
                     address,
-                    f'cdp withdraw {result["withdraw_amount"]} {result["withdraw_token"]}',
+                    f"cdp withdraw {result.withdraw_amount} {result.withdraw_token}",
                 )
             )
         return caajs
 
     @classmethod
     def __get_deposit_cdp_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(result["deposit_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -455,13 +873,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "deposit",
-                result["deposit_amount"],
-                result["deposit_token"],
+                str(result.amount),
+                result.token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "kava_cdp",
-                f'cdp deposit {result["deposit_amount"]} {result["deposit_token"]}',
+                f"cdp deposit {result.amount} {result.token}",
             )
         )
 
@@ -469,14 +887,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_withdraw_cdp_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(result["withdraw_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -484,13 +907,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "withdraw",
-                result["withdraw_amount"],
-                result["withdraw_token"],
+                str(result.amount),
+                result.token,
                 token_original_id,
                 symbol_uuid,
                 "kava_cdp",
                 address,
-                f'cdp withdraw {result["withdraw_amount"]} {result["withdraw_token"]}',
+                f"cdp withdraw {result.amount} {result.token}",
             )
         )
 
@@ -498,16 +921,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_claim_usdx_minting_reward_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: RewardResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(
-            result["rewards"][0]["reward_token"]
-        )
+        token_original_id = KavaPlugin._get_token_original_id(result.rewards[0].denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -515,13 +941,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "get",
-                result["rewards"][0]["reward_amount"],
-                result["rewards"][0]["reward_token"],
+                str(result.rewards[0].amount),
+                result.rewards[0].token,
                 token_original_id,
                 symbol_uuid,
                 "kava_cdp",
                 address,
-                f'cdp reward {result["rewards"][0]["reward_amount"]} {result["rewards"][0]["reward_token"]}',
+                f"cdp reward {result.rewards[0].amount} {result.rewards[0].token}",
             )
         )
 
@@ -529,16 +955,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_hard_withdraw_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(
-            result["hard_withdraw_token"]
-        )
+        token_original_id = KavaPlugin._get_token_original_id(result.denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -546,13 +975,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "withdraw",
-                result["hard_withdraw_amount"],
-                result["hard_withdraw_token"],
+                str(result.amount),
+                result.token,
                 token_original_id,
                 symbol_uuid,
                 "hard_lending",
                 address,
-                f'hard withdraw {result["hard_withdraw_amount"]} {result["hard_withdraw_token"]}',
+                f"hard withdraw {result.amount} {result.token}",
             )
         )
 
@@ -560,16 +989,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_hard_deposit_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(
-            result["hard_deposit_token"]
-        )
+        token_original_id = KavaPlugin._get_token_original_id(result.denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -577,13 +1009,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "deposit",
-                result["hard_deposit_amount"],
-                result["hard_deposit_token"],
+                str(result.amount),
+                result.token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "hard_lending",
-                f'hard deposit {result["hard_deposit_amount"]} {result["hard_deposit_token"]}',
+                f"hard deposit {result.amount} {result.token}",
             )
         )
 
@@ -591,16 +1023,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_hard_borrow_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(
-            result["hard_borrow_token"]
-        )
+        token_original_id = KavaPlugin._get_token_original_id(result.denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -608,13 +1043,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "borrow",
-                result["hard_borrow_amount"],
-                result["hard_borrow_token"],
+                str(result.amount),
+                result.token,
                 token_original_id,
                 symbol_uuid,
                 "hard_lending",
                 address,
-                f'hard borrow {result["hard_borrow_amount"]} {result["hard_borrow_token"]}',
+                f"hard borrow {result.amount} {result.token}",
             )
         )
 
@@ -622,16 +1057,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_hard_repay_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: CoinResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(
-            result["hard_repay_token"]
-        )
+        token_original_id = KavaPlugin._get_token_original_id(result.denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -639,13 +1077,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "repay",
-                result["hard_repay_amount"],
-                result["hard_repay_token"],
+                str(result.amount),
+                result.token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "hard_lending",
-                f'hard repay {result["hard_repay_amount"]} {result["hard_repay_token"]}',
+                f"hard repay {result.amount} {result.token}",
             )
         )
 
@@ -653,19 +1091,22 @@ class KavaPlugin:
 
     @classmethod
     def __get_claim_hard_reward_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: RewardResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        for reward in result["rewards"]:
-            token_original_id = KavaPlugin._get_token_original_id(
-                reward["reward_token"]
-            )
+        for reward in result.rewards:
+            token_original_id = KavaPlugin._get_token_original_id(reward.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -673,13 +1114,13 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "get",
-                    reward["reward_amount"],
-                    reward["reward_token"],
+                    str(reward.amount),
+                    reward.token,
                     token_original_id,
                     symbol_uuid,
                     "hard_lending",
                     address,
-                    f'hard lending reward receive {reward["reward_amount"]} {reward["reward_token"]}',
+                    f"hard lending reward receive {reward.amount} {reward.token}",
                 )
             )
 
@@ -687,14 +1128,19 @@ class KavaPlugin:
 
     @classmethod
     def __get_swap_exact_for_tokens_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: SwapTradeResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        token_original_id = KavaPlugin._get_token_original_id(result["input_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.input_denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -702,20 +1148,20 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "lose",
-                result["input_amount"],
-                result["input_token"],
+                str(result.input_amount),
+                result.input_token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "kava_swap",
-                f'buy {result["output_amount"]} {result["output_token"]} sell {result["input_amount"]} {result["input_token"]}',
+                f"buy {result.output_amount} {result.output_token} sell {result.input_amount} {result.input_token}",
             )
         )
 
-        token_original_id = KavaPlugin._get_token_original_id(result["output_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.output_denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -723,20 +1169,20 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "get",
-                result["output_amount"],
-                result["output_token"],
+                str(result.output_amount),
+                result.output_token,
                 token_original_id,
                 symbol_uuid,
                 "kava_swap",
                 address,
-                f'buy {result["output_amount"]} {result["output_token"]} sell {result["input_amount"]} {result["input_token"]}',
+                f"buy {result.output_amount} {result.output_token} sell {result.input_amount} {result.input_token}",
             )
         )
 
-        token_original_id = KavaPlugin._get_token_original_id(result["fee_token"])
+        token_original_id = KavaPlugin._get_token_original_id(result.fee_denom)
         symbol_uuid = token_table.get_symbol_uuid(KavaPlugin.chain, token_original_id)
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -744,13 +1190,13 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "lose",
-                result["fee_amount"],
-                result["fee_token"],
+                str(result.fee_amount),
+                result.fee_token,
                 token_original_id,
                 symbol_uuid,
                 address,
                 "kava_swap",
-                f'pay {result["fee_amount"]} {result["fee_token"]} as swap fee',
+                f"pay {result.fee_amount} {result.fee_token} as swap fee",
             )
         )
 
@@ -758,12 +1204,17 @@ class KavaPlugin:
 
     @classmethod
     def __get_swap_deposit_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: SwapDepositResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -771,23 +1222,23 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "get_bonds",
-                result["share_amount"],
-                result["share_token"],
-                result["share_token"],
+                result.share_amount,
+                result.share_token,
+                result.share_token,
                 None,
                 "kava_swap",
                 address,
-                f'kava swap receive {result["share_amount"]} {result["share_token"]}',
+                f"kava swap receive {result.share_amount} {result.share_token}",
             )
         )
 
-        for input in result["inputs"]:
-            token_original_id = KavaPlugin._get_token_original_id(input["input_token"])
+        for input in result.inputs or []:
+            token_original_id = KavaPlugin._get_token_original_id(input.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -795,13 +1246,13 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "deposit",
-                    input["input_amount"],
-                    input["input_token"],
+                    str(input.amount),
+                    input.token,
                     token_original_id,
                     symbol_uuid,
                     address,
                     "kava_swap",
-                    f'kava swap send {input["input_amount"]} {input["input_token"]}',
+                    f"kava swap send {input.amount} {input.token}",
                 )
             )
 
@@ -809,12 +1260,17 @@ class KavaPlugin:
 
     @classmethod
     def __get_swap_withdraw_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: SwapWithdrawResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -822,25 +1278,23 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "lose_bonds",
-                result["share_amount"],
-                result["share_token"],
-                result["share_token"],
+                result.share_amount,
+                result.share_token,
+                result.share_token,
                 None,
                 address,
                 "kava_swap",
-                f'kava swap send {result["share_amount"]} {result["share_token"]}',
+                f"kava swap send {result.share_amount} {result.share_token}",
             )
         )
 
-        for output in result["outputs"]:
-            token_original_id = KavaPlugin._get_token_original_id(
-                output["output_token"]
-            )
+        for output in result.outputs or []:
+            token_original_id = KavaPlugin._get_token_original_id(output.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -848,13 +1302,13 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "withdraw",
-                    output["output_amount"],
-                    output["output_token"],
+                    str(output.amount),
+                    output.token,
                     token_original_id,
                     symbol_uuid,
                     "kava_swap",
                     address,
-                    f'kava swap receive {output["output_amount"]} {output["output_token"]}',
+                    f"kava swap receive {output.amount} {output.token}",
                 )
             )
 
@@ -862,19 +1316,22 @@ class KavaPlugin:
 
     @classmethod
     def __get_claim_swap_reward_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: RewardResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        for reward in result["rewards"]:
-            token_original_id = KavaPlugin._get_token_original_id(
-                reward["reward_token"]
-            )
+        for reward in result.rewards:
+            token_original_id = KavaPlugin._get_token_original_id(reward.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -882,13 +1339,13 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     "get",
-                    reward["reward_amount"],
-                    reward["reward_token"],
+                    str(reward.amount),
+                    reward.token,
                     token_original_id,
                     symbol_uuid,
                     "kava_swap",
                     address,
-                    f'kava swap reward receive {reward["reward_amount"]} {reward["reward_token"]}',
+                    f"kava swap reward receive {reward.amount} {reward.token}",
                 )
             )
 
@@ -896,26 +1353,31 @@ class KavaPlugin:
 
     @classmethod
     def __get_send_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: TransferResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        recipient = result["recipient"]
-        sender = result["sender"]
-        if address in [recipient, sender]:
+        recipient = result.recipient
+        sender = result.sender
+        if address == recipient or address == sender:
             if address == recipient:
                 caaj_type = "receive"
-                message = f'{recipient} {caaj_type} {result["amount"]} {result["token"]} from {sender}'
+                message = f"{recipient} {caaj_type} {result.amount} {result.token} from {sender}"
             else:
                 caaj_type = "send"
-                message = f'{sender} {caaj_type} {result["amount"]} {result["token"]} to {recipient}'
+                message = f"{sender} {caaj_type} {result.amount} {result.token} to {recipient}"
 
-            token_original_id = KavaPlugin._get_token_original_id(result["token"])
+            token_original_id = KavaPlugin._get_token_original_id(result.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -923,8 +1385,8 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     caaj_type,
-                    result["amount"],
-                    result["token"],
+                    str(result.amount),
+                    result.token,
                     token_original_id,
                     symbol_uuid,
                     sender,
@@ -937,30 +1399,35 @@ class KavaPlugin:
 
     @classmethod
     def __get_create_atomic_swap_caajs(
-        cls, transaction: KavaTransaction, result, token_table, address, trade_uuid
+        cls,
+        transaction: KavaTransaction,
+        result: TransferResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
     ) -> list:
         caajs = []
 
-        recipient = result["recipient"]
-        sender = result["sender"]
-        if address in [recipient, sender]:
+        recipient = result.recipient
+        sender = result.sender
+        if address == recipient or address == sender:
             if address == recipient:
                 caaj_type = "receive"
-                message = f'{recipient} {caaj_type} {result["amount"]} {result["token"]} from kava_bc_atomic_swap'
+                message = f"{recipient} {caaj_type} {result.amount} {result.token} from kava_bc_atomic_swap"
                 from_address = "kava_bc_atomic_swap"
                 to_address = address
             else:
                 caaj_type = "send"
-                message = f'{sender} {caaj_type} {result["amount"]} {result["token"]} to kava_bc_atomic_swap'
+                message = f"{sender} {caaj_type} {result.amount} {result.token} to kava_bc_atomic_swap"
                 from_address = address
                 to_address = "kava_bc_atomic_swap"
 
-            token_original_id = KavaPlugin._get_token_original_id(result["token"])
+            token_original_id = KavaPlugin._get_token_original_id(result.denom)
             symbol_uuid = token_table.get_symbol_uuid(
                 KavaPlugin.chain, token_original_id
             )
             caajs.append(
-                CaajJournal(
+                (
                     transaction.get_timestamp(),
                     cls.chain,
                     cls.PLATFORM,
@@ -968,8 +1435,8 @@ class KavaPlugin:
                     transaction.get_transaction_id(),
                     trade_uuid,
                     caaj_type,
-                    result["amount"],
-                    result["token"],
+                    str(result.amount),
+                    result.token,
                     token_original_id,
                     symbol_uuid,
                     from_address,
@@ -981,26 +1448,96 @@ class KavaPlugin:
         return caajs
 
     @classmethod
-    def _get_uuid(cls) -> str:
-        return str(uuid.uuid4())
+    def __get_vote_caajs(
+        cls,
+        transaction: KavaTransaction,
+        result: EmptyResult,
+        token_table: TokenOriginalIdTable,
+        address: str,
+        trade_uuid: str,
+    ) -> list:
+        return []
 
     @classmethod
-    def _get_token_original_id(cls, value: Optional[str]) -> Optional[str]:
-        if value == "ukava" or value == "kava" or value == "":
-            value = None
-        return value
+    def _get_uuid(
+        cls,
+        transaction_id: Optional[str] = None,
+        address: Optional[str] = None,
+        message_index: Optional[int] = None,
+    ) -> str:
+        trade_uuid = KavaPlugin.trade_uuid
+        if trade_uuid is None or transaction_id is None:
+            return str(uuid.uuid4())
+        return trade_uuid.get(transaction_id, address, message_index)
+
+    @classmethod
+    def _get_token_original_id(cls, denom: Optional[Denom]) -> Optional[str]:
+        # resolved from the raw denom when the message was parsed
+        if denom is None:
+            return None
+        return denom.original_id
+
+    @classmethod
+    def _get_involved_addresses(cls, transaction: KavaTransaction) -> Dict[str, None]:
+        """the addresses in the messages and the log events of transaction, in order."""
+        data = transaction.get_transaction()["data"]
+        addresses: Dict[str, None] = {}
+        for message in KavaPlugin._get_tx_messages(data["tx"]):
+            KavaPlugin._collect_addresses(message, addresses)
+        for log in data.get("logs") or []:
+            for event in log["events"]:
+                for attribute in event["attributes"]:
+                    KavaPlugin._collect_addresses(attribute.get("value"), addresses)
+        return addresses
+
+    @classmethod
+    def _get_fee_payer(cls, transaction: KavaTransaction) -> Optional[str]:
+        # the payer of auth_info.fee from chain version 9 when set, else the
+        # signer of the first message
+        tx = transaction.get_transaction()["data"]["tx"]
+        payer = tx.get("auth_info", {}).get("fee", {}).get("payer")
+        if payer:
+            return payer
+        messages = KavaPlugin._get_tx_messages(tx)
+        if len(messages) == 0:
+            return None
+        for key in SIGNER_KEYS:
+            signer = messages[0].get(key)
+            if isinstance(signer, str) and signer.startswith(ADDRESS_PREFIX):
+                return signer
+        addresses: Dict[str, None] = {}
+        KavaPlugin._collect_addresses(messages[0], addresses)
+        return next(iter(addresses), None)
+
+    @classmethod
+    def _get_tx_messages(cls, tx: dict) -> List[dict]:
+        if "value" in tx:
+            return [message.get("value", {}) for message in tx["value"]["msg"]]
+        return tx["body"]["messages"]
+
+    @classmethod
+    def _collect_addresses(cls, value: Any, addresses: Dict[str, None]) -> None:
+        if isinstance(value, str):
+            if value.startswith(ADDRESS_PREFIX):
+                addresses[value] = None
+        elif isinstance(value, dict):
+            for item in value.values():
+                KavaPlugin._collect_addresses(item, addresses)
+        elif isinstance(value, list):
+            for item in value:
+                KavaPlugin._collect_addresses(item, addresses)
 
     @classmethod
     def _get_caaj_fee(
         cls,
         address: str,
-        transaction: KavaTransaction,
+        transaction: Transaction,
         token_table: TokenOriginalIdTable,
         trade_uuid,
     ) -> list:
         caajs = []
         caajs.append(
-            CaajJournal(
+            (
                 transaction.get_timestamp(),
                 cls.chain,
                 cls.PLATFORM,
@@ -1008,7 +1545,7 @@ class KavaPlugin:
                 transaction.get_transaction_id(),
                 trade_uuid,
                 "lose",
-                str(transaction.get_transaction_fee() / Decimal(MEGA)),
+                str(KavaUtil.get_amount(transaction.get_transaction_fee())),
                 "kava",
                 None,
                 "265cf8a8-87de-4ee3-9ac0-292df9b8d52d",
@@ -1018,3 +1555,57 @@ class KavaPlugin:
             )
         )
         return caajs
+
+    @classmethod
+    def _register_default_caaj_builders(cls):
+        cls.register_caaj_builder(
+            ["delegate", "begin_redelegate"], cls.__get_delegate_caajs
+        )
+        cls.register_caaj_builder(["begin_unbonding"], cls.__get_begin_unbonding_caajs)
+        cls.register_caaj_builder(["create_cdp"], cls.__get_create_cdp_caajs)
+        cls.register_caaj_builder(["draw_cdp"], cls.__get_draw_cdp_caajs)
+        cls.register_caaj_builder(["repay_cdp"], cls.__get_repay_cdp_caajs)
+        cls.register_caaj_builder(["deposit_cdp"], cls.__get_deposit_cdp_caajs)
+        cls.register_caaj_builder(["withdraw_cdp"], cls.__get_withdraw_cdp_caajs)
+        cls.register_caaj_builder(
+            ["claim_usdx_minting_reward"], cls.__get_claim_usdx_minting_reward_caajs
+        )
+        cls.register_caaj_builder(["hard_withdraw"], cls.__get_hard_withdraw_caajs)
+        cls.register_caaj_builder(["hard_deposit"], cls.__get_hard_deposit_caajs)
+        cls.register_caaj_builder(["hard_borrow"], cls.__get_hard_borrow_caajs)
+        cls.register_caaj_builder(["hard_repay"], cls.__get_hard_repay_caajs)
+        cls.register_caaj_builder(
+            ["claim_hard_reward"], cls.__get_claim_hard_reward_caajs
+        )
+        cls.register_caaj_builder(
+            ["swap_exact_for_tokens"], cls.__get_swap_exact_for_tokens_caajs
+        )
+        cls.register_caaj_builder(["swap_deposit"], cls.__get_swap_deposit_caajs)
+        cls.register_caaj_builder(["swap_withdraw"], cls.__get_swap_withdraw_caajs)
+        cls.register_caaj_builder(
+            ["claim_swap_reward"], cls.__get_claim_swap_reward_caajs
+        )
+        cls.register_caaj_builder(["send"], cls.__get_send_caajs)
+        cls.register_caaj_builder(
+            ["create_atomic_swap", "claim_atomic_swap"],
+            cls.__get_create_atomic_swap_caajs,
+        )
+        cls.register_caaj_builder(["vote"], cls.__get_vote_caajs)
+
+
+KavaPlugin._register_default_caaj_builders()
+
+
+def _get_worker_caajs_chunk(
+    address: str, transactions: List[KavaTransaction]
+) -> Tuple[list, tuple]:
+    caajs = _get_caajs_chunk(address, transactions, get_worker_token_table())
+    return caajs, KavaPlugin.pop_hook_observations()
+
+
+def _get_caajs_chunk(
+    address: str,
+    transactions: List[KavaTransaction],
+    token_table: TokenOriginalIdTable,
+) -> list:
+    return list(KavaPlugin.iter_caajs(address, transactions, token_table))
@@ -1,71 +1,150 @@
 import logging
-import re
-from decimal import Decimal, getcontext
-from typing import Tuple, Union
+from decimal import Context, Decimal
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+from kava_plugin.amount import Amount
+from kava_plugin.denom import Denom, DenomRegistry
 
 logger = logging.getLogger(name=__name__)
 logger.addHandler(logging.NullHandler())
-getcontext().prec = 50
+# the decimal module context is thread-local, so amounts use this one explicitly
+DECIMAL_CONTEXT = Context(prec=50)
+
+COIN_CACHE_SIZE = 4096
+DIGITS = "0123456789"
+
+
+class EventIndex:
+    """log events of one message grouped by type, with attributes indexed by key.
+
+    like the KavaUtil helpers, lookups read the first event of a type.
+    """
+
+    def __init__(self, events: list):
+        self.source = events
+        self.events: Dict[str, list] = {}
+        self.attributes: Dict[str, Dict[str, List[str]]] = {}
+        for event in events:
+            typed_events = self.events.get(event["type"])
+            if typed_events is None:
+                self.events[event["type"]] = [event]
+            else:
+                typed_events.append(event)
+
+    @classmethod
+    def index_attributes(cls, attributes: list) -> Dict[str, List[str]]:
+        index: Dict[str, List[str]] = {}
+        for attribute in attributes:
+            values = index.get(attribute["key"])
+            if values is None:
+                index[attribute["key"]] = [attribute["value"]]
+            else:
+                values.append(attribute["value"])
+        return index
+
+    def has_event(self, type: str) -> bool:
+        return type in self.events
+
+    def get_event(self, type: str) -> Optional[dict]:
+        typed_events = self.events.get(type)
+        return None if typed_events is None else typed_events[0]
+
+    def get_events(self, types: list) -> Optional[list]:
+        type_set = set(types)
+        events = [event for event in self.source if event["type"] in type_set]
+        return events if len(events) > 0 else None
+
+    def get_attribute_values(self, type: str, key: str) -> List[str]:
+        attributes = self.attributes.get(type)
+        if attributes is None:
+            event = self.get_event(type)
+            if event is None:
+                return []
+            attributes = EventIndex.index_attributes(event["attributes"])
+            self.attributes[type] = attributes
+        return attributes.get(key, [])
+
+    def get_attribute_value(self, type: str, key: str) -> str:
+        return self.get_attribute_values(type, key)[0]
 
 
 class KavaUtil:
     @classmethod
     def get_attribute_value(cls, attributes, key):
-        return list(filter(lambda x: x["key"] == key, attributes))[0]["value"]
+        return EventIndex.index_attributes(attributes).get(key, [])[0]
 
     @classmethod
     def get_attribute_values(cls, attributes, key):
-        attributes = list(filter(lambda x: x["key"] == key, attributes))
-        return list(map(lambda x: x["value"], attributes))
+        return EventIndex.index_attributes(attributes).get(key, [])
 
     @classmethod
     def get_event_value(cls, events, type):
-        event = list(filter(lambda x: x["type"] == type, events))
-        if len(event) == 0:
-            return None
-        else:
-            return event[0]
+        return EventIndex(events).get_event(type)
 
     @classmethod
     def get_event_values(cls, events, types: list):
-        event = list(filter(lambda x: x["type"] in types, events))
-        if len(event) == 0:
-            return None
-        else:
-            return event
+        return EventIndex(events).get_events(types)
+
+    @classmethod
+    def get_decimals(cls, denom: Union[Denom, str, None] = None) -> int:
+        """decimals of a Denom resolved by split_amount, or of a raw denom."""
+        if denom is None:
+            return DenomRegistry.DEFAULT_DECIMALS
+        if isinstance(denom, str):
+            denom = DenomRegistry.get(denom)
+        return denom.decimals
 
     @classmethod
-    def convert_uamount_amount(cls, uamount, token=None):
-        denominator = 1000000
-        if token is not None:
-            if token == "busd":
-                denominator = 100000000
-            elif token == "bnb":
-                denominator = 100000000
-            elif token == "xrp":
-                denominator = 100000000
-        atom = Decimal(int(uamount)) / Decimal(denominator)
+    def get_amount(cls, uamount, denom: Union[Denom, str, None] = None) -> Amount:
+        return Amount(int(uamount), KavaUtil.get_decimals(denom))
+
+    @classmethod
+    def convert_uamount_amount(cls, uamount, denom: Union[Denom, str, None] = None):
+        denominator = 10 ** KavaUtil.get_decimals(denom)
+        atom = DECIMAL_CONTEXT.divide(Decimal(int(uamount)), Decimal(denominator))
         return atom
 
     @classmethod
-    def split_amount(cls, amount_token: str) -> Tuple[Union[Decimal, str], str]:
-        amount = re.findall(r"\d+", amount_token)[0]
-        token = amount_token[len(amount) :]
-        if token == "ukava" or token == "":
-            token = "kava"
-        elif token == "xrpb":
-            token = "xrp"
-        return amount, token
+    def split_amount(cls, amount_token: str) -> Tuple[str, Denom]:
+        """the amount and the registry entry of the raw denom of one coin."""
+        amount, denom = KavaUtil.parse_coins(amount_token)[0]
+        return amount, DenomRegistry.get(denom)
+
+    @classmethod
+    def split_amounts(cls, amount_tokens: str) -> List[Tuple[str, Denom]]:
+        return [
+            (amount, DenomRegistry.get(denom))
+            for amount, denom in KavaUtil.parse_coins(amount_tokens)
+        ]
+
+    @classmethod
+    @lru_cache(maxsize=COIN_CACHE_SIZE)
+    def parse_coins(cls, coins: str) -> Tuple[Tuple[str, str], ...]:
+        """(amount, denom) pairs of a coin list such as "123ukava,45hard"."""
+        parsed = []
+        for coin in coins.split(","):
+            if coin == "":
+                continue
+            denom = coin.lstrip(DIGITS)
+            if len(denom) == len(coin):
+                raise ValueError(f"coin without amount: {coin}")
+            parsed.append((coin[: len(coin) - len(denom)], denom))
+        return tuple(parsed)
 
     @classmethod
     def get_rewards(cls, event) -> list:
         if event is None:
             return []
 
+        return KavaUtil.get_rewards_from_amount(
+            KavaUtil.get_attribute_value(event["attributes"], "amount")
+        )
+
+    @classmethod
+    def get_rewards_from_amount(cls, amount_tokens: str) -> list:
         rewards = []
-        amounts = KavaUtil.get_attribute_value(event["attributes"], "amount").split(",")
-        for amount in amounts:
-            amount, token = KavaUtil.split_amount(amount)
-            amount = str(KavaUtil.convert_uamount_amount(amount))
-            rewards.append({"reward_token": token, "reward_amount": amount})
+        for amount, denom in KavaUtil.split_amounts(amount_tokens):
+            amount = str(KavaUtil.get_amount(amount))
+            rewards.append({"reward_token": denom.token, "reward_amount": amount})
         return rewards
@@ -1,14 +1,29 @@
 import logging
-from decimal import getcontext
-from typing import Optional
-
-from kava_plugin.kava_util import KavaUtil
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from kava_plugin.amount import Amount
+from kava_plugin.denom import DenomRegistry
+from kava_plugin.instrumentation import Instrumentation
+from kava_plugin.kava_util import EventIndex, KavaUtil
+from kava_plugin.message_result import (
+    COIN_FIELDS,
+    Coin,
+    CoinResult,
+    CreateCdpResult,
+    EmptyResult,
+    MessageResult,
+    RepayCdpResult,
+    RewardResult,
+    SwapDepositResult,
+    SwapTradeResult,
+    SwapWithdrawResult,
+    TransferResult,
+)
 
 logger = logging.getLogger(name=__name__)
 logger.addHandler(logging.NullHandler())
 
-getcontext().prec = 50
-
 DELEGATE_ACTIONS = [
     "delegate",
     "begin_redelegate",
@@ -21,490 +36,355 @@ DELEGATE_ACTIONS = [
 ]
 
 
+class AmountSpec(NamedTuple):
+    """one coin read from an event attribute into a token and an amount field."""
+
+    event_type: str
+    attribute_key: str
+    token_field: str
+    amount_field: str
+    token_decimals: bool = True
+
+
+# actions whose result is a single coin of one event attribute
+AMOUNT_SPECS = [
+    (
+        ["draw_cdp"],
+        "draw_cdp",
+        AmountSpec("cdp_draw", "amount", "draw_token", "draw_amount"),
+    ),
+    (
+        ["deposit_cdp"],
+        "deposit_cdp",
+        AmountSpec("transfer", "amount", "deposit_token", "deposit_amount"),
+    ),
+    (
+        ["withdraw_cdp"],
+        "withdraw_cdp",
+        AmountSpec("transfer", "amount", "withdraw_token", "withdraw_amount"),
+    ),
+    (
+        ["hard_deposit", "harvest_deposit"],
+        "hard_deposit",
+        AmountSpec("transfer", "amount", "hard_deposit_token", "hard_deposit_amount"),
+    ),
+    (
+        ["hard_withdraw", "harvest_withdraw"],
+        "hard_withdraw",
+        AmountSpec("transfer", "amount", "hard_withdraw_token", "hard_withdraw_amount"),
+    ),
+    (
+        ["hard_borrow"],
+        "hard_borrow",
+        AmountSpec("transfer", "amount", "hard_borrow_token", "hard_borrow_amount"),
+    ),
+    (
+        ["hard_repay"],
+        "hard_repay",
+        AmountSpec("transfer", "amount", "hard_repay_token", "hard_repay_amount"),
+    ),
+]
+
+
 class Message:
+    handlers: Dict[str, Callable[["Message"], MessageResult]] = {}
+    instrumentation: Optional[Instrumentation] = None
+
     def __init__(self, logs_events, messages_events, height, chain_id):
         self.logs_events = logs_events
+        self.event_index = EventIndex(logs_events)
         self.messages_events = messages_events
         self.height = height
         self.chain_id = chain_id
 
     def get_action(self) -> Optional[str]:
-        event = KavaUtil.get_event_value(self.logs_events, "message")
-        if event is not None:
-            action = KavaUtil.get_attribute_value(event["attributes"], "action")
+        if self.event_index.has_event("message"):
+            action = self.event_index.get_attribute_value("message", "action")
         else:
             action = None
         return action
 
-    def get_result(self) -> dict:
-        action = self.get_action()
-        logger.debug(action)
-        result = {"action": None, "result": None}
-        if action in DELEGATE_ACTIONS:
-            result = self.__as_delegate()
-        elif (
-            action == "begin_unbonding"
-            or action == "/cosmos.staking.v1beta1.MsgUndelegate"
-        ):
-            result = self.__as_begin_unbonding()
-        elif action == "create_cdp":
-            result = self.__as_create_cdp()
-        elif action == "draw_cdp":
-            result = self.__as_draw_cdp()
-        elif action == "repay_cdp":
-            result = self.__as_repay_cdp()
-        elif action == "deposit_cdp":
-            result = self.__as_deposit_cdp()
-        elif action == "withdraw_cdp":
-            result = self.__as_withdraw_cdp()
-        elif action == "claim_usdx_minting_reward" or action == "claim_reward":
-            result = self.__as_claim_usdx_minting_reward()
-        elif action == "hard_deposit" or action == "harvest_deposit":
-            result = self.__as_hard_deposit()
-        elif action == "hard_withdraw" or action == "harvest_withdraw":
-            result = self.__as_hard_withdraw()
-        elif action == "hard_borrow":
-            result = self.__as_hard_borrow()
-        elif action == "hard_repay":
-            result = self.__as_hard_repay()
-        elif action in [
-            "claim_hard_reward",
-            "claim_harvest_reward",
-            "/kava.incentive.v1beta1.MsgClaimHardReward",
-        ]:
-            result = self.__as_claim_hard_reward()
-        elif action == "swap_exact_for_tokens" or action == "swap_for_exact_tokens":
-            result = self.__as_swap_exact_for_tokens()
-        elif action == "swap_deposit":
-            result = self.__as_swap_deposit()
-        elif action == "swap_withdraw":
-            result = self.__as_swap_withdraw()
-        elif action == "claim_swap_reward":
-            result = self.__as_claim_swap_reward()
-        elif action == "send" or action == "/cosmos.bank.v1beta1.MsgSend":
-            result = self.__as_send()
-        elif (
-            action == "createAtomicSwap"
-            or action == "/kava.bep3.v1beta1.MsgCreateAtomicSwap"
-        ):
-            result = self.__as_create_atomic_swap()
-        elif action == "claimAtomicSwap" or action == "refundAtomicSwap":
-            result = self.__as_claim_atomic_swap()
-        elif action in ["vote", "committee_vote", "post_price"]:
-            result = {"action": "vote", "result": None}
-        else:
-            logger.error(f"unknown action: {action}")
-
-        return result
-
-    def __as_delegate(self):
-        result = {
-            "action": "delegate",
-            "result": {"staking_token": None, "staking_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "delegate")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            amount = str(KavaUtil.convert_uamount_amount(amount))
-            result["result"]["staking_token"] = token
-            result["result"]["staking_amount"] = amount
-
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        rewards = KavaUtil.get_rewards(event)
-        result["result"]["rewards"] = rewards
-
-        return result
-
-    def __as_begin_unbonding(self):
-        result = {
-            "action": "begin_unbonding",
-            "result": {"unbonding_token": None, "unbonding_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "unbond")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            amount = str(KavaUtil.convert_uamount_amount(amount))
-            result["result"]["unbonding_token"] = token
-            result["result"]["unbonding_amount"] = amount
-
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        rewards = KavaUtil.get_rewards(event)
-        result["result"]["rewards"] = rewards
-
-        return result
-
-    def __as_create_cdp(self):
-        result = {
-            "action": "create_cdp",
-            "result": {
-                "deposit_token": None,
-                "deposit_amount": None,
-                "draw_token": None,
-                "draw_amount": None,
-            },
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "cdp_deposit")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["deposit_token"] = token
-            result["result"]["deposit_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
-
-        event = KavaUtil.get_event_value(self.logs_events, "cdp_draw")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["draw_token"] = token
-            result["result"]["draw_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
+    @classmethod
+    def register_handler(
+        cls, actions: list, handler: Callable[["Message"], MessageResult]
+    ) -> None:
+        for action in actions:
+            cls.handlers[action] = handler
+
+    @classmethod
+    def register_amount_spec(cls, actions: list, action: str, spec: AmountSpec) -> None:
+        cls.register_handler(actions, cls.compile_amount_handler(action, spec))
+
+    @classmethod
+    def compile_amount_handler(
+        cls, action: str, spec: AmountSpec
+    ) -> Callable[["Message"], CoinResult]:
+        event_type, attribute_key, token_field, amount_field, token_decimals = spec
+        denoms = DenomRegistry.denoms
+        parse_coins = KavaUtil.parse_coins
+
+        COIN_FIELDS[action] = (token_field, amount_field)
+
+        def handler(message: "Message") -> CoinResult:
+            event_index = message.event_index
+            if not event_index.has_event(event_type):
+                return CoinResult(action, None, None)
+
+            amount, denom = parse_coins(
+                event_index.get_attribute_value(event_type, attribute_key)
+            )[0]
+            found = denoms.get(denom) or DenomRegistry.get(denom)
+            decimals = (
+                found.decimals if token_decimals else DenomRegistry.DEFAULT_DECIMALS
             )
-
+            return CoinResult(action, found, Amount(int(amount), decimals))
+
+        return handler
+
+    @classmethod
+    def register_alias(cls, alias: str, action: str) -> None:
+        if action not in cls.handlers:
+            raise ValueError(f"unknown action: {action}")
+        cls.handlers[alias] = cls.handlers[action]
+
+    def get_result(self) -> MessageResult:
+        instrumentation = Message.instrumentation
+        if instrumentation is None:
+            return self.__get_result()
+
+        started = perf_counter()
+        result = self.__get_result()
+        # handlers registered at runtime may still return {"action", "result"} dicts
+        action = result["action"] if isinstance(result, dict) else result.action
+        instrumentation.observe_result(action, perf_counter() - started)
         return result
 
-    def __as_draw_cdp(self):
-        result = {
-            "action": "draw_cdp",
-            "result": {"draw_token": None, "draw_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "cdp_draw")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["draw_token"] = token
-            result["result"]["draw_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
-
-        return result
-
-    def __as_repay_cdp(self):
-        result = {
-            "action": "repay_cdp",
-            "result": {
-                "repay_token": None,
-                "repay_amount": None,
-                "withdraw_token": None,
-                "withdraw_amount": None,
-            },
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            amounts = KavaUtil.get_attribute_values(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amounts[0])
-            result["result"]["repay_token"] = token
-            result["result"]["repay_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
+    def __get_result(self) -> MessageResult:
+        action = self.get_action()
+        logger.debug(action)
+        handler = None if action is None else self.handlers.get(action)
+        if handler is None:
+            logger.error(f"unknown action: {action}")
+            if Message.instrumentation is not None:
+                Message.instrumentation.observe_unknown_action(action)
+            return EmptyResult(None)
+
+        return handler(self)
+
+    def __as_delegate(self) -> CoinResult:
+        denom = amount = None
+        if self.event_index.has_event("delegate"):
+            amount = self.event_index.get_attribute_value("delegate", "amount")
+            amount, denom = KavaUtil.split_amount(amount)
+            amount = KavaUtil.get_amount(amount)
+
+        return CoinResult("delegate", denom, amount, self.__get_rewards())
+
+    def __as_begin_unbonding(self) -> CoinResult:
+        denom = amount = None
+        if self.event_index.has_event("unbond"):
+            amount = self.event_index.get_attribute_value("unbond", "amount")
+            amount, denom = KavaUtil.split_amount(amount)
+            amount = KavaUtil.get_amount(amount)
+
+        return CoinResult("begin_unbonding", denom, amount, self.__get_rewards())
+
+    def __as_create_cdp(self) -> CreateCdpResult:
+        deposit_denom = deposit_amount = draw_denom = draw_amount = None
+        if self.event_index.has_event("cdp_deposit"):
+            amount = self.event_index.get_attribute_value("cdp_deposit", "amount")
+            amount, deposit_denom = KavaUtil.split_amount(amount)
+            deposit_amount = KavaUtil.get_amount(amount, deposit_denom)
+
+        if self.event_index.has_event("cdp_draw"):
+            amount = self.event_index.get_attribute_value("cdp_draw", "amount")
+            amount, draw_denom = KavaUtil.split_amount(amount)
+            draw_amount = KavaUtil.get_amount(amount, draw_denom)
+
+        return CreateCdpResult(
+            "create_cdp", deposit_denom, deposit_amount, draw_denom, draw_amount
+        )
+
+    def __as_repay_cdp(self) -> RepayCdpResult:
+        repay_denom = repay_amount = withdraw_denom = withdraw_amount = None
+        if self.event_index.has_event("transfer"):
+            amounts = self.event_index.get_attribute_values("transfer", "amount")
+            amount, repay_denom = KavaUtil.split_amount(amounts[0])
+            repay_amount = KavaUtil.get_amount(amount, repay_denom)
 
             if len(amounts) == 2:
-                amount, token = KavaUtil.split_amount(amounts[1])
-                result["result"]["withdraw_token"] = token
-                result["result"]["withdraw_amount"] = str(
-                    KavaUtil.convert_uamount_amount(amount, token)
-                )
-
-        return result
-
-    def __as_deposit_cdp(self):
-        result = {
-            "action": "deposit_cdp",
-            "result": {"deposit_token": None, "deposit_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["deposit_token"] = token
-            result["result"]["deposit_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
-
-        return result
-
-    def __as_withdraw_cdp(self):
-        result = {
-            "action": "withdraw_cdp",
-            "result": {"withdraw_token": None, "withdraw_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["withdraw_token"] = token
-            result["result"]["withdraw_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
-
-        return result
-
-    def __as_claim_usdx_minting_reward(self):
-        result = {"action": "claim_usdx_minting_reward", "result": {"rewards": []}}
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        rewards = KavaUtil.get_rewards(event)
-        result["result"]["rewards"] = rewards
-
-        return result
-
-    def __as_hard_withdraw(self):
-        result = {
-            "action": "hard_withdraw",
-            "result": {"hard_withdraw_token": None, "hard_withdraw_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["hard_withdraw_token"] = token
-            result["result"]["hard_withdraw_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
-
-        return result
-
-    def __as_hard_deposit(self):
-        result = {
-            "action": "hard_deposit",
-            "result": {"hard_deposit_token": None, "hard_deposit_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["hard_deposit_token"] = token
-            result["result"]["hard_deposit_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
+                amount, withdraw_denom = KavaUtil.split_amount(amounts[1])
+                withdraw_amount = KavaUtil.get_amount(amount, withdraw_denom)
+
+        return RepayCdpResult(
+            "repay_cdp", repay_denom, repay_amount, withdraw_denom, withdraw_amount
+        )
+
+    def __as_claim_usdx_minting_reward(self) -> RewardResult:
+        return RewardResult("claim_usdx_minting_reward", self.__get_rewards())
+
+    def __as_claim_hard_reward(self) -> RewardResult:
+        return RewardResult("claim_hard_reward", self.__get_rewards())
+
+    def __as_swap_exact_for_tokens(self) -> SwapTradeResult:
+        input_denom = input_amount = output_denom = output_amount = None
+        fee_denom = fee_amount = None
+        if self.event_index.has_event("swap_trade"):
+            input = self.event_index.get_attribute_value("swap_trade", "input")
+            amount, input_denom = KavaUtil.split_amount(input)
+            input_amount = KavaUtil.get_amount(amount, input_denom)
+            output = self.event_index.get_attribute_value("swap_trade", "output")
+            amount, output_denom = KavaUtil.split_amount(output)
+            output_amount = KavaUtil.get_amount(amount, output_denom)
+            fee = self.event_index.get_attribute_value("swap_trade", "fee")
+            amount, fee_denom = KavaUtil.split_amount(fee)
+            fee_amount = KavaUtil.get_amount(amount, fee_denom)
+
+        return SwapTradeResult(
+            "swap_exact_for_tokens",
+            input_denom,
+            input_amount,
+            output_denom,
+            output_amount,
+            fee_denom,
+            fee_amount,
+        )
+
+    def __as_swap_deposit(self) -> SwapDepositResult:
+        share_token = share_amount = inputs = None
+        if self.event_index.has_event("swap_deposit"):
+            share_token = self.event_index.get_attribute_value(
+                "swap_deposit", "pool_id"
             )
-
-        return result
-
-    def __as_hard_borrow(self):
-        result = {
-            "action": "hard_borrow",
-            "result": {"hard_borrow_token": None, "hard_borrow_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["hard_borrow_token"] = token
-            result["result"]["hard_borrow_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
+            share_amount = self.event_index.get_attribute_value(
+                "swap_deposit", "shares"
             )
-
-        return result
-
-    def __as_hard_repay(self):
-        result = {
-            "action": "hard_repay",
-            "result": {"hard_repay_token": None, "hard_repay_amount": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["hard_repay_token"] = token
-            result["result"]["hard_repay_amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
+            inputs = self.__get_coins(
+                self.event_index.get_attribute_value("swap_deposit", "amount")
             )
 
-        return result
-
-    def __as_claim_hard_reward(self):
-        result = {"action": "claim_hard_reward", "result": {"rewards": []}}
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        rewards = KavaUtil.get_rewards(event)
-        result["result"]["rewards"] = rewards
+        return SwapDepositResult("swap_deposit", share_token, share_amount, inputs)
 
-        return result
-
-    def __as_swap_exact_for_tokens(self):
-        result = {
-            "action": "swap_exact_for_tokens",
-            "result": {
-                "input_token": None,
-                "input_amount": None,
-                "output_token": None,
-                "output_amount": None,
-                "fee_token": None,
-                "fee_amount": None,
-            },
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "swap_trade")
-        if event is not None:
-            input = KavaUtil.get_attribute_value(event["attributes"], "input")
-            input_amount, input_token = KavaUtil.split_amount(input)
-            output = KavaUtil.get_attribute_value(event["attributes"], "output")
-            output_amount, output_token = KavaUtil.split_amount(output)
-            fee = KavaUtil.get_attribute_value(event["attributes"], "fee")
-            fee_amount, fee_token = KavaUtil.split_amount(fee)
-
-            result["result"]["input_token"] = input_token
-            result["result"]["input_amount"] = str(
-                KavaUtil.convert_uamount_amount(input_amount, input_token)
+    def __as_swap_withdraw(self) -> SwapWithdrawResult:
+        share_token = share_amount = outputs = None
+        if self.event_index.has_event("swap_withdraw"):
+            share_token = self.event_index.get_attribute_value(
+                "swap_withdraw", "pool_id"
             )
-            result["result"]["output_token"] = output_token
-            result["result"]["output_amount"] = str(
-                KavaUtil.convert_uamount_amount(output_amount, output_token)
+            share_amount = self.event_index.get_attribute_value(
+                "swap_withdraw", "shares"
             )
-            result["result"]["fee_token"] = fee_token
-            result["result"]["fee_amount"] = str(
-                KavaUtil.convert_uamount_amount(fee_amount, fee_token)
+            outputs = self.__get_coins(
+                self.event_index.get_attribute_value("swap_withdraw", "amount")
             )
 
-        return result
+        return SwapWithdrawResult("swap_withdraw", share_token, share_amount, outputs)
 
-    def __as_swap_deposit(self):
-        result = {
-            "action": "swap_deposit",
-            "result": {"share_token": None, "share_amount": None, "inputs": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "swap_deposit")
-        inputlist = []
-        if event is not None:
-            result["result"]["share_token"] = KavaUtil.get_attribute_value(
-                event["attributes"], "pool_id"
-            )
-            result["result"]["share_amount"] = KavaUtil.get_attribute_value(
-                event["attributes"], "shares"
-            )
+    def __as_claim_swap_reward(self) -> RewardResult:
+        return RewardResult("claim_swap_reward", self.__get_rewards())
 
-            inputs = KavaUtil.get_attribute_value(event["attributes"], "amount").split(
-                ","
-            )
-            for input in inputs:
-                amount, token = KavaUtil.split_amount(input)
-                amount = str(KavaUtil.convert_uamount_amount(amount, token))
-                inputlist.append({"input_token": token, "input_amount": amount})
+    def __as_send(self) -> TransferResult:
+        sender = recipient = denom = amount = None
+        if self.event_index.has_event("message"):
+            sender = self.event_index.get_attribute_value("message", "sender")
 
-            result["result"]["inputs"] = inputlist
+        if self.event_index.has_event("transfer"):
+            recipient = self.event_index.get_attribute_value("transfer", "recipient")
+            amount = self.event_index.get_attribute_value("transfer", "amount")
+            amount, denom = KavaUtil.split_amount(amount)
+            amount = KavaUtil.get_amount(amount)
 
-        return result
+        return TransferResult("send", sender, recipient, denom, amount)
 
-    def __as_swap_withdraw(self):
-        result = {
-            "action": "swap_withdraw",
-            "result": {"share_token": None, "share_amount": None, "outputs": None},
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "swap_withdraw")
-        outputlist = []
-        if event is not None:
-            result["result"]["share_token"] = KavaUtil.get_attribute_value(
-                event["attributes"], "pool_id"
-            )
-            result["result"]["share_amount"] = KavaUtil.get_attribute_value(
-                event["attributes"], "shares"
+    def __as_create_atomic_swap(self) -> TransferResult:
+        sender = recipient = denom = amount = None
+        if self.event_index.has_event("create_atomic_swap"):
+            sender = self.event_index.get_attribute_value(
+                "create_atomic_swap", "sender"
             )
 
-            outputs = KavaUtil.get_attribute_value(event["attributes"], "amount").split(
-                ","
+        if self.event_index.has_event("transfer"):
+            recipient = self.event_index.get_attribute_value("transfer", "recipient")
+            amount = self.event_index.get_attribute_value("transfer", "amount")
+            amount, denom = KavaUtil.split_amount(amount)
+            amount = KavaUtil.get_amount(amount, denom)
+
+        return TransferResult("create_atomic_swap", sender, recipient, denom, amount)
+
+    def __as_claim_atomic_swap(self) -> TransferResult:
+        sender = recipient = denom = amount = None
+        if self.event_index.has_event("transfer"):
+            sender = self.event_index.get_attribute_value("transfer", "sender")
+            recipient = self.event_index.get_attribute_value("transfer", "recipient")
+            amount = self.event_index.get_attribute_value("transfer", "amount")
+            amount, denom = KavaUtil.split_amount(amount)
+            amount = KavaUtil.get_amount(amount, denom)
+
+        return TransferResult("claim_atomic_swap", sender, recipient, denom, amount)
+
+    def __as_vote(self) -> EmptyResult:
+        return EmptyResult("vote")
+
+    def __get_rewards(self) -> List[Coin]:
+        if not self.event_index.has_event("transfer"):
+            return []
+        return [
+            Coin(denom, KavaUtil.get_amount(amount))
+            for amount, denom in KavaUtil.split_amounts(
+                self.event_index.get_attribute_value("transfer", "amount")
             )
-            for output in outputs:
-                amount, token = KavaUtil.split_amount(output)
-                amount = str(KavaUtil.convert_uamount_amount(amount, token))
-                outputlist.append({"output_token": token, "output_amount": amount})
-
-            result["result"]["outputs"] = outputlist
-
-        return result
-
-    def __as_claim_swap_reward(self):
-        result = {"action": "claim_swap_reward", "result": {"rewards": []}}
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        rewards = KavaUtil.get_rewards(event)
-        result["result"]["rewards"] = rewards
-
-        return result
-
-    def __as_send(self):
-        result = {
-            "action": "send",
-            "result": {
-                "sender": None,
-                "recipient": None,
-                "token": None,
-                "amount": None,
-            },
-        }
-
-        message_event = KavaUtil.get_event_value(self.logs_events, "message")
-        if message_event is not None:
-            result["result"]["sender"] = KavaUtil.get_attribute_value(
-                message_event["attributes"], "sender"
-            )
-
-        transfer_event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if transfer_event is not None:
-            result["result"]["recipient"] = KavaUtil.get_attribute_value(
-                transfer_event["attributes"], "recipient"
-            )
-            amount = KavaUtil.get_attribute_value(
-                transfer_event["attributes"], "amount"
-            )
-            amount, token = KavaUtil.split_amount(amount)
-            amount = str(KavaUtil.convert_uamount_amount(amount))
-            result["result"]["token"] = token
-            result["result"]["amount"] = amount
-
-        return result
-
-    def __as_create_atomic_swap(self):
-        result = {
-            "action": "create_atomic_swap",
-            "result": {
-                "sender": None,
-                "recipient": None,
-                "token": None,
-                "amount": None,
-            },
-        }
-        event = KavaUtil.get_event_value(self.logs_events, "create_atomic_swap")
-        if event is not None:
-            result["result"]["sender"] = KavaUtil.get_attribute_value(
-                event["attributes"], "sender"
-            )
-
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            result["result"]["recipient"] = KavaUtil.get_attribute_value(
-                event["attributes"], "recipient"
-            )
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["token"] = token
-            result["result"]["amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
-
-        return result
-
-    def __as_claim_atomic_swap(self):
-        result = {
-            "action": "claim_atomic_swap",
-            "result": {
-                "sender": None,
-                "recipient": None,
-                "token": None,
-                "amount": None,
-            },
-        }
-
-        event = KavaUtil.get_event_value(self.logs_events, "transfer")
-        if event is not None:
-            result["result"]["sender"] = KavaUtil.get_attribute_value(
-                event["attributes"], "sender"
-            )
-            result["result"]["recipient"] = KavaUtil.get_attribute_value(
-                event["attributes"], "recipient"
-            )
-            amount = KavaUtil.get_attribute_value(event["attributes"], "amount")
-            amount, token = KavaUtil.split_amount(amount)
-            result["result"]["token"] = token
-            result["result"]["amount"] = str(
-                KavaUtil.convert_uamount_amount(amount, token)
-            )
-
-        return result
+        ]
+
+    @classmethod
+    def __get_coins(cls, amount_tokens: str) -> List[Coin]:
+        return [
+            Coin(denom, KavaUtil.get_amount(amount, denom))
+            for amount, denom in KavaUtil.split_amounts(amount_tokens)
+        ]
+
+    @classmethod
+    def _register_default_handlers(cls):
+        for actions, action, spec in AMOUNT_SPECS:
+            cls.register_amount_spec(actions, action, spec)
+        cls.register_handler(DELEGATE_ACTIONS, Message.__as_delegate)
+        cls.register_handler(
+            ["begin_unbonding", "/cosmos.staking.v1beta1.MsgUndelegate"],
+            Message.__as_begin_unbonding,
+        )
+        cls.register_handler(["create_cdp"], Message.__as_create_cdp)
+        cls.register_handler(["repay_cdp"], Message.__as_repay_cdp)
+        cls.register_handler(
+            ["claim_usdx_minting_reward", "claim_reward"],
+            Message.__as_claim_usdx_minting_reward,
+        )
+        cls.register_handler(
+            [
+                "claim_hard_reward",
+                "claim_harvest_reward",
+                "/kava.incentive.v1beta1.MsgClaimHardReward",
+            ],
+            Message.__as_claim_hard_reward,
+        )
+        cls.register_handler(
+            ["swap_exact_for_tokens", "swap_for_exact_tokens"],
+            Message.__as_swap_exact_for_tokens,
+        )
+        cls.register_handler(["swap_deposit"], Message.__as_swap_deposit)
+        cls.register_handler(["swap_withdraw"], Message.__as_swap_withdraw)
+        cls.register_handler(["claim_swap_reward"], Message.__as_claim_swap_reward)
+        cls.register_handler(
+            ["send", "/cosmos.bank.v1beta1.MsgSend"], Message.__as_send
+        )
+        cls.register_handler(
+            ["createAtomicSwap", "/kava.bep3.v1beta1.MsgCreateAtomicSwap"],
+            Message.__as_create_atomic_swap,
+        )
+        cls.register_handler(
+            ["claimAtomicSwap", "refundAtomicSwap"], Message.__as_claim_atomic_swap
+        )
+        cls.register_handler(
+            ["vote", "committee_vote", "post_price"], Message.__as_vote
+        )
+
+
+Message._register_default_handlers()
@@ -1,20 +1,33 @@
 import json
 import logging
-from decimal import getcontext
+from time import perf_counter
+from typing import Optional
 
 from senkalib.chain.kava.kava_transaction import KavaTransaction
 
+from kava_plugin.instrumentation import Instrumentation
 from kava_plugin.message import Message
 
 logger = logging.getLogger(name=__name__)
 logger.addHandler(logging.NullHandler())
 
-getcontext().prec = 50
-
 
 class MessageFactory:
+    instrumentation: Optional[Instrumentation] = None
+
     @classmethod
     def get_messages(cls, kava_transaction: KavaTransaction) -> list:
+        instrumentation = MessageFactory.instrumentation
+        if instrumentation is None:
+            return MessageFactory._get_messages(kava_transaction)
+
+        started = perf_counter()
+        messages = MessageFactory._get_messages(kava_transaction)
+        instrumentation.observe_messages(len(messages), perf_counter() - started)
+        return messages
+
+    @classmethod
+    def _get_messages(cls, kava_transaction: KavaTransaction) -> list:
         transaction = kava_transaction.get_transaction()
         try:
             log_events = list(map(lambda x: x["events"], transaction["data"]["logs"]))
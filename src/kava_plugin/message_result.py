@@ -0,0 +1,200 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from kava_plugin.amount import Amount
+from kava_plugin.denom import Denom
+
+# result field names of the single coin actions, used by CoinResult.to_dict
+COIN_FIELDS: Dict[str, Tuple[str, str]] = {
+    "delegate": ("staking_token", "staking_amount"),
+    "begin_unbonding": ("unbonding_token", "unbonding_amount"),
+}
+
+
+class Coin(NamedTuple):
+    denom: Denom
+    amount: Amount
+
+    @property
+    def token(self) -> str:
+        return self.denom.token
+
+    def to_dict(self, prefix: str) -> dict:
+        return {f"{prefix}_token": self.token, f"{prefix}_amount": str(self.amount)}
+
+
+class EmptyResult(NamedTuple):
+    """actions without CAAJs of their own, and unknown actions (action None)."""
+
+    action: Optional[str]
+
+    def to_dict(self) -> dict:
+        return {"action": self.action, "result": None}
+
+
+class CoinResult(NamedTuple):
+    """one coin, plus the claimed rewards for delegate and begin_unbonding.
+
+    like the other records it holds the resolved Denom of each coin, whose
+    token is exposed as a property.
+    """
+
+    action: str
+    denom: Optional[Denom]
+    amount: Optional[Amount]
+    rewards: Optional[List[Coin]] = None
+
+    @property
+    def token(self) -> Optional[str]:
+        return _get_token(self.denom)
+
+    def to_dict(self) -> dict:
+        token_field, amount_field = COIN_FIELDS[self.action]
+        result: dict = {token_field: self.token, amount_field: _format(self.amount)}
+        if self.rewards is not None:
+            result["rewards"] = [reward.to_dict("reward") for reward in self.rewards]
+        return {"action": self.action, "result": result}
+
+
+class RewardResult(NamedTuple):
+    action: str
+    rewards: List[Coin]
+
+    def to_dict(self) -> dict:
+        rewards = [reward.to_dict("reward") for reward in self.rewards]
+        return {"action": self.action, "result": {"rewards": rewards}}
+
+
+class CreateCdpResult(NamedTuple):
+    action: str
+    deposit_denom: Optional[Denom]
+    deposit_amount: Optional[Amount]
+    draw_denom: Optional[Denom]
+    draw_amount: Optional[Amount]
+
+    @property
+    def deposit_token(self) -> Optional[str]:
+        return _get_token(self.deposit_denom)
+
+    @property
+    def draw_token(self) -> Optional[str]:
+        return _get_token(self.draw_denom)
+
+    def to_dict(self) -> dict:
+        return _to_dict(self)
+
+
+class RepayCdpResult(NamedTuple):
+    action: str
+    repay_denom: Optional[Denom]
+    repay_amount: Optional[Amount]
+    withdraw_denom: Optional[Denom]
+    withdraw_amount: Optional[Amount]
+
+    @property
+    def repay_token(self) -> Optional[str]:
+        return _get_token(self.repay_denom)
+
+    @property
+    def withdraw_token(self) -> Optional[str]:
+        return _get_token(self.withdraw_denom)
+
+    def to_dict(self) -> dict:
+        return _to_dict(self)
+
+
+class SwapTradeResult(NamedTuple):
+    action: str
+    input_denom: Optional[Denom]
+    input_amount: Optional[Amount]
+    output_denom: Optional[Denom]
+    output_amount: Optional[Amount]
+    fee_denom: Optional[Denom]
+    fee_amount: Optional[Amount]
+
+    @property
+    def input_token(self) -> Optional[str]:
+        return _get_token(self.input_denom)
+
+    @property
+    def output_token(self) -> Optional[str]:
+        return _get_token(self.output_denom)
+
+    @property
+    def fee_token(self) -> Optional[str]:
+        return _get_token(self.fee_denom)
+
+    def to_dict(self) -> dict:
+        return _to_dict(self)
+
+
+class SwapDepositResult(NamedTuple):
+    action: str
+    share_token: Optional[str]
+    share_amount: Optional[str]
+    inputs: Optional[List[Coin]]
+
+    def to_dict(self) -> dict:
+        return _to_dict(self, "input")
+
+
+class SwapWithdrawResult(NamedTuple):
+    action: str
+    share_token: Optional[str]
+    share_amount: Optional[str]
+    outputs: Optional[List[Coin]]
+
+    def to_dict(self) -> dict:
+        return _to_dict(self, "output")
+
+
+class TransferResult(NamedTuple):
+    """send and atomic swap transfers."""
+
+    action: str
+    sender: Optional[str]
+    recipient: Optional[str]
+    denom: Optional[Denom]
+    amount: Optional[Amount]
+
+    @property
+    def token(self) -> Optional[str]:
+        return _get_token(self.denom)
+
+    def to_dict(self) -> dict:
+        return _to_dict(self)
+
+
+MessageResult = Union[
+    EmptyResult,
+    CoinResult,
+    RewardResult,
+    CreateCdpResult,
+    RepayCdpResult,
+    SwapTradeResult,
+    SwapDepositResult,
+    SwapWithdrawResult,
+    TransferResult,
+]
+
+
+def _to_dict(record: NamedTuple, coin_prefix: str = "") -> dict:
+    # the former dicts held the token of each denom under a *_token key
+    result = {}
+    for key, value in record._asdict().items():
+        if key == "denom" or key.endswith("_denom"):
+            result[key[: -len("denom")] + "token"] = _get_token(value)
+        elif isinstance(value, list):
+            result[key] = [coin.to_dict(coin_prefix) for coin in value]
+        else:
+            result[key] = _format(value)
+    action = result.pop("action")
+    return {"action": action, "result": result}
+
+
+def _format(value: Any) -> Any:
+    # amounts were strings in the former dicts
+    return str(value) if isinstance(value, Amount) else value
+
+
+def _get_token(denom: Optional[Denom]) -> Optional[str]:
+    return None if denom is None else denom.token
@@ -0,0 +1,115 @@
+import json
+import re
+from datetime import datetime as dt
+from decimal import Decimal
+from typing import Union
+
+from senkalib.chain.transaction import Transaction
+
+HEADER_PATTERN = re.compile(rb'"header"\s*:\s*(\{[^{}]*\})')
+CHAIN_ID_PATTERN = re.compile(rb'"chain_id"\s*:\s*"([^"]*)"')
+TIMESTAMP_PATTERN = re.compile(rb'"timestamp"\s*:\s*"([^"]*)"')
+AMOUNT_PATTERN = re.compile(rb'"amount"\s*:\s*"(\d+)"')
+TXHASH_PATTERN = re.compile(rb'"txhash"\s*:\s*"([^"]*)"')
+CODE_PATTERN = re.compile(rb'"code"\s*:\s*(\d+)')
+FEE_PATTERN = re.compile(rb'"fee"\s*:\s*\{\s*"amount"\s*:\s*(\[[^\]]*\])')
+DATA_HEAD_ENDS = [b'"raw_log"', b'"logs"', b'"tx"']
+
+
+class RawKavaTransaction(Transaction):
+    """the fields of a stored kava transaction that are needed before a full decode.
+
+    chain_id, timestamp, txhash, fail flag and fee are sniffed from the raw json
+    bytes. when one of them can not be located the document is decoded instead.
+    """
+
+    chain = "kava"
+
+    def __init__(
+        self,
+        transaction_id: str,
+        chain_id: str,
+        timestamp: str,
+        fail: bool,
+        fee: Decimal,
+    ):
+        super().__init__(transaction_id)
+        self.chain_id = chain_id
+        self.timestamp = timestamp
+        self.fail = fail
+        self.fee = fee
+
+    @classmethod
+    def from_bytes(cls, raw: Union[bytes, str]) -> "RawKavaTransaction":
+        if isinstance(raw, str):
+            raw = raw.encode()
+        header_match = HEADER_PATTERN.match(raw, raw.find(b'"header"'))
+        txhash_match = TXHASH_PATTERN.match(raw, raw.find(b'"txhash"'))
+        fee_match = FEE_PATTERN.match(raw, raw.rfind(b'"fee"'))
+        if header_match is None or txhash_match is None or fee_match is None:
+            return RawKavaTransaction.from_dict(json.loads(raw))
+
+        header = header_match.group(1)
+        chain_id_match = CHAIN_ID_PATTERN.search(header)
+        timestamp_match = TIMESTAMP_PATTERN.search(header)
+        if chain_id_match is None or timestamp_match is None:
+            return RawKavaTransaction.from_dict(json.loads(raw))
+
+        # a document without any code key succeeded. a single code key is only
+        # trusted next to txhash, before the logs and the tx body, where the
+        # node puts it. anywhere else, such as with sorted keys, decode instead
+        code_position = raw.find(b'"code"')
+        code_match = None
+        if code_position >= 0:
+            head_end = len(raw)
+            for key in DATA_HEAD_ENDS:
+                position = raw.find(key, txhash_match.end(), head_end)
+                if position >= 0:
+                    head_end = position
+            if txhash_match.end() <= code_position < head_end:
+                code_match = CODE_PATTERN.match(raw, code_position)
+            if code_match is None or raw.find(b'"code"', code_position + 1) >= 0:
+                return RawKavaTransaction.from_dict(json.loads(raw))
+
+        fee_amount_match = AMOUNT_PATTERN.search(fee_match.group(1))
+        return cls(
+            txhash_match.group(1).decode(),
+            chain_id_match.group(1).decode(),
+            timestamp_match.group(1).decode(),
+            code_match is not None and int(code_match.group(1)) != 0,
+            Decimal("0")
+            if fee_amount_match is None
+            else Decimal(fee_amount_match.group(1).decode()),
+        )
+
+    @classmethod
+    def decode(cls, raw: Union[bytes, str]) -> dict:
+        return json.loads(raw)
+
+    @classmethod
+    def from_dict(cls, transaction: dict) -> "RawKavaTransaction":
+        data = transaction["data"]
+        tx = data["tx"]
+        fee = tx["value"]["fee"] if "value" in tx else tx["auth_info"]["fee"]
+        return cls(
+            data["txhash"],
+            transaction["header"]["chain_id"],
+            transaction["header"]["timestamp"],
+            data.get("code", 0) != 0,
+            RawKavaTransaction._get_fee(fee["amount"]),
+        )
+
+    def get_timestamp(self) -> str:
+        return str(
+            dt.strptime(self.timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=None)
+        )
+
+    def get_transaction_fee(self) -> Decimal:
+        return self.fee
+
+    def get_fail(self) -> bool:
+        return self.fail
+
+    @classmethod
+    def _get_fee(cls, fee_list: list) -> Decimal:
+        return Decimal("0") if len(fee_list) == 0 else Decimal(fee_list[0]["amount"])
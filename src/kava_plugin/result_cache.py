@@ -0,0 +1,160 @@
+import hashlib
+import os
+import shelve
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from kava_plugin import __version__
+from kava_plugin.denom import DenomRegistry
+
+# bumped whenever the shape of the cached results changes
+RESULT_FORMAT = 3
+# modules whose code decides the cached results
+RESULT_MODULES = [
+    "amount.py",
+    "denom.py",
+    "kava_util.py",
+    "message.py",
+    "message_factory.py",
+    "message_result.py",
+]
+
+
+class ResultCache:
+    """Message.get_result outputs per transaction, keyed by txhash and plugin version.
+
+    a bounded in-memory LRU, written through to a shelve database when path is given.
+    the database is a separate, larger LRU of max_disk_size entries.
+    access is serialized with a lock so the cache can be shared between threads.
+    keys also hold a hash of the code of RESULT_MODULES and of the DenomRegistry
+    contents, so results stored before either changed are never returned. such
+    keys are pruned from the database when it is opened and before writing with
+    a new prefix.
+    """
+
+    code_fingerprint: Optional[str] = None
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        path: Optional[str] = None,
+        max_disk_size: int = 100000,
+    ):
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive. max_size: {max_size}")
+        if max_disk_size < 1:
+            raise ValueError(
+                f"max_disk_size must be positive. max_disk_size: {max_disk_size}"
+            )
+        self.max_size = max_size
+        self.max_disk_size = max_disk_size
+        self.results: OrderedDict = OrderedDict()
+        # the keys of the shelf, least recently used first
+        self.disk_keys: OrderedDict = OrderedDict()
+        self.shelf_prefix: Optional[str] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.lock = threading.Lock()
+        self.shelf = shelve.open(path) if path is not None else None
+        if self.shelf is not None:
+            self.disk_keys = OrderedDict.fromkeys(self.shelf.keys())
+            self.__prune(ResultCache._get_prefix())
+
+    @classmethod
+    def get_code_fingerprint(cls) -> str:
+        if ResultCache.code_fingerprint is None:
+            digest = hashlib.sha256()
+            directory = os.path.dirname(__file__)
+            for module in RESULT_MODULES:
+                with open(os.path.join(directory, module), "rb") as module_file:
+                    digest.update(module_file.read())
+            ResultCache.code_fingerprint = digest.hexdigest()[:16]
+        return ResultCache.code_fingerprint
+
+    def get(self, transaction_id: str) -> Optional[list]:
+        key = ResultCache._get_prefix() + transaction_id
+        with self.lock:
+            return self.__get(key)
+
+    def put(self, transaction_id: str, results: list) -> None:
+        prefix = ResultCache._get_prefix()
+        key = prefix + transaction_id
+        with self.lock:
+            self.__remember(key, results)
+            if self.shelf is not None:
+                if prefix != self.shelf_prefix:
+                    self.__prune(prefix)
+                self.shelf[key] = results
+                self.disk_keys[key] = None
+                self.disk_keys.move_to_end(key)
+                self.__evict_disk()
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "size": len(self.results),
+                "disk_size": len(self.disk_keys),
+            }
+
+    def close(self) -> None:
+        with self.lock:
+            if self.shelf is not None:
+                self.shelf.close()
+                self.shelf = None
+
+    def __get(self, key: str) -> Optional[list]:
+        results = self.results.get(key)
+        if results is not None:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return results
+
+        if self.shelf is not None and key in self.shelf:
+            self.hits += 1
+            self.disk_hits += 1
+            results = self.shelf[key]
+            self.disk_keys.move_to_end(key)
+            self.__remember(key, results)
+            return results
+
+        self.misses += 1
+        return None
+
+    def __remember(self, key: str, results: list) -> None:
+        self.results[key] = results
+        self.results.move_to_end(key)
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def __evict_disk(self) -> None:
+        assert self.shelf is not None
+        while len(self.disk_keys) > self.max_disk_size:
+            key, _ = self.disk_keys.popitem(last=False)
+            del self.shelf[key]
+            self.disk_evictions += 1
+
+    def __prune(self, prefix: str) -> None:
+        # drops the results stored under an earlier version or fingerprint
+        assert self.shelf is not None
+        for key in [key for key in self.disk_keys if not key.startswith(prefix)]:
+            del self.shelf[key]
+            del self.disk_keys[key]
+        self.shelf_prefix = prefix
+        self.__evict_disk()
+
+    @classmethod
+    def _get_prefix(cls) -> str:
+        return (
+            f"{__version__}:{RESULT_FORMAT}:{ResultCache.get_code_fingerprint()}:"
+            f"{DenomRegistry.get_fingerprint()}:"
+        )
@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+
+from senkalib.token_original_id_table import TokenOriginalIdTable
+
+
+class CachedTokenOriginalIdTable(TokenOriginalIdTable):
+    """wraps a TokenOriginalIdTable and memoizes get_symbol_uuid with LRU eviction.
+
+    safe to share between threads; the wrapped table is called outside the lock.
+    """
+
+    def __init__(self, token_table: TokenOriginalIdTable, max_size: int = 1024):
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive. max_size: {max_size}")
+        self.token_table = token_table
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.symbol_uuids: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_symbol_uuid(self, chain: str, token_original_id: str) -> str:
+        key = (chain, token_original_id)
+        with self.lock:
+            if key in self.symbol_uuids:
+                self.hits += 1
+                self.symbol_uuids.move_to_end(key)
+                return self.symbol_uuids[key]
+            self.misses += 1
+
+        symbol_uuid = self.token_table.get_symbol_uuid(chain, token_original_id)
+        with self.lock:
+            self.symbol_uuids[key] = symbol_uuid
+            if len(self.symbol_uuids) > self.max_size:
+                self.symbol_uuids.popitem(last=False)
+        return symbol_uuid
+
+    def get_all_meta_data(self, chain: str, token_original_id: str) -> dict:
+        return self.token_table.get_all_meta_data(chain, token_original_id)
+
+    def get_symbol(self, chain: str, token_original_id: str) -> str:
+        return self.token_table.get_symbol(chain, token_original_id)
+
+    def get_description(self, chain: str, token_original_id: str) -> str:
+        return self.token_table.get_description(chain, token_original_id)
+
+    def get_chain(self, chain: str, token_original_id: str) -> str:
+        return self.token_table.get_chain(chain, token_original_id)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.symbol_uuids.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
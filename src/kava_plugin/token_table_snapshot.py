@@ -0,0 +1,150 @@
+import csv
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+from senkalib.token_original_id_table import TokenOriginalIdTable
+
+logger = logging.getLogger(name=__name__)
+logger.addHandler(logging.NullHandler())
+
+TOKEN_ORIGINAL_IDS_URL = "https://raw.githubusercontent.com/ca3-caaip/token_original_id/master/token_original_id.csv"
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "kava_plugin",
+    "token_original_id.json",
+)
+
+# bumped whenever the layout of the snapshot file changes
+SNAPSHOT_FORMAT = 1
+
+
+class LocalTokenOriginalIdTable(TokenOriginalIdTable):
+    """TokenOriginalIdTable indexed by chain and original_id, saved as a local snapshot.
+
+    the snapshot is a JSON file holding the index itself, so loading it needs
+    no download and no rebuild. lookups keep the semantics of the wrapped CSV
+    table: unknown keys return None and duplicated keys raise ValueError.
+    """
+
+    DEFAULT_MAX_AGE = 24 * 60 * 60
+
+    def __init__(
+        self,
+        index: Dict[str, Dict[str, Optional[dict]]],
+        source: Optional[str] = None,
+        fetched_at: Optional[float] = None,
+    ):
+        # TokenOriginalIdTable.__init__ downloads the CSV, so it is not called
+        self.index = index
+        self.source = source
+        self.fetched_at = fetched_at
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[dict],
+        source: Optional[str] = None,
+        fetched_at: Optional[float] = None,
+    ) -> "LocalTokenOriginalIdTable":
+        index: Dict[str, Dict[str, Optional[dict]]] = {}
+        for row in rows:
+            chain_index = index.setdefault(row["chain"], {})
+            # None marks a duplicated definition
+            chain_index[row["original_id"]] = (
+                None if row["original_id"] in chain_index else row
+            )
+        return cls(index, source, fetched_at)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "LocalTokenOriginalIdTable":
+        with open(path, encoding="utf-8", newline="") as csv_file:
+            return cls.from_rows(
+                csv.DictReader(csv_file), source=path, fetched_at=os.path.getmtime(path)
+            )
+
+    @classmethod
+    def fetch(cls, csv_url: str) -> "LocalTokenOriginalIdTable":
+        token_table = TokenOriginalIdTable(csv_url)
+        return cls.from_rows(
+            token_table.token_original_id_table, source=csv_url, fetched_at=time.time()
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LocalTokenOriginalIdTable":
+        with open(path, encoding="utf-8") as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(
+                f"unsupported token table snapshot format. path: {path}, format: {snapshot.get('format')}"
+            )
+        return cls(snapshot["index"], snapshot["source"], snapshot["fetched_at"])
+
+    @classmethod
+    def open(
+        cls,
+        csv_url: str,
+        path: str = DEFAULT_SNAPSHOT_PATH,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+        offline: bool = False,
+    ) -> "LocalTokenOriginalIdTable":
+        """the snapshot at path, refreshed from csv_url when older than max_age seconds.
+
+        offline never fetches and requires the snapshot. max_age None never
+        refreshes an existing snapshot. a failed refresh falls back to the stale
+        snapshot.
+        """
+        snapshot = cls.load(path) if os.path.exists(path) else None
+        if offline:
+            if snapshot is None:
+                raise FileNotFoundError(
+                    f"offline mode needs a token table snapshot. path: {path}"
+                )
+            return snapshot
+        if snapshot is not None and not snapshot.is_stale(max_age):
+            return snapshot
+
+        try:
+            token_table = cls.fetch(csv_url)
+        except Exception as e:
+            if snapshot is None:
+                raise
+            logger.warning(f"using stale token table snapshot {path}. error: {e}")
+            return snapshot
+        token_table.save(path)
+        return token_table
+
+    def is_stale(self, max_age: Optional[float]) -> bool:
+        if max_age is None:
+            return False
+        return self.fetched_at is None or time.time() - self.fetched_at > max_age
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "source": self.source,
+            "fetched_at": self.fetched_at,
+            "index": self.index,
+        }
+        # written next to the snapshot and renamed, so readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump(snapshot, snapshot_file, separators=(",", ":"))
+        os.replace(temp_path, path)
+        logger.debug(f"saved token table snapshot {path}")
+
+    def get_all_meta_data(self, chain: str, token_original_id: str) -> Optional[dict]:
+        chain_index = self.index.get(chain)
+        if chain_index is None or token_original_id not in chain_index:
+            return None
+        meta_data = chain_index[token_original_id]
+        if meta_data is None:
+            raise ValueError(
+                f"token_original_id table have duplicated definition. token_original_id: {token_original_id}"
+            )
+        return meta_data
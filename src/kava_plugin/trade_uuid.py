@@ -0,0 +1,40 @@
+import uuid
+from typing import Optional
+
+# uuid5(NAMESPACE_URL, "https://github.com/ca3-caaip/kava-plugin/trade_uuid"),
+# spelled out as changing it changes every deterministic trade_uuid
+TRADE_UUID_NAMESPACE = uuid.UUID("b0742157-ea74-56e2-a383-4187a61401d6")
+
+
+class TradeUuid:
+    """deterministic trade_uuid values, derived with uuid5 instead of drawn with uuid4.
+
+    the name is the txhash, followed by the journaled address with per_address
+    and by the message index with per_message. without per_message all lines of
+    a transaction share one trade_uuid as with uuid4, with it the lines of each
+    message get their own and the fee line keeps the one of the transaction.
+    enabled with KavaPlugin.set_trade_uuid.
+    """
+
+    def __init__(
+        self,
+        namespace: uuid.UUID = TRADE_UUID_NAMESPACE,
+        per_address: bool = True,
+        per_message: bool = False,
+    ):
+        self.namespace = namespace
+        self.per_address = per_address
+        self.per_message = per_message
+
+    def get(
+        self,
+        transaction_id: str,
+        address: Optional[str] = None,
+        message_index: Optional[int] = None,
+    ) -> str:
+        name = transaction_id.upper()
+        if self.per_address and address is not None:
+            name = f"{name}:{address}"
+        if self.per_message and message_index is not None:
+            name = f"{name}:{message_index}"
+        return str(uuid.uuid5(self.namespace, name))
@@ -0,0 +1,53 @@
+from collections import deque
+from concurrent.futures import Future
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from senkalib.token_original_id_table import TokenOriginalIdTable
+
+_worker_token_table: Optional[TokenOriginalIdTable] = None
+
+
+def init_worker(
+    token_table: TokenOriginalIdTable,
+    initializer: Callable[..., None],
+    *initargs: Any,
+) -> None:
+    """the initializer of a worker process, keeping token_table for get_worker_token_table.
+
+    token_table is pickled once into each worker instead of with every chunk, and
+    initializer is called with initargs, such as KavaPlugin.init_hooks.
+    """
+    global _worker_token_table
+    _worker_token_table = token_table
+    initializer(*initargs)
+
+
+def get_worker_token_table() -> TokenOriginalIdTable:
+    if _worker_token_table is None:
+        raise RuntimeError("init_worker has not been called in this process")
+    return _worker_token_table
+
+
+def check_chunk_size(chunk_size: int) -> None:
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive. chunk_size: {chunk_size}")
+
+
+def chunked(items: Iterable[Any], chunk_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def iter_in_order(workers: int, futures: Iterable[Future]) -> Iterator[Any]:
+    """the results of futures in input order, with at most workers * 2 in flight."""
+    pending: deque = deque()
+    for future in futures:
+        pending.append(future)
+        if len(pending) >= workers * 2:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
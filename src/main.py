@@ -1,31 +1,62 @@
+import argparse
 import sys
 
-import pandas as pd
 from senkalib.chain.kava.kava_transaction_generator import KavaTransactionGenerator
 from senkalib.senka_setting import SenkaSetting
-from senkalib.token_original_id_table import TokenOriginalIdTable
 
+from kava_plugin.caaj_export import CaajCsvExport
 from kava_plugin.kava_plugin import KavaPlugin
-
-TOKEN_ORIGINAL_IDS_URL = "https://raw.githubusercontent.com/ca3-caaip/token_original_id/master/token_original_id.csv"
-
+from kava_plugin.token_table_snapshot import (
+    DEFAULT_SNAPSHOT_PATH,
+    TOKEN_ORIGINAL_IDS_URL,
+    LocalTokenOriginalIdTable,
+)
 
 if __name__ == "__main__":
-    args = sys.argv
-    address = args[1]
-    caajs = []
+    parser = argparse.ArgumentParser(
+        description="write the CAAJ journal of a kava address as CSV sorted by executed_at"
+    )
+    parser.add_argument("address")
+    parser.add_argument("-o", "--output", help="output CSV file. stdout by default")
+    parser.add_argument(
+        "--run-size",
+        type=int,
+        default=CaajCsvExport.DEFAULT_RUN_SIZE,
+        help="journal lines sorted in memory before spilling a run to disk",
+    )
+    parser.add_argument("--temp-dir", help="directory of the spilled runs")
+    parser.add_argument(
+        "--token-table",
+        default=DEFAULT_SNAPSHOT_PATH,
+        help="local snapshot of the token original id table",
+    )
+    parser.add_argument(
+        "--token-table-max-age",
+        type=float,
+        default=LocalTokenOriginalIdTable.DEFAULT_MAX_AGE,
+        help="seconds before the snapshot is refreshed from the token table URL",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="use the token table snapshot without fetching it",
+    )
+    args = parser.parse_args()
+
     settings = SenkaSetting({})
-    token_original_ids = TokenOriginalIdTable(TOKEN_ORIGINAL_IDS_URL)
+    token_original_ids = LocalTokenOriginalIdTable.open(
+        TOKEN_ORIGINAL_IDS_URL,
+        args.token_table,
+        max_age=args.token_table_max_age,
+        offline=args.offline,
+    )
     transactions = KavaTransactionGenerator.get_transactions(
-        settings, address, None, None
+        settings, args.address, None, None
     )
+    rows = KavaPlugin.iter_caaj_rows(args.address, transactions, token_original_ids)
 
-    for transaction in transactions:
-        if KavaPlugin.can_handle(transaction):
-            caaj_peace = KavaPlugin.get_caajs(address, transaction, token_original_ids)
-            caajs.extend(caaj_peace)
-
-    df = pd.DataFrame(caajs)
-    df = df.sort_values("executed_at")
-    caaj_csv = df.to_csv(None, index=False)
-    print(caaj_csv)
+    if args.output is None:
+        CaajCsvExport.write(rows, sys.stdout, args.run_size, args.temp_dir)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            CaajCsvExport.write(rows, output, args.run_size, args.temp_dir)
@@ -0,0 +1,8 @@
+SYMBOL_UUID = "3a2570c5-15c4-2860-52a8-bff14f27a236"
+
+
+class TokenTableStub:
+    """a token table giving every token the same symbol uuid."""
+
+    def get_symbol_uuid(self, chain: str, token_original_id: str) -> str:
+        return SYMBOL_UUID
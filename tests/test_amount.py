@@ -0,0 +1,50 @@
+import pickle
+import unittest
+from decimal import Decimal
+
+from kava_plugin.amount import Amount
+from kava_plugin.kava_util import KavaUtil
+
+
+class TestAmount(unittest.TestCase):
+    def test_str(self):
+        for units in [0, 1, 7, 10, 45, 1000, 39000, 1298035, 19155352120, 10**30]:
+            for decimals in [0, 1, 6, 8, 18]:
+                expected = str(Decimal(units) / Decimal(10**decimals))
+                assert str(Amount(units, decimals)) == expected
+                assert str(Amount(-units, decimals)) == str(-Decimal(expected))
+
+        assert str(Amount(1, 8)) == "1E-8"
+        assert str(Amount(15, 8)) == "1.5E-7"
+        assert str(Amount(3500000000, 6)) == "3500"
+        assert f"{Amount(1180, 6)} kava" == "0.00118 kava"
+
+    def test_from_str(self):
+        assert Amount.from_str("0.00118") == Amount(1180, 6)
+        assert Amount.from_str("1E+3") == Amount(1000, 0)
+        assert Amount.from_str("1E-8") == Amount(1, 8)
+        assert Amount.from_str("-2.5") == Amount(-25, 1)
+
+    def test_eq(self):
+        assert Amount(1000000, 6) == Amount(1, 0)
+        assert hash(Amount(1000000, 6)) == hash(Amount(1, 0))
+        assert Amount(1000000, 6) != Amount(1000000, 8)
+        assert Amount(0, 6).is_zero()
+        assert Amount(1, 0) != "1"
+
+    def test_pickle(self):
+        amount = Amount(36428994, 8)
+        str(amount)
+        assert pickle.loads(pickle.dumps(amount)) == amount
+        assert str(pickle.loads(pickle.dumps(amount))) == "0.36428994"
+
+    def test_get_amount(self):
+        assert KavaUtil.get_amount("36428994", "bnb") == Amount(36428994, 8)
+        assert KavaUtil.get_amount("10050333", "usdx") == Amount(10050333, 6)
+        assert str(KavaUtil.get_amount("10050333")) == str(
+            KavaUtil.convert_uamount_amount("10050333")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.caaj_batch import CAAJ_COLUMNS, CaajBatch
+from kava_plugin.kava_plugin import KavaPlugin
+from tests.stubs import TokenTableStub
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestCaajBatch(unittest.TestCase):
+    ADDRESS = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+
+    def test_write_caajs(self):
+        transactions = TestCaajBatch._get_transactions()
+        with patch.object(KavaPlugin, "_get_uuid", return_value="trade-uuid"):
+            expected = list(
+                KavaPlugin.iter_caajs(self.ADDRESS, transactions, TokenTableStub())
+            )
+            batch = KavaPlugin.write_caajs(self.ADDRESS, transactions, TokenTableStub())
+
+        assert len(batch) == len(expected)
+        assert batch.to_caajs() == expected
+        pd.testing.assert_frame_equal(batch.to_pandas(), pd.DataFrame(expected))
+
+        batch.extend(expected[:1])
+        assert batch.to_caajs()[-1] == expected[0]
+
+    def test_empty(self):
+        batch = CaajBatch()
+        assert len(batch) == 0
+        assert list(batch.to_pandas().columns) == CAAJ_COLUMNS
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_to_arrow(self):
+        batch = KavaPlugin.write_caajs(
+            self.ADDRESS, TestCaajBatch._get_transactions(), TokenTableStub()
+        )
+        table = batch.to_arrow()
+        assert table.column_names == CAAJ_COLUMNS
+        assert table.num_rows == len(batch)
+
+    @classmethod
+    def _get_transactions(cls) -> list:
+        transactions = []
+        for filename in ["delegate_v8", "send_v8", "fail_v8", "claim_hard_reward_v7"]:
+            with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile:
+                transactions.append(KavaTransaction(json.load(jsonfile)))
+        return transactions
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.caaj_batch import CAAJ_COLUMNS
+from kava_plugin.caaj_export import CaajCsvExport
+from kava_plugin.kava_plugin import KavaPlugin
+from tests.stubs import TokenTableStub
+
+
+class TestCaajCsvExport(unittest.TestCase):
+    ADDRESS = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+
+    def test_write(self):
+        rows = TestCaajCsvExport._get_rows()
+        expected = (
+            pd.DataFrame(rows, columns=CAAJ_COLUMNS)
+            .sort_values("executed_at", kind="mergesort")
+            .to_csv(None, index=False)
+        )
+
+        for run_size in [1, 2, 5, len(rows), len(rows) + 1]:
+            out = io.StringIO()
+            count = CaajCsvExport.write(rows, out, run_size=run_size)
+            assert count == len(rows)
+            assert out.getvalue() == expected
+
+    def test_write_empty(self):
+        out = io.StringIO()
+        assert CaajCsvExport.write([], out) == 0
+        assert out.getvalue() == ",".join(CAAJ_COLUMNS) + "\n"
+
+    def test_invalid_run_size(self):
+        with self.assertRaises(ValueError):
+            CaajCsvExport.write([], io.StringIO(), run_size=0)
+
+    @classmethod
+    def _get_rows(cls) -> list:
+        # newest first, as the transaction generator returns them
+        transactions = []
+        for filename in [
+            "claim_hard_reward_v7",
+            "send_v8",
+            "delegate_v8",
+            "swap_deposit_v8",
+            "create_cdp_v7",
+        ]:
+            with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile:
+                transactions.append(KavaTransaction(json.load(jsonfile)))
+        with patch.object(KavaPlugin, "_get_uuid", return_value="trade-uuid"):
+            return list(
+                KavaPlugin.iter_caaj_rows(cls.ADDRESS, transactions, TokenTableStub())
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
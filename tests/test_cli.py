@@ -0,0 +1,180 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.caaj_batch import CAAJ_COLUMNS
+from kava_plugin.caaj_export import CaajCsvExport
+from kava_plugin.cli import main
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.token_table_snapshot import LocalTokenOriginalIdTable
+
+FIXTURES = ["delegate_v8", "send_v8", "fail_v8", "claim_hard_reward_v7", "vote_v8"]
+ADDRESSES = [
+    "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7",
+    "kava1eyugkwc74zejgwdwl7mvm7pad4hzdnka4wmdmu",
+]
+UNRELATED_ADDRESS = "kava1xy7hrjy9r0algz9w3gzm8u6mrpq97kwta747gj"
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+        self.snapshot = os.path.join(self.directory, "token_original_id.json")
+        self.token_table = LocalTokenOriginalIdTable.from_csv(
+            "tests/data/token_original_id.csv"
+        )
+        self.token_table.save(self.snapshot)
+
+        self.corpus = os.path.join(self.directory, "corpus")
+        os.mkdir(self.corpus)
+        self.transactions = []
+        with gzip.open(os.path.join(self.corpus, "corpus.ndjson.gz"), "wt") as f:
+            for filename in FIXTURES:
+                with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile:
+                    transaction = json.load(jsonfile)
+                f.write(json.dumps(transaction) + "\n")
+                self.transactions.append(KavaTransaction(transaction))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_csv(self):
+        output = os.path.join(self.directory, "caaj.csv")
+        with patch.object(KavaPlugin, "_get_uuid", return_value="trade-uuid"):
+            stderr = self._run(["-o", output, "--run-size", "2"])
+            rows = list(
+                KavaPlugin.iter_caaj_rows_for_addresses(
+                    ADDRESSES, self.transactions, self.token_table
+                )
+            )
+        expected = io.StringIO()
+        CaajCsvExport.write(rows, expected)
+
+        with open(output, encoding="utf-8", newline="") as f:
+            assert f.read() == expected.getvalue()
+        assert f"documents     {len(FIXTURES)} " in stderr
+        assert f"caaj rows     {len(rows)}\n" in stderr
+
+    def test_ndjson_workers(self):
+        outputs = []
+        for workers in ["1", "2"]:
+            output = os.path.join(self.directory, f"caaj_{workers}.ndjson.gz")
+            self._run(["-o", output, "-f", "ndjson", "--workers", workers])
+            with gzip.open(output, "rt", encoding="utf-8") as f:
+                outputs.append([json.loads(line) for line in f])
+
+        assert outputs[0][0].keys() == set(CAAJ_COLUMNS)
+        for caajs in outputs:
+            for caaj in caajs:
+                del caaj["trade_uuid"]
+        assert outputs[0] == outputs[1]
+        assert len(outputs[0]) > 0
+
+    def test_slow_log(self):
+        for workers in ["1", "2"]:
+            slow_log = os.path.join(self.directory, f"slow_{workers}.ndjson")
+            output = os.path.join(self.directory, "caaj.ndjson")
+            self._run(
+                ["-o", output, "-f", "ndjson", "--workers", workers]
+                + ["--slow-log", slow_log, "--slow-log-size", "3"]
+            )
+            with open(slow_log, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            assert len(records) == 3
+            assert records[0]["seconds"] >= records[-1]["seconds"]
+            assert KavaPlugin.slow_transaction_log is None
+
+    def test_trade_uuid(self):
+        outputs = []
+        for workers in ["1", "2", "1"]:
+            output = os.path.join(self.directory, "caaj.ndjson")
+            self._run(
+                ["-o", output, "-f", "ndjson", "--workers", workers]
+                + ["--trade-uuid", "address"]
+            )
+            with open(output, encoding="utf-8") as f:
+                outputs.append(f.read())
+            assert KavaPlugin.trade_uuid is None
+
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert len(outputs[0]) > 0
+
+    def test_unrelated_address(self):
+        output = os.path.join(self.directory, "caaj.csv")
+        with patch.object(KavaPlugin, "_get_uuid", return_value="trade-uuid"):
+            self._run(["-o", output])
+            with open(output, encoding="utf-8", newline="") as f:
+                expected = f.read()
+            self._run(["-o", output, "-a", UNRELATED_ADDRESS])
+        with open(output, encoding="utf-8", newline="") as f:
+            assert f.read() == expected
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            main(
+                [self.corpus, "-a", UNRELATED_ADDRESS, "-o", output]
+                + ["--token-table", self.snapshot, "--offline"]
+            )
+        assert "caaj rows     0\n" in stderr.getvalue()
+
+    def test_address_required(self):
+        with self.assertRaises(SystemExit):
+            main([self.corpus, "--token-table", self.snapshot, "--offline"])
+
+    def test_positive_sizes(self):
+        output = os.path.join(self.directory, "caaj.csv")
+        for option in ["--workers", "--chunk-size", "--slow-log-size"]:
+            with self.assertRaises(SystemExit) as context:
+                self._run(["-o", output, option, "0"])
+            assert str(context.exception).startswith(f"{option} must be positive")
+
+    def test_offline_without_snapshot(self):
+        snapshot = os.path.join(self.directory, "missing.json")
+        with self.assertRaises(SystemExit) as context:
+            main(
+                [
+                    self.corpus,
+                    "-a",
+                    ADDRESSES[0],
+                    "--token-table",
+                    snapshot,
+                    "--offline",
+                ]
+            )
+        assert snapshot in str(context.exception)
+
+    def _run(self, options: list) -> str:
+        address_file = os.path.join(self.directory, "addresses.txt")
+        with open(address_file, "w", encoding="utf-8") as f:
+            f.write(f"{ADDRESSES[1]}\n\n")
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            assert (
+                main(
+                    [
+                        self.corpus,
+                        "-a",
+                        ADDRESSES[0],
+                        "--address-file",
+                        address_file,
+                        "--token-table",
+                        self.snapshot,
+                        "--offline",
+                    ]
+                    + options
+                )
+                == 0
+            )
+        return stderr.getvalue()
+
+
+if __name__ == "__main__":
+    unittest.main()
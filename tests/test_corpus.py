@@ -0,0 +1,67 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from kava_plugin.corpus import TransactionCorpus
+
+FIXTURES = ["delegate_v8", "send_v8", "fail_v8", "claim_hard_reward_v7"]
+
+
+class TestTransactionCorpus(unittest.TestCase):
+    def test_iter_documents(self):
+        documents = TestTransactionCorpus._get_documents()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            TestTransactionCorpus._write_corpus(temp_dir, documents)
+
+            loaded = [
+                json.loads(document)
+                for document in TransactionCorpus.iter_documents([temp_dir])
+            ]
+            assert loaded == documents
+
+            single = os.path.join(temp_dir, "a.json")
+            assert (
+                list(TransactionCorpus.iter_documents([single, single]))
+                == [json.dumps(documents[0]).encode()] * 2
+            )
+
+            with self.assertRaises(ValueError):
+                list(
+                    TransactionCorpus.iter_documents(
+                        [os.path.join(temp_dir, "notes.txt")]
+                    )
+                )
+
+    def test_is_corpus_file(self):
+        assert TransactionCorpus.is_corpus_file("a.json")
+        assert TransactionCorpus.is_corpus_file("a.jsonl.gz")
+        assert TransactionCorpus.is_corpus_file("dir/a.ndjson")
+        assert not TransactionCorpus.is_corpus_file("a.csv.gz")
+        assert not TransactionCorpus.is_corpus_file("a.gz")
+
+    @classmethod
+    def _write_corpus(cls, directory: str, documents: list) -> None:
+        # a.json, then b.ndjson with a blank line, then c/d.jsonl.gz
+        with open(os.path.join(directory, "a.json"), "w", encoding="utf-8") as f:
+            json.dump(documents[0], f)
+        with open(os.path.join(directory, "b.ndjson"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(documents[1]) + "\n\n" + json.dumps(documents[2]) + "\n")
+        os.mkdir(os.path.join(directory, "c"))
+        with gzip.open(os.path.join(directory, "c", "d.jsonl.gz"), "wt") as f:
+            f.write(json.dumps(documents[3]))
+        with open(os.path.join(directory, "notes.txt"), "w", encoding="utf-8") as f:
+            f.write("not a transaction")
+
+    @classmethod
+    def _get_documents(cls) -> list:
+        documents = []
+        for filename in FIXTURES:
+            with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile:
+                documents.append(json.load(jsonfile))
+        return documents
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from benchmarks.corpus_generator import ADDRESS_PATTERN, CorpusGenerator, main
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.raw_transaction import RawKavaTransaction
+from tests.stubs import TokenTableStub
+
+
+class TestCorpusGenerator(unittest.TestCase):
+    def test_generate(self):
+        generator = CorpusGenerator("tests/data", seed=7, addresses=20)
+        transactions = list(generator.generate(300))
+        pool = set(generator.addresses)
+
+        for transaction in transactions:
+            data = transaction["data"]
+            kava_transaction = KavaTransaction(transaction)
+            if not kava_transaction.get_fail():
+                version = kava_transaction.get_chain_version()
+                messages = CorpusGenerator._get_messages(transaction, version)
+                assert len(messages) == len(data["logs"])
+                if data["raw_log"].startswith("["):
+                    assert json.loads(data["raw_log"]) == data["logs"]
+            addresses = ADDRESS_PATTERN.findall(json.dumps(data["tx"]))
+            assert set(addresses) <= pool
+
+            # every generated transaction journals without errors
+            for address in generator.addresses[:3]:
+                KavaPlugin.get_caajs(address, kava_transaction, TokenTableStub())
+
+        assert (
+            len({transaction["data"]["txhash"] for transaction in transactions}) == 300
+        )
+        assert any(KavaTransaction(t).get_fail() for t in transactions)
+        assert any(len(t["data"].get("logs", [])) > 1 for t in transactions)
+
+    def test_seed(self):
+        first = list(CorpusGenerator("tests/data", seed=3).generate(20))
+        second = list(CorpusGenerator("tests/data", seed=3).generate(20))
+        assert first == second
+
+    def test_mix(self):
+        generator = CorpusGenerator(
+            "tests/data",
+            mix={"delegate": 1, "send": 0},
+            seed=1,
+            fail_rate=0,
+            multi_message_rate=0,
+        )
+        for transaction in generator.generate(20):
+            assert len(transaction["data"]["logs"]) == 1
+            assert transaction["data"]["logs"][0]["events"][0]["type"] == "delegate"
+
+        with self.assertRaises(ValueError):
+            CorpusGenerator("tests/data", mix={"unknown_action": 1})
+        with self.assertRaises(ValueError):
+            CorpusGenerator("tests/data", mix={"send": 0})
+
+    def test_fail(self):
+        generator = CorpusGenerator("tests/data", seed=1, fail_rate=1)
+        for transaction in generator.generate(20):
+            kava_transaction = KavaTransaction(transaction)
+            assert kava_transaction.get_fail()
+            caajs = KavaPlugin.get_caajs(
+                generator.addresses[0], kava_transaction, TokenTableStub()
+            )
+            assert [caaj.type for caaj in caajs] in [[], ["lose"]]
+
+            data = transaction["data"]
+            assert list(data)[:4] == ["height", "txhash", "codespace", "code"]
+            assert "logs" not in data and "events" not in data
+            raw_transaction = RawKavaTransaction.from_bytes(json.dumps(transaction))
+            assert raw_transaction.get_fail() is True
+
+    def test_main(self):
+        out = io.StringIO()
+        with patch("sys.stdout", out):
+            assert main(["-n", "5", "--seed", "1", "--mix", "send=1,delegate=2"]) == 0
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 5
+        assert all(json.loads(line)["header"] for line in lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.denom import Denom, DenomRegistry
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.kava_util import KavaUtil
+from tests.stubs import TokenTableStub
+
+
+class TestDenomRegistry(unittest.TestCase):
+    def test_get(self):
+        assert DenomRegistry.get("ukava") == Denom("kava", 6, None)
+        assert DenomRegistry.get("xrpb") == Denom("xrp", 8, "xrp")
+        assert DenomRegistry.get("btcb") == Denom("btcb", 8, "btcb")
+        assert DenomRegistry.get("unknown") == Denom("unknown", 6, "unknown")
+
+    def test_resolve(self):
+        assert KavaUtil.split_amount("506376309394xrpb") == (
+            "506376309394",
+            Denom("xrp", 8, "xrp"),
+        )
+        assert KavaUtil.split_amount("1000") == ("1000", Denom("kava", 6, None))
+        assert KavaUtil.get_decimals("hbtc") == 8
+        assert KavaUtil.get_decimals(Denom("btc", 8, "btc")) == 8
+        assert KavaUtil.get_decimals() == 6
+        assert KavaPlugin._get_token_original_id(DenomRegistry.get("ukava")) is None
+        assert KavaPlugin._get_token_original_id(DenomRegistry.get("usdx")) == "usdx"
+        assert KavaPlugin._get_token_original_id(None) is None
+
+    def test_token_differs_from_denom(self):
+        with open("tests/data/hard_deposit_v8.json", encoding="utf-8") as jsonfile:
+            test_data = json.load(jsonfile)
+        for event in test_data["data"]["logs"][0]["events"]:
+            for attribute in event["attributes"]:
+                if attribute["key"] == "amount":
+                    attribute["value"] = "123456789ibc/ABC"
+        try:
+            DenomRegistry.register("ibc/ABC", "usdc", 8, "ibc/ABC")
+            amount, denom = KavaUtil.split_amount("123456789ibc/ABC")
+            assert denom == Denom("usdc", 8, "ibc/ABC")
+            assert str(KavaUtil.get_amount(amount, denom)) == "1.23456789"
+
+            caajs = KavaPlugin.get_caajs(
+                "kava1vtcpusw3fkzvhxmnuztjdan5v93tw558pp4y47",
+                KavaTransaction(test_data),
+                TokenTableStub(),
+            )
+            assert caajs[0].amount == "1.23456789"
+            assert caajs[0].token_symbol == "usdc"
+            assert caajs[0].token_original_id == "ibc/ABC"
+        finally:
+            DenomRegistry.denoms.clear()
+            DenomRegistry._register_default_denoms()
+
+    def test_load(self):
+        denom = "ibc/27394FB092D2ECCD56123C74F36E4C1F926001CEADA9CA97EA622B25F41E5EB2"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "denoms.json")
+            with open(path, "w", encoding="utf-8") as denoms_file:
+                json.dump(
+                    {"denoms": [{"denom": denom, "token": "atom", "decimals": 6}]},
+                    denoms_file,
+                )
+            try:
+                DenomRegistry.load(path)
+                amount, found = KavaUtil.split_amount(f"1500000{denom}")
+                assert (amount, found.token) == ("1500000", "atom")
+                assert KavaPlugin._get_token_original_id(found) == "atom"
+            finally:
+                DenomRegistry.denoms.clear()
+                DenomRegistry._register_default_denoms()
+
+        assert DenomRegistry.get(denom).token == denom
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+import io
+import json
+import pickle
+import unittest
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.instrumentation import (
+    Histogram,
+    Instrumentation,
+    SlowTransaction,
+    SlowTransactionLog,
+)
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.message import Message
+from kava_plugin.message_factory import MessageFactory
+from kava_plugin.raw_transaction import RawKavaTransaction
+from tests.stubs import TokenTableStub
+
+
+class TestInstrumentation(unittest.TestCase):
+    ADDRESS = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+    FEE_PAYER = "kava1dlezgt8undlpvdp0esmzyvxzvc59gkd56vkmea"
+
+    def tearDown(self):
+        KavaPlugin.set_instrumentation(None)
+        KavaPlugin.set_slow_transaction_log(None)
+
+    def test_hooks(self):
+        instrumentation = Instrumentation()
+        KavaPlugin.set_instrumentation(instrumentation)
+        assert MessageFactory.instrumentation is instrumentation
+        assert Message.instrumentation is instrumentation
+
+        lines = 0
+        for filename in ["delegate_v8", "send_v8", "fail_v8", "claim_hard_reward_v7"]:
+            with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile:
+                transaction = KavaTransaction(json.load(jsonfile))
+            lines += len(
+                KavaPlugin.get_caajs(self.ADDRESS, transaction, TokenTableStub())
+            )
+        Message(
+            [{"type": "message", "attributes": [{"key": "action", "value": "foo"}]}],
+            {},
+            "1",
+            "kava-8",
+        ).get_result()
+
+        snapshot = instrumentation.snapshot()
+        assert snapshot["get_caajs"]["count"] == 4
+        # the failed transaction has no messages
+        assert snapshot["get_messages"]["count"] == 3
+        assert snapshot["messages"] == 3
+        assert {
+            action: histogram["count"]
+            for action, histogram in snapshot["get_result"].items()
+        } == {"delegate": 1, "send": 1, "claim_hard_reward": 1, "None": 1}
+        assert snapshot["unknown_actions"] == {"foo": 1}
+        assert sum(snapshot["caaj_lines"].values()) == lines
+        assert snapshot["caaj_lines"]["fee"] == 4
+
+        KavaPlugin.set_instrumentation(None)
+        KavaPlugin.get_caajs(self.ADDRESS, transaction, TokenTableStub())
+        assert instrumentation.snapshot()["get_caajs"]["count"] == 4
+
+        instrumentation.reset()
+        assert instrumentation.snapshot()["messages"] == 0
+
+    def test_journaling_paths(self):
+        raws = []
+        for filename in ["delegate_v8", "send_v8", "fail_v8"]:
+            with open(f"tests/data/{filename}.json", "rb") as jsonfile:
+                raws.append(jsonfile.read())
+        transactions = [KavaTransaction(json.loads(raw)) for raw in raws]
+        addresses = [self.ADDRESS, self.FEE_PAYER]
+        paths = {
+            "iter_caajs": lambda: list(
+                KavaPlugin.iter_caajs(self.ADDRESS, transactions, TokenTableStub())
+            ),
+            "get_caajs_bulk": lambda: KavaPlugin.get_caajs_bulk(
+                self.ADDRESS, transactions, TokenTableStub(), workers=2, chunk_size=2
+            ),
+            "get_caajs_threaded": lambda: KavaPlugin.get_caajs_threaded(
+                self.ADDRESS, transactions, TokenTableStub(), workers=2, chunk_size=2
+            ),
+            "write_caajs": lambda: KavaPlugin.write_caajs(
+                self.ADDRESS, transactions, TokenTableStub()
+            ),
+            "iter_caaj_rows": lambda: list(
+                KavaPlugin.iter_caaj_rows(self.ADDRESS, transactions, TokenTableStub())
+            ),
+            "get_caajs_for_addresses": lambda: [
+                caaj
+                for transaction in transactions
+                for caajs in KavaPlugin.get_caajs_for_addresses(
+                    addresses, transaction, TokenTableStub()
+                ).values()
+                for caaj in caajs
+            ],
+            "get_caajs_from_raw": lambda: [
+                caaj
+                for raw in raws
+                for caaj in KavaPlugin.get_caajs_from_raw(
+                    self.FEE_PAYER, raw, TokenTableStub()
+                )
+            ],
+            "get_caaj_rows_from_raw": lambda: [
+                row
+                for raw in raws
+                for row in KavaPlugin.get_caaj_rows_from_raw(
+                    addresses, raw, RawKavaTransaction.from_bytes(raw), TokenTableStub()
+                )
+            ],
+        }
+        for name, journal in paths.items():
+            with self.subTest(name):
+                instrumentation = Instrumentation()
+                KavaPlugin.set_instrumentation(instrumentation)
+                slow_transaction_log = SlowTransactionLog(size=2)
+                KavaPlugin.set_slow_transaction_log(slow_transaction_log)
+                lines = len(journal())
+                snapshot = instrumentation.snapshot()
+                assert snapshot["get_caajs"]["count"] == 3
+                assert slow_transaction_log.observed == 3
+                assert len(slow_transaction_log.get_slowest()) == 2
+                assert snapshot["get_messages"]["count"] == 2
+                assert sum(snapshot["caaj_lines"].values()) == lines
+                assert snapshot["caaj_lines"]["fee"] > 0
+
+    def test_merge(self):
+        instrumentation = Instrumentation()
+        instrumentation.observe_result("send", 0.0002)
+        instrumentation.observe_caaj_lines("send", 2)
+        other = pickle.loads(pickle.dumps(instrumentation))
+        other.observe_unknown_action("foo")
+        instrumentation.merge(other)
+
+        snapshot = instrumentation.snapshot()
+        assert snapshot["get_result"]["send"]["count"] == 2
+        assert snapshot["unknown_actions"] == {"foo": 1}
+        assert snapshot["caaj_lines"] == {"send": 4}
+        with self.assertRaises(ValueError):
+            instrumentation.merge(Instrumentation(buckets=[0.001]))
+
+    def test_histogram(self):
+        histogram = Histogram([0.001, 0.01])
+        for seconds in [0.0005, 0.001, 0.005, 0.5]:
+            histogram.observe(seconds)
+        assert histogram.snapshot() == {
+            "count": 4,
+            "sum": 0.5065,
+            "buckets": {"0.001": 2, "0.01": 3, "+Inf": 4},
+        }
+
+    def test_to_prometheus(self):
+        instrumentation = Instrumentation(buckets=[0.001])
+        instrumentation.observe_result("send", 0.0002)
+        instrumentation.observe_unknown_action('a"b\\c')
+        instrumentation.observe_caaj_lines("send", 2)
+        text = instrumentation.to_prometheus()
+
+        assert "# TYPE kava_plugin_get_result_seconds histogram\n" in text
+        assert (
+            'kava_plugin_get_result_seconds_bucket{action="send",le="0.001"} 1\n'
+            in text
+        )
+        assert (
+            'kava_plugin_get_result_seconds_bucket{action="send",le="+Inf"} 1\n' in text
+        )
+        assert 'kava_plugin_get_result_seconds_sum{action="send"} 0.0002\n' in text
+        assert 'kava_plugin_unknown_actions_total{action="a\\"b\\\\c"} 1\n' in text
+        assert 'kava_plugin_caaj_lines_total{action="send"} 2\n' in text
+        assert "kava_plugin_messages_total 0\n" in text
+        assert "kava_plugin_get_caajs_seconds_count 0\n" in text
+
+    def test_slow_transaction_log(self):
+        slow_transaction_log = SlowTransactionLog(size=2)
+        KavaPlugin.set_slow_transaction_log(slow_transaction_log)
+        transactions = {}
+        for filename in ["delegate_v8", "send_v8", "fail_v8"]:
+            with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile:
+                transaction = KavaTransaction(json.load(jsonfile))
+            transactions[transaction.get_transaction_id()] = transaction
+            KavaPlugin.get_caajs(self.ADDRESS, transaction, TokenTableStub())
+
+        slowest = slow_transaction_log.get_slowest()
+        assert slow_transaction_log.observed == 3
+        assert len(slowest) == 2
+        assert slowest[0].seconds >= slowest[1].seconds
+        for record in slowest:
+            transaction = transactions[record.transaction_id]
+            data = transaction.get_transaction()["data"]
+            assert record.height == data["height"]
+            assert record.messages == len(record.actions)
+            assert record.seconds == record.parse_seconds + record.build_seconds
+            if transaction.get_fail():
+                assert record.actions == []
+
+        out = io.StringIO()
+        slow_transaction_log.dump(out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [line["transaction_id"] for line in lines] == [
+            record.transaction_id for record in slowest
+        ]
+        assert lines[0].keys() == set(SlowTransaction._fields)
+
+    def test_slow_transaction_log_top(self):
+        slow_transaction_log = SlowTransactionLog(size=3)
+        records = [
+            SlowTransaction(seconds, str(seconds), None, 0, [], seconds, 0.0)
+            for seconds in [0.5, 0.1, 0.4, 0.2, 0.3, 0.4]
+        ]
+        slow_transaction_log.merge(records[:4], observed=10)
+        slow_transaction_log.merge(records[4:], observed=2)
+
+        assert slow_transaction_log.observed == 12
+        assert [record.seconds for record in slow_transaction_log.get_slowest()] == [
+            0.5,
+            0.4,
+            0.4,
+        ]
+
+        slow_transaction_log.clear()
+        assert slow_transaction_log.get_slowest() == []
+        with self.assertRaises(ValueError):
+            SlowTransactionLog(size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
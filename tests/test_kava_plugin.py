@@ -1,11 +1,17 @@
 import json
 import unittest
 from typing import Optional
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from senkalib.chain.kava.kava_transaction import KavaTransaction
 
+from kava_plugin.caaj_batch import caaj_to_row
 from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.message import Message
+from kava_plugin.message_factory import MessageFactory
+from kava_plugin.result_cache import ResultCache
+from kava_plugin.token_table_cache import CachedTokenOriginalIdTable
+from tests.stubs import TokenTableStub
 
 
 class TestKavaPlugin(unittest.TestCase):
@@ -1188,6 +1194,203 @@ class TestKavaPlugin(unittest.TestCase):
         assert caaj_transaction_fee.caaj_to == "fee"
         assert caaj_transaction_fee.comment == ""
 
+    def test_register_caaj_builder(self):
+        test_data = TestKavaPlugin._get_test_data("send_v8")
+        transaction = KavaTransaction(test_data)
+        mock = TestKavaPlugin.get_token_table_mock()
+        address = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+        try:
+            Message.register_handler(
+                ["send"], lambda message: {"action": "new_action", "result": {}}
+            )
+            with self.assertRaises(Exception):
+                KavaPlugin.get_caajs(address, transaction, mock)
+
+            KavaPlugin.register_caaj_builder(
+                ["new_action"],
+                lambda transaction, result, token_table, address, trade_uuid: [
+                    "new_caaj"
+                ],
+            )
+            caajs = KavaPlugin.get_caajs(address, transaction, mock)
+            assert caajs[0] == "new_caaj"
+            assert caajs[1].caaj_to == "fee"
+        finally:
+            Message.handlers.clear()
+            Message._register_default_handlers()
+            KavaPlugin.caaj_builders.pop("new_action", None)
+
+    def test_iter_caajs(self):
+        consumed = []
+
+        def get_transactions():
+            for filename in ["send_v8", "delegate_v8", "vote_v8"]:
+                test_data = TestKavaPlugin._get_test_data(filename)
+                if filename == "delegate_v8":
+                    test_data["header"]["chain_id"] = "cosmoshub-4"
+                consumed.append(filename)
+                yield KavaTransaction(test_data)
+
+        mock = TestKavaPlugin.get_token_table_mock()
+        caajs = KavaPlugin.iter_caajs(
+            "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7", get_transactions(), mock
+        )
+        assert consumed == []
+        assert next(caajs).application == "send"
+        assert consumed == ["send_v8"]
+        assert [caaj.application for caaj in caajs] == ["kava", "kava"]
+        assert consumed == ["send_v8", "delegate_v8", "vote_v8"]
+
+    def test_get_caajs_for_addresses(self):
+        test_data = TestKavaPlugin._get_test_data("send_v8")
+        transaction = KavaTransaction(test_data)
+        mock = TestKavaPlugin.get_token_table_mock()
+        sender = "kava1dlezgt8undlpvdp0esmzyvxzvc59gkd56vkmea"
+        recipient = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+        other = "kava1xy7hrjy9r0algz9w3gzm8u6mrpq97kwta747gj"
+        with patch.object(
+            MessageFactory, "get_messages", wraps=MessageFactory.get_messages
+        ) as get_messages:
+            caajs = KavaPlugin.get_caajs_for_addresses(
+                [sender, recipient, other, sender], transaction, mock
+            )
+            get_messages.assert_called_once()
+
+        assert list(caajs.keys()) == [sender, recipient, other]
+        assert [caaj.type for caaj in caajs[sender]] == ["send", "lose"]
+        assert caajs[sender][1].caaj_from == sender
+        assert caajs[sender][1].caaj_to == "fee"
+        assert [caaj.type for caaj in caajs[recipient]] == ["receive"]
+        assert caajs[other] == []
+        for address in [sender, recipient]:
+            expected = KavaPlugin.get_caajs(address, transaction, mock)
+            for caaj, expected_caaj in zip(caajs[address], expected):
+                caaj.trade_uuid = expected_caaj.trade_uuid
+                assert caaj == expected_caaj
+
+        test_data = TestKavaPlugin._get_test_data("delegate_v8")
+        caajs = KavaPlugin.get_caajs_for_addresses(
+            [recipient], KavaTransaction(test_data), mock
+        )
+        assert caajs == {recipient: []}
+
+    def test_iter_caaj_rows_for_addresses(self):
+        transactions = [
+            KavaTransaction(TestKavaPlugin._get_test_data(filename))
+            for filename in ["send_v8", "fail_v8", "delegate_v8"]
+        ]
+        mock = TestKavaPlugin.get_token_table_mock()
+        sender = "kava1dlezgt8undlpvdp0esmzyvxzvc59gkd56vkmea"
+        recipient = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+        other = "kava1xy7hrjy9r0algz9w3gzm8u6mrpq97kwta747gj"
+        rows = KavaPlugin.iter_caaj_rows_for_addresses(
+            [other, recipient, sender], transactions, mock
+        )
+        expected = [
+            caaj_to_row(caaj)
+            for transaction in transactions
+            for caajs in KavaPlugin.get_caajs_for_addresses(
+                [sender, recipient], transaction, mock
+            ).values()
+            for caaj in caajs
+        ]
+        assert sorted(row[:5] + row[6:] for row in rows) == sorted(
+            row[:5] + row[6:] for row in expected
+        )
+        assert len(expected) == 4
+
+        rows = KavaPlugin.iter_caaj_rows_for_addresses([other], transactions, mock)
+        assert list(rows) == []
+
+    def test_get_fee_payer(self):
+        for filename, fee_payer in [
+            ("send_v8", "kava1dlezgt8undlpvdp0esmzyvxzvc59gkd56vkmea"),
+            ("fail_v8", "kava1dlezgt8undlpvdp0esmzyvxzvc59gkd56vkmea"),
+            ("delegate_v8", "kava1757uf8nmejhlqnmk99n4d9y78taud4neneutus"),
+            ("claimAtomicSwap_v4", "kava1nzq60hrphyr8anvkw6fv93mhafew7ez4tq9ahv"),
+            ("createAtomicSwap_v9", "kava1af7lm2qv9zp526gjd3cdxrpr9zeangjlyhjqjx"),
+        ]:
+            test_data = TestKavaPlugin._get_test_data(filename)
+            transaction = KavaTransaction(test_data)
+            assert KavaPlugin._get_fee_payer(transaction) == fee_payer
+            assert fee_payer in KavaPlugin._get_involved_addresses(transaction)
+
+        test_data = TestKavaPlugin._get_test_data("createAtomicSwap_v9")
+        test_data["data"]["tx"]["auth_info"]["fee"]["payer"] = "kava1payer"
+        assert KavaPlugin._get_fee_payer(KavaTransaction(test_data)) == "kava1payer"
+
+    def test_get_caajs_bulk(self):
+        transactions = [
+            KavaTransaction(TestKavaPlugin._get_test_data(filename))
+            for filename in [
+                "delegate_v8",
+                "send_v8",
+                "fail_v8",
+                "swap_deposit_v8",
+                "createAtomicSwap_v9",
+                "claim_hard_reward_v7",
+                "repay_cdp_v8",
+            ]
+        ]
+        address = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+        expected = []
+        for transaction in transactions:
+            expected.extend(
+                KavaPlugin.get_caajs(address, transaction, TokenTableStub())
+            )
+
+        for workers in [1, 2]:
+            caajs = KavaPlugin.get_caajs_bulk(
+                address, transactions, TokenTableStub(), workers=workers, chunk_size=2
+            )
+            assert len(caajs) == len(expected)
+            for caaj, expected_caaj in zip(caajs, expected):
+                caaj.trade_uuid = expected_caaj.trade_uuid
+                assert caaj == expected_caaj
+
+        for get_caajs in [KavaPlugin.get_caajs_bulk, KavaPlugin.get_caajs_threaded]:
+            with self.assertRaises(ValueError):
+                get_caajs(address, transactions, TokenTableStub(), chunk_size=0)
+
+    def test_get_caajs_threaded(self):
+        filenames = [
+            "delegate_v8",
+            "send_v8",
+            "fail_v8",
+            "swap_deposit_v8",
+            "createAtomicSwap_v9",
+            "claim_hard_reward_v7",
+            "repay_cdp_v8",
+            "deposit_cdp_v8",
+        ]
+        transactions = [
+            KavaTransaction(TestKavaPlugin._get_test_data(filename))
+            for filename in filenames * 10
+        ]
+        address = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+        token_table = CachedTokenOriginalIdTable(TokenTableStub(), max_size=2)
+
+        with patch.object(KavaPlugin, "_get_uuid", return_value="trade-uuid"):
+            expected = "\n".join(
+                repr(caaj)
+                for caaj in KavaPlugin.get_caajs_bulk(
+                    address, transactions, token_table, workers=1
+                )
+            )
+            try:
+                KavaPlugin.result_cache = ResultCache(max_size=4)
+                for workers in [1, 4]:
+                    caajs = KavaPlugin.get_caajs_threaded(
+                        address,
+                        transactions,
+                        token_table,
+                        workers=workers,
+                        chunk_size=3,
+                    )
+                    assert "\n".join(repr(caaj) for caaj in caajs) == expected
+            finally:
+                KavaPlugin.result_cache = None
+
     @classmethod
     def _get_test_data(cls, filename):
         with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile_local:
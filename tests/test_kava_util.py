@@ -0,0 +1,103 @@
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import getcontext
+
+from kava_plugin.denom import Denom
+from kava_plugin.kava_util import EventIndex, KavaUtil
+
+
+class TestKavaUtil(unittest.TestCase):
+    def test_event_index(self):
+        events = TestKavaUtil._get_test_data_events("repay_cdp_v8")
+        event_index = EventIndex(events)
+
+        self.assertTrue(event_index.has_event("transfer"))
+        self.assertFalse(event_index.has_event("swap_trade"))
+        self.assertIsNone(event_index.get_event("swap_trade"))
+        self.assertEqual(
+            event_index.get_event("transfer"),
+            KavaUtil.get_event_value(events, "transfer"),
+        )
+        self.assertEqual(
+            event_index.get_attribute_values("transfer", "amount"),
+            ["10050333usdx", "36428994bnb"],
+        )
+        self.assertEqual(
+            event_index.get_attribute_value("transfer", "amount"), "10050333usdx"
+        )
+        self.assertEqual(event_index.get_attribute_values("transfer", "fee"), [])
+        self.assertEqual(event_index.get_attribute_values("swap_trade", "fee"), [])
+
+    def test_compatibility_wrappers(self):
+        events = TestKavaUtil._get_test_data_events("repay_cdp_v8")
+        event = KavaUtil.get_event_value(events, "transfer")
+        self.assertEqual(event["type"], "transfer")
+        self.assertIsNone(KavaUtil.get_event_value(events, "swap_trade"))
+        self.assertEqual(
+            KavaUtil.get_attribute_values(event["attributes"], "amount"),
+            ["10050333usdx", "36428994bnb"],
+        )
+        self.assertEqual(
+            KavaUtil.get_attribute_value(event["attributes"], "amount"),
+            "10050333usdx",
+        )
+        with self.assertRaises(IndexError):
+            KavaUtil.get_attribute_value(event["attributes"], "fee")
+        self.assertEqual(
+            [
+                event["type"]
+                for event in KavaUtil.get_event_values(events, ["transfer"])
+            ],
+            ["transfer"],
+        )
+        self.assertIsNone(KavaUtil.get_event_values(events, ["swap_trade"]))
+
+    def test_parse_coins(self):
+        self.assertEqual(
+            KavaUtil.parse_coins("14418679hard,24675275ukava"),
+            (("14418679", "hard"), ("24675275", "ukava")),
+        )
+        self.assertEqual(KavaUtil.parse_coins("1000"), (("1000", ""),))
+        self.assertEqual(KavaUtil.parse_coins(""), ())
+        self.assertEqual(
+            KavaUtil.parse_coins("5ibc/27394FB092D2ECCD"),
+            (("5", "ibc/27394FB092D2ECCD"),),
+        )
+        with self.assertRaises(ValueError):
+            KavaUtil.parse_coins("hard")
+
+        KavaUtil.parse_coins.cache_clear()
+        KavaUtil.parse_coins("293872ukava")
+        KavaUtil.parse_coins("293872ukava")
+        self.assertEqual(KavaUtil.parse_coins.cache_info().hits, 1)
+
+        self.assertEqual(
+            KavaUtil.split_amount("293872ukava"), ("293872", Denom("kava", 6, None))
+        )
+        self.assertEqual(
+            KavaUtil.get_rewards_from_amount("14418679hard,24675275ukava"),
+            [
+                {"reward_token": "hard", "reward_amount": "14.418679"},
+                {"reward_token": "kava", "reward_amount": "24.675275"},
+            ],
+        )
+
+    def test_convert_uamount_amount_in_thread(self):
+        def convert():
+            getcontext().prec = 5
+            return KavaUtil.convert_uamount_amount("123456789012345678901234567890123")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            amount = executor.submit(convert).result()
+        self.assertEqual(str(amount), "123456789012345678901234567.890123")
+
+    @classmethod
+    def _get_test_data_events(cls, filename) -> list:
+        with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile_local:
+            test_data = json.load(jsonfile_local)
+        return test_data["data"]["logs"][0]["events"]
+
+
+if __name__ == "__main__":
+    unittest.main()
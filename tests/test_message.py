@@ -3,7 +3,9 @@ import unittest
 
 from senkalib.chain.kava.kava_transaction import KavaTransaction
 
+from kava_plugin.message import AmountSpec, Message
 from kava_plugin.message_factory import MessageFactory
+from kava_plugin.message_result import EmptyResult
 
 
 class TestMessage(unittest.TestCase):
@@ -323,13 +325,60 @@ class TestMessage(unittest.TestCase):
             },
         )
 
+    def test_unknown_action(self):
+        message = Message(
+            [{"type": "message", "attributes": [{"key": "action", "value": "foo"}]}],
+            {},
+            "1",
+            "kava-8",
+        )
+        self.assertEqual(message.get_result(), EmptyResult(None))
+        self.assertEqual(
+            message.get_result().to_dict(), {"action": None, "result": None}
+        )
+
+    def test_register_handler(self):
+        try:
+            Message.register_alias("/cosmos.bank.v1beta1.MsgSendV2", "send")
+            self.assertIs(
+                Message.handlers["/cosmos.bank.v1beta1.MsgSendV2"],
+                Message.handlers["send"],
+            )
+            Message.register_handler(["send"], lambda message: EmptyResult("custom"))
+            result = TestMessage._get_test_data_messages_result("send_v8")
+            self.assertEqual(result, {"action": "custom", "result": None})
+            with self.assertRaises(ValueError):
+                Message.register_alias("new_action", "undefined_action")
+        finally:
+            Message.handlers.clear()
+            Message._register_default_handlers()
+
+    def test_register_amount_spec(self):
+        try:
+            Message.register_amount_spec(
+                ["send"],
+                "custom_send",
+                AmountSpec("transfer", "amount", "token", "amount", False),
+            )
+            result = TestMessage._get_test_data_messages_result("send_v8")
+            self.assertEqual(
+                result,
+                {
+                    "action": "custom_send",
+                    "result": {"token": "kava", "amount": "2.17"},
+                },
+            )
+        finally:
+            Message.handlers.clear()
+            Message._register_default_handlers()
+
     @classmethod
     def _get_test_data_messages_result(cls, filename) -> dict:
         with open(f"tests/data/{filename}.json", encoding="utf-8") as jsonfile_local:
             transaction = KavaTransaction(json.load(jsonfile_local))
             message = MessageFactory.get_messages(transaction)[0]
 
-        return message.get_result()
+        return message.get_result().to_dict()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+import pickle
+import unittest
+
+from kava_plugin.amount import Amount
+from kava_plugin.denom import DenomRegistry
+from kava_plugin.message_result import (
+    Coin,
+    CoinResult,
+    EmptyResult,
+    SwapDepositResult,
+    TransferResult,
+)
+
+
+class TestMessageResult(unittest.TestCase):
+    def test_to_dict(self):
+        kava = DenomRegistry.get("ukava")
+        result = CoinResult(
+            "delegate", kava, Amount(1180, 6), [Coin(kava, Amount(39, 6))]
+        )
+        assert result.to_dict() == {
+            "action": "delegate",
+            "result": {
+                "staking_token": "kava",
+                "staking_amount": "0.00118",
+                "rewards": [{"reward_token": "kava", "reward_amount": "0.000039"}],
+            },
+        }
+        assert CoinResult("hard_borrow", None, None).to_dict() == {
+            "action": "hard_borrow",
+            "result": {"hard_borrow_token": None, "hard_borrow_amount": None},
+        }
+        assert SwapDepositResult(
+            "swap_deposit",
+            "busd:usdx",
+            "19155352120",
+            [Coin(DenomRegistry.get("usdx"), Amount(1, 0))],
+        ).to_dict()["result"]["inputs"] == [
+            {"input_token": "usdx", "input_amount": "1"}
+        ]
+        assert EmptyResult("vote").to_dict() == {"action": "vote", "result": None}
+
+    def test_pickle(self):
+        result = TransferResult(
+            "send", "kava1a", "kava1b", DenomRegistry.get("ukava"), Amount(217, 2)
+        )
+        restored = pickle.loads(pickle.dumps(result))
+        assert restored == result
+        assert restored.amount == Amount(217, 2)
+        assert restored.token == "kava"
+        assert restored.to_dict()["result"]["token"] == "kava"
+
+
+if __name__ == "__main__":
+    unittest.main()
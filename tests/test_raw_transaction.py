@@ -0,0 +1,146 @@
+import glob
+import json
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.raw_transaction import RawKavaTransaction
+
+
+class TestRawKavaTransaction(unittest.TestCase):
+    def test_from_bytes(self):
+        for filename in sorted(glob.glob("tests/data/*.json")):
+            with open(filename, "rb") as jsonfile_local:
+                raw = jsonfile_local.read()
+            raw_transaction = RawKavaTransaction.from_bytes(raw)
+            transaction = KavaTransaction(json.loads(raw))
+
+            assert (
+                raw_transaction.chain_id
+                == transaction.get_transaction()["header"]["chain_id"]
+            )
+            assert raw_transaction.get_transaction_id() == (
+                transaction.get_transaction_id()
+            )
+            assert raw_transaction.get_timestamp() == transaction.get_timestamp()
+            assert raw_transaction.get_fail() == filename.endswith("fail_v8.json")
+            assert vars(raw_transaction) == vars(
+                RawKavaTransaction.from_dict(json.loads(raw))
+            )
+
+    def test_fee(self):
+        raw_transaction = TestRawKavaTransaction._get_raw_transaction("fail_v8")
+        assert raw_transaction.get_transaction_fee() == Decimal("10000")
+        raw_transaction = TestRawKavaTransaction._get_raw_transaction(
+            "createAtomicSwap_v9"
+        )
+        assert raw_transaction.get_transaction_fee() == Decimal("1000")
+
+    def test_fallback(self):
+        with open("tests/data/fail_v8.json", encoding="utf-8") as jsonfile_local:
+            test_data = json.load(jsonfile_local)
+        test_data["data"]["tx"]["value"]["fee"] = {
+            "gas": "500000",
+            "amount": [],
+        }
+        raw_transaction = RawKavaTransaction.from_bytes(json.dumps(test_data))
+        assert raw_transaction.get_transaction_fee() == Decimal("0")
+        assert raw_transaction.get_fail() is True
+
+    def test_code_position(self):
+        with open("tests/data/fail_v8.json", encoding="utf-8") as jsonfile_local:
+            test_data = json.load(jsonfile_local)
+        raw_transaction = RawKavaTransaction.from_bytes(
+            json.dumps(test_data, sort_keys=True)
+        )
+        assert raw_transaction.get_fail() is True
+
+        # code after the tx body
+        test_data["data"]["code"] = test_data["data"].pop("code")
+        raw_transaction = RawKavaTransaction.from_bytes(json.dumps(test_data))
+        assert raw_transaction.get_fail() is True
+
+        test_data["data"]["code"] = 0
+        raw_transaction = RawKavaTransaction.from_bytes(json.dumps(test_data))
+        assert raw_transaction.get_fail() is False
+
+    def test_decode(self):
+        for filename in sorted(glob.glob("tests/data/*.json")):
+            with open(filename, "rb") as jsonfile_local:
+                raw = jsonfile_local.read()
+            assert RawKavaTransaction.decode(raw) == json.loads(raw)
+
+    def test_get_caajs_from_raw(self):
+        mock = MagicMock()
+        mock.get_symbol_uuid.return_value = "3a2570c5-15c4-2860-52a8-bff14f27a236"
+        address = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+        for filename in ["fail_v8", "send_v8"]:
+            with open(f"tests/data/{filename}.json", "rb") as jsonfile_local:
+                raw = jsonfile_local.read()
+            caajs = KavaPlugin.get_caajs_from_raw(address, raw, mock)
+            expected = KavaPlugin.get_caajs(
+                address, KavaTransaction(json.loads(raw)), mock
+            )
+            assert len(caajs) == len(expected)
+            for caaj, expected_caaj in zip(caajs, expected):
+                caaj.trade_uuid = expected_caaj.trade_uuid
+                assert caaj == expected_caaj
+
+        raw = raw.replace(b'"kava-8"', b'"cosmoshub-4"')
+        assert KavaPlugin.can_handle_raw(raw) is False
+        assert KavaPlugin.get_caajs_from_raw(address, raw, mock) == []
+
+    def test_get_caaj_rows_from_raw(self):
+        mock = MagicMock()
+        mock.get_symbol_uuid.return_value = "3a2570c5-15c4-2860-52a8-bff14f27a236"
+        addresses = [
+            "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7",
+            "kava1eyugkwc74zejgwdwl7mvm7pad4hzdnka4wmdmu",
+            "kava1dlezgt8undlpvdp0esmzyvxzvc59gkd56vkmea",
+        ]
+        for filename in ["fail_v8", "send_v8"]:
+            with open(f"tests/data/{filename}.json", "rb") as jsonfile_local:
+                raw = jsonfile_local.read()
+            with patch.object(
+                RawKavaTransaction, "decode", wraps=RawKavaTransaction.decode
+            ) as decode:
+                rows = KavaPlugin.get_caaj_rows_from_raw(
+                    addresses, raw, RawKavaTransaction.from_bytes(raw), mock
+                )
+            assert decode.call_count == 1
+
+            expected = list(
+                KavaPlugin.iter_caaj_rows_for_addresses(
+                    addresses, [KavaTransaction(json.loads(raw))], mock
+                )
+            )
+            assert [row[:5] + row[6:] for row in rows] == [
+                row[:5] + row[6:] for row in expected
+            ]
+            assert len(rows) > 0
+
+        # a failed transaction without fee has no rows to decode for
+        with open("tests/data/fail_v8.json", encoding="utf-8") as jsonfile_local:
+            transaction = json.load(jsonfile_local)
+        transaction["data"]["tx"]["value"]["fee"]["amount"] = []
+        raw = json.dumps(transaction).encode()
+        with patch.object(
+            RawKavaTransaction, "decode", wraps=RawKavaTransaction.decode
+        ) as decode:
+            rows = KavaPlugin.get_caaj_rows_from_raw(
+                addresses, raw, RawKavaTransaction.from_bytes(raw), mock
+            )
+        assert rows == []
+        assert decode.call_count == 0
+
+    @classmethod
+    def _get_raw_transaction(cls, filename) -> RawKavaTransaction:
+        with open(f"tests/data/{filename}.json", "rb") as jsonfile_local:
+            return RawKavaTransaction.from_bytes(jsonfile_local.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
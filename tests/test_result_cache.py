@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.denom import DenomRegistry
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.message_factory import MessageFactory
+from kava_plugin.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru(self):
+        result_cache = ResultCache(max_size=2)
+        assert result_cache.get("A") is None
+        result_cache.put("A", [{"action": "vote", "result": None}])
+        result_cache.put("B", [])
+        assert result_cache.get("A") == [{"action": "vote", "result": None}]
+        result_cache.put("C", [])
+        assert result_cache.get("B") is None
+        assert result_cache.get("C") == []
+        assert result_cache.get_stats() == {
+            "hits": 2,
+            "disk_hits": 0,
+            "misses": 2,
+            "evictions": 1,
+            "disk_evictions": 0,
+            "size": 2,
+            "disk_size": 0,
+        }
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results")
+            result_cache = ResultCache(max_size=1, path=path)
+            result_cache.put("A", [{"action": "vote", "result": None}])
+            result_cache.put("B", [])
+            assert result_cache.get("A") == [{"action": "vote", "result": None}]
+            assert result_cache.disk_hits == 1
+            result_cache.close()
+
+            result_cache = ResultCache(path=path)
+            assert result_cache.get("B") == []
+            with patch("kava_plugin.result_cache.__version__", "0.0.0"):
+                assert result_cache.get("B") is None
+            with patch.object(ResultCache, "code_fingerprint", "0" * 16):
+                assert result_cache.get("B") is None
+            result_cache.close()
+
+    def test_disk_bound(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results")
+            result_cache = ResultCache(max_size=1, path=path, max_disk_size=2)
+            result_cache.put("A", [])
+            result_cache.put("B", [])
+            assert result_cache.get("A") == []
+            result_cache.put("C", [])
+            assert result_cache.get("B") is None
+            assert result_cache.get_stats()["disk_evictions"] == 1
+            assert result_cache.get_stats()["disk_size"] == 2
+            result_cache.close()
+
+            with patch.object(ResultCache, "code_fingerprint", "0" * 16):
+                result_cache = ResultCache(path=path)
+                assert result_cache.get_stats()["disk_size"] == 0
+                result_cache.put("D", [])
+                result_cache.close()
+
+            result_cache = ResultCache(path=path)
+            assert result_cache.get("D") is None
+            assert result_cache.get_stats()["disk_size"] == 0
+            result_cache.put("A", [])
+            try:
+                DenomRegistry.register("ukava", "kava", 8, None)
+                result_cache.put("B", [])
+                assert result_cache.get_stats()["disk_size"] == 1
+            finally:
+                DenomRegistry.denoms.clear()
+                DenomRegistry._register_default_denoms()
+            result_cache.close()
+
+        with self.assertRaises(ValueError):
+            ResultCache(max_disk_size=0)
+
+    def test_denom_registry(self):
+        result_cache = ResultCache()
+        result_cache.put("A", [])
+        try:
+            DenomRegistry.register("ukava", "kava", 8, None)
+            assert result_cache.get("A") is None
+        finally:
+            DenomRegistry.denoms.clear()
+            DenomRegistry._register_default_denoms()
+        assert result_cache.get("A") == []
+
+    def test_kava_plugin_result_cache(self):
+        with open("tests/data/send_v8.json", encoding="utf-8") as jsonfile_local:
+            transaction = KavaTransaction(json.load(jsonfile_local))
+        mock = MagicMock()
+        mock.get_symbol_uuid.return_value = "3a2570c5-15c4-2860-52a8-bff14f27a236"
+        address = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+        expected = KavaPlugin.get_caajs(address, transaction, mock)
+
+        KavaPlugin.result_cache = ResultCache()
+        try:
+            with patch.object(
+                MessageFactory, "get_messages", wraps=MessageFactory.get_messages
+            ) as get_messages:
+                KavaPlugin.get_caajs(address, transaction, mock)
+                caajs = KavaPlugin.get_caajs(address, transaction, mock)
+                get_messages.assert_called_once()
+        finally:
+            KavaPlugin.result_cache = None
+
+        for caaj, expected_caaj in zip(caajs, expected):
+            caaj.trade_uuid = expected_caaj.trade_uuid
+            assert caaj == expected_caaj
+
+
+if __name__ == "__main__":
+    unittest.main()
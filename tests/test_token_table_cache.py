@@ -0,0 +1,61 @@
+import pickle
+import unittest
+from unittest.mock import MagicMock
+
+from kava_plugin.token_table_cache import CachedTokenOriginalIdTable
+
+
+class TestCachedTokenOriginalIdTable(unittest.TestCase):
+    def test_get_symbol_uuid(self):
+        token_table = MagicMock()
+        token_table.get_symbol_uuid.side_effect = (
+            lambda chain, token_original_id: f"{chain}-{token_original_id}-uuid"
+        )
+        cached_table = CachedTokenOriginalIdTable(token_table, max_size=2)
+
+        assert cached_table.get_symbol_uuid("kava", "hard") == "kava-hard-uuid"
+        assert cached_table.get_symbol_uuid("kava", "hard") == "kava-hard-uuid"
+        assert cached_table.get_symbol_uuid("kava", None) == "kava-None-uuid"
+        assert cached_table.hits == 1
+        assert cached_table.misses == 2
+        assert token_table.get_symbol_uuid.call_count == 2
+
+        # "hard" is the most recently used entry, so "None" is evicted
+        cached_table.get_symbol_uuid("kava", "hard")
+        cached_table.get_symbol_uuid("kava", "swp")
+        cached_table.get_symbol_uuid("kava", "hard")
+        assert cached_table.hits == 3
+        cached_table.get_symbol_uuid("kava", None)
+        assert cached_table.misses == 4
+        assert token_table.get_symbol_uuid.call_count == 4
+
+        cached_table.clear()
+        assert cached_table.hits == 0
+        assert cached_table.misses == 0
+
+    def test_delegation(self):
+        token_table = MagicMock()
+        token_table.get_symbol.return_value = "HARD"
+        cached_table = CachedTokenOriginalIdTable(token_table)
+
+        assert cached_table.get_symbol("kava", "hard") == "HARD"
+        token_table.get_symbol.assert_called_once_with("kava", "hard")
+        with self.assertRaises(ValueError):
+            CachedTokenOriginalIdTable(token_table, max_size=0)
+
+    def test_pickle(self):
+        cached_table = CachedTokenOriginalIdTable(TokenTableStub(), max_size=2)
+        cached_table.get_symbol_uuid("kava", "hard")
+
+        restored_table = pickle.loads(pickle.dumps(cached_table))
+        assert restored_table.get_symbol_uuid("kava", "hard") == "kava-hard-uuid"
+        assert restored_table.hits == 1
+
+
+class TokenTableStub:
+    def get_symbol_uuid(self, chain: str, token_original_id: str) -> str:
+        return f"{chain}-{token_original_id}-uuid"
+
+
+if __name__ == "__main__":
+    unittest.main()
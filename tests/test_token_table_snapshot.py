@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from senkalib.token_original_id_table import TokenOriginalIdTable
+
+from kava_plugin.token_table_snapshot import (
+    SNAPSHOT_FORMAT,
+    LocalTokenOriginalIdTable,
+)
+
+CSV_PATH = "tests/data/token_original_id.csv"
+CSV_URL = "https://example.com/token_original_id.csv"
+
+
+class TestLocalTokenOriginalIdTable(unittest.TestCase):
+    KEYS = [
+        ("kava", ""),
+        ("kava", "hard"),
+        ("kava", "usdx"),
+        ("kava", None),
+        ("kava", "bnb"),
+        ("bsc", "bnb"),
+        ("cosmos", "atom"),
+    ]
+
+    def test_lookup(self):
+        token_table = TestLocalTokenOriginalIdTable._get_csv_table()
+        local_table = LocalTokenOriginalIdTable.from_csv(CSV_PATH)
+
+        for chain, original_id in self.KEYS:
+            assert local_table.get_all_meta_data(
+                chain, original_id
+            ) == token_table.get_all_meta_data(chain, original_id)
+            assert local_table.get_symbol_uuid(
+                chain, original_id
+            ) == token_table.get_symbol_uuid(chain, original_id)
+        assert local_table.get_symbol("bsc", "bnb") == "bnb"
+        assert (
+            local_table.get_description("bsc", "bnb") == "bnb, on binance smart chain"
+        )
+
+        with self.assertRaises(ValueError):
+            token_table.get_symbol_uuid("kava", "dup")
+        with self.assertRaises(ValueError):
+            local_table.get_symbol_uuid("kava", "dup")
+
+    def test_save_load(self):
+        local_table = LocalTokenOriginalIdTable.from_csv(CSV_PATH)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache", "token_original_id.json")
+            local_table.save(path)
+            loaded_table = LocalTokenOriginalIdTable.load(path)
+            assert os.listdir(os.path.dirname(path)) == ["token_original_id.json"]
+
+            with open(path, "w", encoding="utf-8") as snapshot_file:
+                json.dump({"format": SNAPSHOT_FORMAT + 1}, snapshot_file)
+            with self.assertRaises(ValueError):
+                LocalTokenOriginalIdTable.load(path)
+
+        assert loaded_table.index == local_table.index
+        assert loaded_table.source == CSV_PATH
+        assert loaded_table.fetched_at == local_table.fetched_at
+        with self.assertRaises(ValueError):
+            loaded_table.get_symbol_uuid("kava", "dup")
+
+    def test_open(self):
+        fetched_table = LocalTokenOriginalIdTable.from_rows(
+            [], source=CSV_URL, fetched_at=time.time()
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "token_original_id.json")
+            with self.assertRaises(FileNotFoundError):
+                LocalTokenOriginalIdTable.open(CSV_URL, path, offline=True)
+
+            with patch.object(
+                LocalTokenOriginalIdTable, "fetch", return_value=fetched_table
+            ) as fetch:
+                # no snapshot yet, so it is fetched and saved
+                assert LocalTokenOriginalIdTable.open(CSV_URL, path).index == {}
+                assert fetch.call_count == 1
+
+                # fresh snapshot
+                LocalTokenOriginalIdTable.open(CSV_URL, path)
+                assert fetch.call_count == 1
+
+                # stale snapshot
+                LocalTokenOriginalIdTable.open(CSV_URL, path, max_age=0)
+                assert fetch.call_count == 2
+
+            stale_table = LocalTokenOriginalIdTable.from_csv(CSV_PATH)
+            stale_table.fetched_at = 0
+            stale_table.save(path)
+            with patch.object(
+                LocalTokenOriginalIdTable, "fetch", side_effect=OSError("unreachable")
+            ) as fetch:
+                # a failed refresh falls back to the stale snapshot
+                token_table = LocalTokenOriginalIdTable.open(CSV_URL, path)
+                assert token_table.get_symbol("kava", "hard") == "hard"
+
+                token_table = LocalTokenOriginalIdTable.open(
+                    CSV_URL, path, offline=True
+                )
+                assert token_table.get_symbol("kava", "hard") == "hard"
+                assert fetch.call_count == 1
+
+                os.remove(path)
+                with self.assertRaises(OSError):
+                    LocalTokenOriginalIdTable.open(CSV_URL, path)
+
+    @classmethod
+    def _get_csv_table(cls) -> TokenOriginalIdTable:
+        with open(CSV_PATH, encoding="utf-8") as csv_file:
+            csv_text = csv_file.read()
+        with patch("senkalib.token_original_id_table.requests.get") as get:
+            get.return_value.content = csv_text.encode()
+            token_table = TokenOriginalIdTable(CSV_URL)
+        return token_table
+
+
+if __name__ == "__main__":
+    unittest.main()
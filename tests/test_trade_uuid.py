@@ -0,0 +1,99 @@
+import json
+import unittest
+import uuid
+
+from senkalib.chain.kava.kava_transaction import KavaTransaction
+
+from kava_plugin.kava_plugin import KavaPlugin
+from kava_plugin.trade_uuid import TRADE_UUID_NAMESPACE, TradeUuid
+from tests.stubs import TokenTableStub
+
+
+class TestTradeUuid(unittest.TestCase):
+    ADDRESS = "kava1ys70jvnajkv88529ys6urjcyle3k2j9r24g6a7"
+    OTHER_ADDRESS = "kava1eyugkwc74zejgwdwl7mvm7pad4hzdnka4wmdmu"
+
+    def setUp(self):
+        with open("tests/data/delegate_v8.json", encoding="utf-8") as jsonfile:
+            self.transaction = KavaTransaction(json.load(jsonfile))
+
+    def tearDown(self):
+        KavaPlugin.set_trade_uuid(None)
+
+    def test_get(self):
+        trade_uuid = TradeUuid()
+        assert trade_uuid.get("abc", self.ADDRESS) == str(
+            uuid.uuid5(TRADE_UUID_NAMESPACE, f"ABC:{self.ADDRESS}")
+        )
+        assert trade_uuid.get("abc", self.ADDRESS, 1) == trade_uuid.get(
+            "ABC", self.ADDRESS
+        )
+        assert trade_uuid.get("abc", self.ADDRESS) != trade_uuid.get(
+            "abc", self.OTHER_ADDRESS
+        )
+
+        trade_uuid = TradeUuid(per_address=False, per_message=True)
+        assert trade_uuid.get("abc", self.ADDRESS) == trade_uuid.get(
+            "abc", self.OTHER_ADDRESS
+        )
+        assert trade_uuid.get("abc", self.ADDRESS, 0) != trade_uuid.get(
+            "abc", self.ADDRESS, 1
+        )
+
+    def test_get_caajs(self):
+        random_uuids = self._get_trade_uuids(self.ADDRESS)
+        assert random_uuids != self._get_trade_uuids(self.ADDRESS)
+
+        KavaPlugin.set_trade_uuid(TradeUuid())
+        trade_uuids = self._get_trade_uuids(self.ADDRESS)
+        assert trade_uuids == self._get_trade_uuids(self.ADDRESS)
+        assert len(set(trade_uuids)) == 1
+        assert trade_uuids[0] == TradeUuid().get(
+            self.transaction.get_transaction_id(), self.ADDRESS
+        )
+        assert trade_uuids != self._get_trade_uuids(self.OTHER_ADDRESS)
+
+        KavaPlugin.set_trade_uuid(TradeUuid(per_address=False))
+        assert self._get_trade_uuids(self.ADDRESS) == self._get_trade_uuids(
+            self.OTHER_ADDRESS
+        )
+
+    def test_per_message(self):
+        KavaPlugin.set_trade_uuid(TradeUuid(per_message=True))
+        results = KavaPlugin._get_results(self.transaction)
+        caajs = list(
+            KavaPlugin._iter_results_caajs(
+                self.ADDRESS, self.transaction, results * 2, TokenTableStub()
+            )
+        )
+        lines = (len(caajs) - 1) // 2
+
+        trade_uuid = TradeUuid(per_message=True)
+        transaction_id = self.transaction.get_transaction_id()
+        assert [caaj.trade_uuid for caaj in caajs] == (
+            [trade_uuid.get(transaction_id, self.ADDRESS, 0)] * lines
+            + [trade_uuid.get(transaction_id, self.ADDRESS, 1)] * lines
+            + [trade_uuid.get(transaction_id, self.ADDRESS)]
+        )
+        assert caajs[-1].caaj_to == "fee"
+
+    def test_get_caajs_bulk(self):
+        KavaPlugin.set_trade_uuid(TradeUuid())
+        caajs = KavaPlugin.get_caajs_bulk(
+            self.ADDRESS, [self.transaction] * 3, TokenTableStub(), workers=2
+        )
+        assert {caaj.trade_uuid for caaj in caajs} == set(
+            self._get_trade_uuids(self.ADDRESS)
+        )
+
+    def _get_trade_uuids(self, address: str) -> list:
+        return [
+            caaj.trade_uuid
+            for caaj in KavaPlugin.get_caajs(
+                address, self.transaction, TokenTableStub()
+            )
+        ]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from kava_plugin import worker_pool
+from kava_plugin.worker_pool import (
+    check_chunk_size,
+    chunked,
+    get_worker_token_table,
+    init_worker,
+    iter_in_order,
+)
+from tests.stubs import TokenTableStub
+
+
+class TestWorkerPool(unittest.TestCase):
+    def tearDown(self):
+        worker_pool._worker_token_table = None
+
+    def test_chunked(self):
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(chunked([], 2)) == []
+
+    def test_check_chunk_size(self):
+        check_chunk_size(1)
+        with self.assertRaises(ValueError):
+            check_chunk_size(0)
+
+    def test_iter_in_order(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = iter_in_order(
+                2, (executor.submit(pow, 2, exponent) for exponent in range(10))
+            )
+            assert list(results) == [2**exponent for exponent in range(10)]
+
+    def test_init_worker(self):
+        with self.assertRaises(RuntimeError):
+            get_worker_token_table()
+
+        token_table = TokenTableStub()
+        initialized = []
+        init_worker(token_table, lambda *args: initialized.extend(args), "a", 1)
+        assert get_worker_token_table() is token_table
+        assert initialized == ["a", 1]
+
+
+if __name__ == "__main__":
+    unittest.main()